@@ -5,20 +5,39 @@ from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import CommitHook, get_db
+from app.core.security import build_crypt_context, password_hasher
 from app.models.user import User
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_crypt_context(settings.bcrypt_rounds)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Detached snapshots of recently authenticated users, keyed by user id
+principal_cache: TTLCache[int, User] = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+
+def _forget_principals(user_ids: set[int]) -> None:
+    for user_id in user_ids:
+        principal_cache.invalidate(user_id)
+
+
+# User ids whose cached principals go stale once their session commits
+_changed_principals: CommitHook[set[int]] = CommitHook(
+    "principal_cache_changes", set, _forget_principals
+)
+
 
 class Token(BaseModel):
     """Token response schema."""
@@ -50,15 +69,46 @@ class UserResponse(BaseModel):
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its hash (blocking; handlers use ``password_hasher``)."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
+    """Hash a password (blocking; handlers use ``password_hasher``)."""
     return pwd_context.hash(password)
 
 
+def mark_principal_changed(db: AsyncSession, user_id: int) -> None:
+    """Forget the cached principal for ``user_id`` once ``db`` commits.
+
+    For changes the ORM does not track, such as bulk ``UPDATE`` statements.
+    """
+    _changed_principals.pending(db).add(user_id)
+
+
+def _snapshot_user(user: User) -> User:
+    """Copy a loaded user into a detached instance safe to share across sessions."""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session: Session, _flush_context: object) -> None:
+    """Note users modified or deleted through any session, to forget once it commits.
+
+    Invalidating here would leave a window until commit in which a concurrent
+    request re-caches the old row and serves it for the whole TTL.
+    """
+    user_ids = {
+        instance.id
+        for instance in (*session.dirty, *session.deleted)
+        if isinstance(instance, User) and instance.id is not None
+    }
+    if user_ids:
+        _changed_principals.pending(session).update(user_ids)
+
+
 def create_access_token(data: dict[str, str | int], expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -87,10 +137,16 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
+    cached = principal_cache.get(int(user_id))
+    if cached is not None:
+        # Attach a copy of the snapshot to this session without a round trip
+        return await db.merge(cached, load=False)
+
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+    principal_cache.set(user.id, _snapshot_user(user))
     return user
 
 
@@ -119,7 +175,7 @@ async def register(
     user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password),
         full_name=user_data.full_name,
     )
     db.add(user)
@@ -137,7 +193,7 @@ async def login(
     result = await db.execute(select(User).where(User.username == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
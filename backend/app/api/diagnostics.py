@@ -0,0 +1,44 @@
+"""Runtime diagnostics routes."""
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.api.auth import principal_cache
+from app.core.admission import admission_controller
+from app.core.database import engine, pool_stats, read_router
+from app.core.security import password_hasher
+from app.services.task_cache import task_cache
+from app.services.task_events import task_event_bus
+
+router = APIRouter()
+
+
+@router.get("/admission")
+async def admission_stats() -> dict[str, Any]:
+    """Report slots in use, queue depth, and queued and shed counts per route class."""
+    return admission_controller.stats()
+
+
+@router.get("/cache")
+async def cache_stats() -> dict[str, Any]:
+    """Report hit/miss counters for the read-through and principal caches."""
+    return {"tasks": task_cache.stats(), "principals": principal_cache.stats()}
+
+
+@router.get("/events")
+async def event_stats() -> dict[str, int]:
+    """Report task change feed subscribers and delivery counters."""
+    return task_event_bus.stats()
+
+
+@router.get("/password-hashing")
+async def password_hashing_stats() -> dict[str, int]:
+    """Report the bcrypt worker pool's size, running and queued work and completions."""
+    return password_hasher.stats()
+
+
+@router.get("/pool")
+async def database_pool_stats() -> dict[str, Any]:
+    """Report pool occupancy, checkout waits and failures, plus read replica health."""
+    return {**pool_stats(engine), "reads": read_router.stats()}
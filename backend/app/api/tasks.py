@@ -1,17 +1,85 @@
 """Tasks API endpoints."""
 
-from datetime import datetime
+import csv
+import hashlib
+import io
+import json
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    case,
+    delete,
+    false,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
 
-from app.core.database import get_db
-from app.models.task import Task, TaskPriority, TaskStatus
+from app.api.users import USER_SUMMARY_COLUMNS, UserSummary
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, is_replica_session
+from app.core.pagination import InvalidCursorError, SortOrder, decode_cursor, encode_cursor
+from app.core.responses import (
+    FastJSONResponse,
+    cached_response,
+    etag_headers,
+    etag_matches,
+    json_body,
+    negotiated_response,
+    not_modified,
+    response_columns,
+)
+from app.models.task import PRIORITY_RANK, PriorityRank, Task, TaskPriority, TaskStatus
+from app.models.user import User
+from app.services.task_cache import mark_tasks_changed, task_cache
+from app.services.task_counts import task_filter, task_set_state
+from app.services.task_events import event_stream, queue_task_event, task_event_bus
+from app.services.task_export import MEDIA_TYPES, ExportFormat, arrow_available, stream_tasks
+from app.services.task_import import ImportFormat, detect_format, import_tasks
+from app.services.task_search import SEARCH_DIALECTS, search_task_rows
+from app.services.task_stats import aggregate_task_stats, rollup_task_stats
 
 router = APIRouter()
 
+MAX_BATCH_SIZE = 1000
+
+
+class TaskSortField(str, Enum):
+    """Fields that task listings can be sorted by."""
+
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    DUE_DATE = "due_date"
+    PRIORITY = "priority"
+
+
+class TaskExpand(str, Enum):
+    """Related users that task reads can embed."""
+
+    OWNER = "owner"
+    ASSIGNEE = "assignee"
+
 
 # Pydantic schemas
 class TaskCreate(BaseModel):
@@ -53,45 +121,540 @@ class TaskResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+TASK_RESPONSE_COLUMNS = response_columns(Task, TaskResponse)
+
+
+class ExpandedTaskResponse(TaskResponse):
+    """Task read; ``owner`` and ``assignee`` are present only when expanded."""
+
+    owner: UserSummary | None = None
+    assignee: UserSummary | None = None
+
+
 class TaskListResponse(BaseModel):
     """Schema for paginated task list response."""
 
-    items: list[TaskResponse]
-    total: int
+    items: list[ExpandedTaskResponse]
+    total: int | None
+    total_estimated: bool = False
     page: int
     per_page: int
+    next_cursor: str | None = None
+
+
+class TaskAssigneeCount(BaseModel):
+    """Task totals for one assignee (``None`` counts unassigned tasks)."""
+
+    assignee_id: int | None
+    total: int
+    open: int
+
+
+class TaskStatsResponse(BaseModel):
+    """Schema for dashboard statistics.
+
+    ``due_soon`` counts open tasks due from now until the end of the day
+    ``due_soon_days`` days ahead (UTC); ``overdue`` counts open tasks already due.
+    """
+
+    total: int
+    by_status_priority: dict[TaskStatus, dict[TaskPriority, int]]
+    by_assignee: list[TaskAssigneeCount]
+    overdue: int
+    due_soon: int
+    due_soon_days: int
+    source: str
+    generated_at: datetime
+
+
+class TaskSearchHit(TaskResponse):
+    """A task matched by a full-text search, with its relevance (higher is better)."""
+
+    rank: float
+
+
+class TaskSearchResponse(BaseModel):
+    """Schema for a page of ranked search results."""
+
+    items: list[TaskSearchHit]
+    next_cursor: str | None = None
+    truncated: bool = False
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    """A single task update inside a batch request."""
+
+    id: int
+
+
+class TaskBatchCreate(BaseModel):
+    """Schema for creating many tasks at once.
+
+    With ``atomic`` (the default) any failed item rejects the whole batch;
+    otherwise valid items are applied and failures are reported per item.
+    """
+
+    items: list[TaskCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    atomic: bool = True
+
+
+class TaskBatchUpdate(BaseModel):
+    """Schema for updating many tasks at once."""
+
+    items: list[TaskBatchUpdateItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    atomic: bool = True
+
+
+class TaskBatchDelete(BaseModel):
+    """Schema for deleting many tasks at once."""
+
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    atomic: bool = True
+
+
+class TaskBatchItemResult(BaseModel):
+    """Outcome of one item in a batch request."""
+
+    index: int
+    id: int | None = None
+    status_code: int
+    task: TaskResponse | None = None
+    error: str | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    """Schema for batch responses, one result per submitted item."""
+
+    results: list[TaskBatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class TaskImportError(BaseModel):
+    """A rejected row in a bulk import."""
+
+    line: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    """Schema for bulk import results."""
+
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+    errors_truncated: bool
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+def _sort_expression(sort: TaskSortField) -> ColumnElement[Any]:
+    """Return the SQL expression a listing is ordered by."""
+    if sort == TaskSortField.PRIORITY:
+        return PriorityRank(Task.priority)
+    column: ColumnElement[Any] = getattr(Task, sort.value)
+    return column
+
+
+def _sort_value(row: Mapping[str, Any], sort: TaskSortField) -> Any:
+    """Return the value of the sort key for a fetched task row."""
+    if sort == TaskSortField.PRIORITY:
+        return PRIORITY_RANK[row["priority"]]
+    return row[sort.value]
+
+
+def _keyset_clause(
+    key: ColumnElement[Any],
+    key_value: Any,
+    last_id: int,
+    order: SortOrder,
+    nullable: bool,
+) -> ColumnElement[bool]:
+    """Build the predicate selecting rows strictly after ``(key_value, last_id)``.
+
+    NULL sort keys are ordered last in both directions.
+    """
+    ascending = order == SortOrder.ASC
+    id_after = Task.id > last_id if ascending else Task.id < last_id
+    if key_value is None:
+        return and_(key.is_(None), id_after)
+
+    key_after = key > key_value if ascending else key < key_value
+    clause = or_(key_after, and_(key == key_value, id_after))
+    if nullable:
+        clause = or_(clause, key.is_(None))
+    return clause
+
+
+def _decode_task_cursor(cursor: str, sort: TaskSortField, order: SortOrder) -> tuple[Any, int]:
+    """Decode a task listing cursor into its ``(sort key, id)`` position."""
+    try:
+        payload = decode_cursor(cursor)
+        if payload.get("s") != sort.value or payload.get("o") != order.value:
+            raise InvalidCursorError("Cursor does not match the requested sort")
+        key_value = payload["k"]
+        expected = int if sort == TaskSortField.PRIORITY else datetime
+        if key_value is None and sort != TaskSortField.DUE_DATE:
+            raise InvalidCursorError("Cursor is missing its sort key")
+        if key_value is not None and not isinstance(key_value, expected):
+            raise InvalidCursorError("Cursor sort key has the wrong type")
+        return key_value, int(payload["i"])
+    except (InvalidCursorError, KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+
+def task_etag(task_id: int, updated_at: datetime) -> str:
+    """Strong ETag for a single task; any write bumps ``updated_at``."""
+    return f'"{task_id}-{updated_at:%Y%m%d%H%M%S%f}"'
+
+
+def _if_match_clause(task_id: int, if_match: str) -> ColumnElement[bool]:
+    """Turn an ``If-Match`` header into a predicate on the task's ``updated_at``.
+
+    ETags that were not issued for this task yield a predicate that never
+    matches.
+    """
+    for candidate in if_match.split(","):
+        candidate_id, _, stamp = candidate.strip().strip('"').partition("-")
+        if candidate_id != str(task_id):
+            continue
+        try:
+            updated_at = datetime.strptime(stamp, "%Y%m%d%H%M%S%f")
+        except ValueError:
+            continue
+        # ETags render updated_at in UTC, the zone every dialect stores it in
+        return Task.updated_at == updated_at.replace(tzinfo=UTC)
+    return false()
+
+
+def _list_etag(params: Mapping[str, Any], version: int) -> str:
+    """Strong ETag for a listing page.
+
+    ``version`` (see ``task_set_state``) identifies the filtered set's state
+    and the request parameters pick out the page within it.
+    """
+    state = json.dumps([params, version], sort_keys=True, default=str)
+    return f'"{hashlib.sha1(state.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def _parse_expand(expand: str | None) -> list[TaskExpand]:
+    """Parse a comma-separated ``expand`` parameter, rejecting unknown relations."""
+    if not expand:
+        return []
+    names = dict.fromkeys(name.strip() for name in expand.split(",") if name.strip())
+    try:
+        return [TaskExpand(name) for name in names]
+    except ValueError as exc:
+        allowed = ", ".join(member.value for member in TaskExpand)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"expand accepts only: {allowed}",
+        ) from exc
+
+
+def _parse_fields(fields: str | None) -> list[str] | None:
+    """Parse a comma-separated ``fields`` parameter into ``TaskResponse`` field names.
+
+    Returns None (every field) when absent. ``id`` is always included and
+    names come back in schema order.
+    """
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",")} - {""}
+    if not names or not names <= TaskResponse.model_fields.keys():
+        allowed = ", ".join(TaskResponse.model_fields)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"fields accepts a comma-separated subset of: {allowed}",
+        )
+    return [name for name in TaskResponse.model_fields if name in names or name == "id"]
+
+
+def _task_columns(fields: list[str] | None, needed: Iterable[str]) -> list[Any]:
+    """Columns to select for ``fields`` plus those the handler ``needed`` itself."""
+    if fields is None:
+        return TASK_RESPONSE_COLUMNS
+    names = {*fields, *needed}
+    return [column for column in TASK_RESPONSE_COLUMNS if column.key in names]
+
+
+def _drop_unrequested(
+    items: list[dict[str, Any]], fields: list[str] | None, needed: Iterable[str]
+) -> None:
+    """Remove the columns selected only for the handler's own use."""
+    if fields is None:
+        return
+    extra = set(needed).difference(fields)
+    for item in items:
+        for name in extra:
+            del item[name]
+
+
+async def _embed_users(
+    db: AsyncSession, items: list[dict[str, Any]], expand: list[TaskExpand], etag: str
+) -> str:
+    """Embed the expanded users into ``items`` and return the ETag covering them.
+
+    Every user referenced by the page is fetched in one query, however many
+    tasks share them. User edits do not touch the tasks, so the ETag folds in
+    the embedded summaries.
+    """
+    user_ids = {item[f"{relation.value}_id"] for item in items for relation in expand}
+    user_ids.discard(None)
+    users: dict[int, dict[str, Any]] = {}
+    if user_ids:
+        result = await db.execute(select(*USER_SUMMARY_COLUMNS).where(User.id.in_(user_ids)))
+        users = {row["id"]: dict(row) for row in result.mappings()}
+    for item in items:
+        for relation in expand:
+            item[relation.value] = users.get(item[f"{relation.value}_id"])
+    state = json.dumps([etag, sorted(users.items())])
+    return f'"{hashlib.sha1(state.encode(), usedforsecurity=False).hexdigest()}"'
 
 
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     status: TaskStatus | None = None,
     priority: TaskPriority | None = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-) -> TaskListResponse:
-    """List all tasks with optional filtering and pagination."""
-    query = select(Task)
+    sort: TaskSortField = TaskSortField.CREATED_AT,
+    order: SortOrder = SortOrder.ASC,
+    cursor: str | None = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+    expand: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    accept: str | None = Header(None),
+) -> Response:
+    """List all tasks with optional filtering and pagination.
+
+    Pages are addressed either by ``page`` (offset paging) or by the opaque
+    ``cursor`` returned as ``next_cursor`` on the previous page (keyset paging).
+    Keyset paging costs the same at any depth.
+
+    ``total`` is exact and comes from the ``task_rollup`` table in the same
+    query as the ETag, at a cost that does not grow with the number of tasks.
+    ``include_total=false`` leaves it out and skips summing it. Since the exact
+    total is never dearer than a planner estimate, ``estimate_total=true`` is
+    accepted for compatibility and also returns it, with ``total_estimated``
+    false.
+
+    ``expand=owner,assignee`` embeds a summary of those users in each task,
+    loaded with one extra query for the whole page.
+
+    ``fields=title,status`` returns only those task fields (and ``id``), and
+    only those columns are read from the database.
+
+    Responses carry an ETag; a matching ``If-None-Match`` is answered with 304
+    before the page is queried, or after it when users are expanded. Clients
+    sending ``Accept: application/msgpack`` get the page as MessagePack.
+    """
+    relations = _parse_expand(expand)
+    selected = _parse_fields(fields)
+    params = {
+        "status": status,
+        "priority": priority,
+        "page": page,
+        "per_page": per_page,
+        "sort": sort,
+        "order": order,
+        "cursor": cursor,
+        "include_total": include_total,
+        "estimate_total": estimate_total,
+        "expand": [relation.value for relation in relations],
+        "fields": selected,
+    }
+    # Embedded users change without bumping the task versions, so they are not cached
+    cache_key = None
+    if task_cache.enabled and not relations:
+        cache_key = await task_cache.list_key(params)
+        cached = await task_cache.get("list", cache_key)
+        if cached is not None:
+            etag, body = cached
+            return cached_response(body, etag, if_none_match, accept)
+
+    # The cursor needs the sort key and expansion the user ids, requested or not
+    needed = [sort.value, *(f"{relation.value}_id" for relation in relations)]
+    query = select(*_task_columns(selected, needed))
+    whereclause = task_filter(status, priority)
+    if whereclause is not None:
+        query = query.where(whereclause)
 
-    if status:
-        query = query.where(Task.status == status)
-    if priority:
-        query = query.where(Task.priority == priority)
+    # Read from the trigger-maintained rollup, so every worker's committed
+    # writes count however late they commit, and no task rows are scanned
+    version, total = await task_set_state(db, status, priority, include_total or estimate_total)
+    etag = _list_etag(params, version)
+    if not relations and etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
-    # Get total count
-    count_result = await db.execute(select(Task.id).where(query.whereclause or True))
-    total = len(count_result.all())
+    key = _sort_expression(sort)
+    nullable = sort == TaskSortField.DUE_DATE
+    ordered_key = key.asc() if order == SortOrder.ASC else key.desc()
+    if nullable:
+        ordered_key = ordered_key.nulls_last()
+    query = query.order_by(ordered_key, Task.id.asc() if order == SortOrder.ASC else Task.id.desc())
 
     # Apply pagination
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-
-    return TaskListResponse(
-        items=[TaskResponse.model_validate(task) for task in tasks],
-        total=total,
-        page=page,
-        per_page=per_page,
+    if cursor is not None:
+        key_value, last_id = _decode_task_cursor(cursor, sort, order)
+        query = query.where(_keyset_clause(key, key_value, last_id, order, nullable))
+    else:
+        query = query.offset((page - 1) * per_page)
+
+    # Fetch one extra row to learn whether another page follows
+    result = await db.execute(query.limit(per_page + 1))
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            {"s": sort.value, "o": order.value, "k": _sort_value(last, sort), "i": last["id"]}
+        )
+
+    items = [dict(row) for row in rows]
+    if relations:
+        etag = await _embed_users(db, items, relations, etag)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    _drop_unrequested(items, selected, needed)
+
+    content = {
+        "items": items,
+        "total": total,
+        "total_estimated": False,
+        "page": page,
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+    }
+    response = negotiated_response(content, accept, etag_headers(etag))
+    if cache_key is not None:
+        body = json_body(response, content)
+        await task_cache.set(cache_key, etag, body, is_replica_session(db))
+    return response
+
+
+@router.get("/search", response_model=TaskSearchResponse)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=256),
+    db: AsyncSession = Depends(get_read_db),
+    status: TaskStatus | None = None,
+    priority: TaskPriority | None = None,
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+) -> FastJSONResponse:
+    """Full-text search over task titles and descriptions.
+
+    Results are ranked best first and keyset-paginated through ``next_cursor``;
+    ``status`` and ``priority`` narrow the matches like they do for listings.
+    Every match is ranked by default. With ``search_rank_window`` set, only
+    that many most recent matches are ranked, which keeps very common terms
+    cheap; older matches are then unreachable, even through the cursor, and
+    ``truncated`` is true.
+    """
+    if db.get_bind().dialect.name not in SEARCH_DIALECTS:
+        raise HTTPException(
+            status_code=501,
+            detail="Task search requires PostgreSQL or SQLite",
+        )
+
+    after = None
+    if cursor is not None:
+        try:
+            payload = decode_cursor(cursor)
+            if payload.get("q") != q:
+                raise InvalidCursorError("Cursor does not match the search query")
+            after = (float(payload["r"]), int(payload["i"]))
+        except (InvalidCursorError, KeyError, TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor") from exc
+
+    rows, truncated = await search_task_rows(
+        db,
+        q,
+        TASK_RESPONSE_COLUMNS,
+        task_filter(status, priority),
+        per_page + 1,
+        after,
+        window=settings.search_rank_window,
+    )
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor({"q": q, "r": rows[-1]["rank"], "i": rows[-1]["id"]})
+
+    return FastJSONResponse(
+        {"items": [dict(row) for row in rows], "next_cursor": next_cursor, "truncated": truncated}
+    )
+
+
+@router.get("/events")
+async def task_events() -> StreamingResponse:
+    """Server-sent events stream of task changes.
+
+    Emits ``created``, ``updated`` and ``deleted`` events with the task id and
+    body, a comment line as a heartbeat while idle, and ``resync`` when the
+    client fell behind (or after a bulk import) and must refetch its tasks.
+    Holds no database connection while open.
+    """
+    return StreamingResponse(
+        event_stream(task_event_bus),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export")
+async def export_tasks(
+    db: AsyncSession = Depends(get_read_db),
+    status: TaskStatus | None = None,
+    priority: TaskPriority | None = None,
+    format: ExportFormat = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Stream every matching task as NDJSON, CSV or Arrow IPC."""
+    if format == ExportFormat.ARROW and not arrow_available():
+        raise HTTPException(
+            status_code=501,
+            detail="Arrow export requires the optional pyarrow dependency",
+        )
+
+    return StreamingResponse(
+        stream_tasks(db, format, task_filter(status, priority), settings.export_batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'},
+    )
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def task_stats(
+    db: AsyncSession = Depends(get_read_db),
+    due_soon_days: int = Query(3, ge=0, le=90),
+    assignee_limit: int = Query(20, ge=1, le=100),
+) -> FastJSONResponse:
+    """Counts by status and priority, the busiest assignees, and overdue and due-soon tasks.
+
+    Served from the rollup tables that triggers on ``tasks`` maintain, so the
+    cost does not grow with the number of tasks; with ``task_stats_rollup``
+    off, one ``GROUP BY`` over every task computes the same numbers.
+    """
+    now = datetime.now(UTC)
+    if settings.task_stats_rollup:
+        stats = await rollup_task_stats(db, now, due_soon_days, assignee_limit)
+    else:
+        stats = await aggregate_task_stats(db, now, due_soon_days, assignee_limit)
+    return FastJSONResponse(
+        {
+            **stats,
+            "due_soon_days": due_soon_days,
+            "source": "rollup" if settings.task_stats_rollup else "tasks",
+            "generated_at": now,
+        }
     )
 
 
@@ -114,50 +677,351 @@ async def create_task(
     db.add(task)
     await db.flush()
     await db.refresh(task)
-    return TaskResponse.model_validate(task)
+    mark_tasks_changed(db)
+    created = TaskResponse.model_validate(task)
+    queue_task_event(db, "created", task.id, created)
+    return created
+
+
+BATCH_EVENT_TYPES = {
+    status.HTTP_201_CREATED: "created",
+    status.HTTP_200_OK: "updated",
+    status.HTTP_204_NO_CONTENT: "deleted",
+}
+
+
+async def _unknown_user_ids(db: AsyncSession, user_ids: set[int]) -> set[int]:
+    """Return the ids in ``user_ids`` that do not belong to any user."""
+    if not user_ids:
+        return set()
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+    return user_ids - set(result.scalars().all())
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+async def _finish_batch(
+    db: AsyncSession,
+    savepoint: AsyncSessionTransaction,
+    results: list[TaskBatchItemResult],
+    atomic: bool,
+) -> TaskBatchResponse:
+    """Commit or roll back a batch's savepoint and build its response.
+
+    In atomic mode any failed item rolls back every write the batch made.
+    """
+    results.sort(key=lambda result: result.index)
+    failures = [result for result in results if result.error is not None]
+    if atomic and failures:
+        await savepoint.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Batch rejected; no changes were applied",
+                "errors": [failure.model_dump(mode="json") for failure in failures],
+            },
+        )
+
+    await savepoint.commit()
+    mark_tasks_changed(db, [result.id for result in results if result.id is not None])
+    for result in results:
+        if result.error is None:
+            queue_task_event(db, BATCH_EVENT_TYPES[result.status_code], result.id, result.task)
+    return TaskBatchResponse(
+        results=results,
+        succeeded=len(results) - len(failures),
+        failed=len(failures),
+    )
+
+
+def _not_found(index: int, task_id: int) -> TaskBatchItemResult:
+    return TaskBatchItemResult(
+        index=index,
+        id=task_id,
+        status_code=status.HTTP_404_NOT_FOUND,
+        error=f"Task with id {task_id} not found",
+    )
+
+
+def _reject_duplicate_ids(ids: list[int]) -> None:
+    """Refuse batches naming a task twice, which would report and publish it twice."""
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Each task id may appear only once per batch",
+        )
+
+
+def _unknown_assignee(index: int, task_id: int | None, user_id: int) -> TaskBatchItemResult:
+    return TaskBatchItemResult(
+        index=index,
+        id=task_id,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error=f"User with id {user_id} not found",
+    )
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks_file(
+    file: UploadFile = File(...),
+    format: ImportFormat | None = None,
+    db: AsyncSession = Depends(get_db),
+) -> TaskImportResponse:
+    """Bulk-load tasks from an uploaded NDJSON or CSV file.
+
+    The file is read as a stream and validated against ``TaskCreate`` in
+    chunks. Valid rows are loaded with COPY on PostgreSQL and chunked
+    ``executemany`` elsewhere; invalid rows are reported by line number.
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        report = await import_tasks(
+            db,
+            stream,
+            format or detect_format(file.filename),
+            schema=TaskCreate,
+            owner_id=1,  # Placeholder - should come from auth
+            chunk_size=settings.import_chunk_size,
+            max_errors=settings.import_max_errors,
+        )
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read import file: {exc}",
+        ) from exc
+    finally:
+        stream.detach()
+    if report.imported:
+        mark_tasks_changed(db)
+        queue_task_event(db, "resync")
+
+    return TaskImportResponse(
+        imported=report.imported,
+        failed=report.failed,
+        errors=[TaskImportError(line=line, error=error) for line, error in report.errors],
+        errors_truncated=report.errors_truncated,
+        elapsed_seconds=report.elapsed_seconds,
+        rows_per_second=report.rows_per_second,
+    )
+
+
+@router.post("/batch", response_model=TaskBatchResponse)
+async def create_tasks_batch(
+    batch: TaskBatchCreate,
+    db: AsyncSession = Depends(get_db),
+) -> TaskBatchResponse:
+    """Create many tasks with a single ``INSERT ... RETURNING``."""
+    unknown = await _unknown_user_ids(
+        db, {item.assignee_id for item in batch.items if item.assignee_id is not None}
+    )
+    results: list[TaskBatchItemResult] = []
+    rows: list[dict[str, Any]] = []
+    row_indexes: list[int] = []
+    for index, item in enumerate(batch.items):
+        if item.assignee_id is not None and item.assignee_id in unknown:
+            results.append(_unknown_assignee(index, None, item.assignee_id))
+            continue
+        rows.append({**item.model_dump(), "owner_id": 1})  # Placeholder - should come from auth
+        row_indexes.append(index)
+
+    savepoint = await db.begin_nested()
+    if rows and not (batch.atomic and results):
+        created = await db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows)
+        for index, task in zip(row_indexes, created.all(), strict=True):
+            results.append(
+                TaskBatchItemResult(
+                    index=index,
+                    id=task.id,
+                    status_code=status.HTTP_201_CREATED,
+                    task=TaskResponse.model_validate(task),
+                )
+            )
+
+    return await _finish_batch(db, savepoint, results, batch.atomic)
+
+
+@router.put("/batch", response_model=TaskBatchResponse)
+async def update_tasks_batch(
+    batch: TaskBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+) -> TaskBatchResponse:
+    """Update many tasks with a single set-based ``UPDATE ... RETURNING``.
+
+    Each column is assigned through a ``CASE`` on the task id, so items may
+    change different fields and the statement stays portable across dialects.
+    """
+    _reject_duplicate_ids([item.id for item in batch.items])
+    changes = {item.id: item.model_dump(exclude_unset=True, exclude={"id"}) for item in batch.items}
+    unknown = await _unknown_user_ids(
+        db,
+        {fields["assignee_id"] for fields in changes.values() if fields.get("assignee_id")},
+    )
+    results: list[TaskBatchItemResult] = []
+    for index, item in enumerate(batch.items):
+        assignee_id = changes[item.id].get("assignee_id")
+        if assignee_id is not None and assignee_id in unknown:
+            results.append(_unknown_assignee(index, item.id, assignee_id))
+            del changes[item.id]
+
+    values: dict[str, Any] = {}
+    for field in TaskUpdate.model_fields:
+        column = getattr(Task, field)
+        whens = [
+            (Task.id == task_id, literal(fields[field], column.type))
+            for task_id, fields in changes.items()
+            if field in fields
+        ]
+        if whens:
+            values[field] = case(*whens, else_=column)
+
+    savepoint = await db.begin_nested()
+    if batch.atomic and results:
+        # Already rejected; skip the write
+        changes.clear()
+    updated: dict[int, Task] = {}
+    if changes:
+        # An empty update still bumps updated_at through its onupdate default
+        statement = update(Task).where(Task.id.in_(changes)).values(**values)
+        result = await db.scalars(
+            statement.returning(Task).execution_options(synchronize_session="fetch")
+        )
+        updated = {task.id: task for task in result.all()}
+
+    for index, item in enumerate(batch.items):
+        if item.id not in changes:
+            continue
+        task = updated.get(item.id)
+        if task is None:
+            results.append(_not_found(index, item.id))
+            continue
+        results.append(
+            TaskBatchItemResult(
+                index=index,
+                id=item.id,
+                status_code=status.HTTP_200_OK,
+                task=TaskResponse.model_validate(task),
+            )
+        )
+
+    return await _finish_batch(db, savepoint, results, batch.atomic)
+
+
+@router.delete("/batch", response_model=TaskBatchResponse)
+async def delete_tasks_batch(
+    batch: TaskBatchDelete,
+    db: AsyncSession = Depends(get_db),
+) -> TaskBatchResponse:
+    """Delete many tasks with a single ``DELETE ... RETURNING``."""
+    _reject_duplicate_ids(batch.ids)
+    savepoint = await db.begin_nested()
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id.in_(batch.ids))
+        .returning(Task.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    deleted = set(result.scalars().all())
+
+    results = [
+        TaskBatchItemResult(index=index, id=task_id, status_code=status.HTTP_204_NO_CONTENT)
+        if task_id in deleted
+        else _not_found(index, task_id)
+        for index, task_id in enumerate(batch.ids)
+    ]
+    return await _finish_batch(db, savepoint, results, batch.atomic)
+
+
+@router.get("/{task_id}", response_model=ExpandedTaskResponse)
 async def get_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
-) -> TaskResponse:
-    """Get a specific task by ID."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    db: AsyncSession = Depends(get_read_db),
+    expand: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+    accept: str | None = Header(None),
+) -> Response:
+    """Get a specific task by ID, as JSON or, if ``Accept`` prefers it, MessagePack.
+
+    ``expand=owner,assignee`` embeds a summary of those users. Without it, a
+    matching ``If-None-Match`` is answered with 304 after reading only the
+    task's ``updated_at``. ``fields`` selects task fields as for listings.
+    """
+    relations = _parse_expand(expand)
+    selected = _parse_fields(fields)
+    # The cache holds whole tasks only
+    cache_key = None
+    if task_cache.enabled and not relations and selected is None:
+        cache_key = await task_cache.task_key(task_id)
+        cached = await task_cache.get("task", cache_key)
+        if cached is not None:
+            etag, body = cached
+            return cached_response(body, etag, if_none_match, accept)
+
+    if if_none_match is not None and not relations:
+        result = await db.execute(select(Task.updated_at).where(Task.id == task_id))
+        updated_at = result.scalar_one_or_none()
+        if updated_at is not None and etag_matches(if_none_match, task_etag(task_id, updated_at)):
+            return not_modified(task_etag(task_id, updated_at))
 
-    if not task:
+    # The ETag needs updated_at and expansion the user ids, requested or not
+    needed = ["updated_at", *(f"{relation.value}_id" for relation in relations)]
+    result = await db.execute(select(*_task_columns(selected, needed)).where(Task.id == task_id))
+    row = result.mappings().one_or_none()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
 
-    return TaskResponse.model_validate(task)
+    task = dict(row)
+    etag = task_etag(task_id, row["updated_at"])
+    if relations:
+        etag = await _embed_users(db, [task], relations, etag)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    _drop_unrequested([task], selected, needed)
+    response = negotiated_response(task, accept, etag_headers(etag))
+    if cache_key is not None:
+        await task_cache.set(cache_key, etag, json_body(response, task), is_replica_session(db))
+    return response
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
+    response: Response,
     db: AsyncSession = Depends(get_db),
+    if_match: str | None = Header(None),
 ) -> TaskResponse:
-    """Update an existing task."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    """Update an existing task with a single ``UPDATE ... RETURNING``.
+
+    With ``If-Match`` the update only applies while the task still has that
+    ETag, enforced in the statement's WHERE clause; otherwise 412.
+    """
+    update_data = task_data.model_dump(exclude_unset=True)
+    statement = update(Task).where(Task.id == task_id).values(**update_data)
+    if if_match is not None and if_match.strip() != "*":
+        statement = statement.where(_if_match_clause(task_id, if_match))
+    result = await db.execute(
+        statement.returning(*TASK_RESPONSE_COLUMNS).execution_options(synchronize_session="fetch")
+    )
+    row = result.mappings().one_or_none()
 
-    if not task:
+    if not row:
+        if if_match is not None and await db.scalar(select(Task.id).where(Task.id == task_id)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task has been modified since it was fetched",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
 
-    update_data = task_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-
-    await db.flush()
-    await db.refresh(task)
-    return TaskResponse.model_validate(task)
+    mark_tasks_changed(db, [task_id])
+    queue_task_event(db, "updated", task_id, dict(row))
+    response.headers["ETag"] = task_etag(task_id, row["updated_at"])
+    return TaskResponse.model_validate(dict(row))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -165,14 +1029,20 @@ async def delete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    """Delete a task."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    """Delete a task with a single ``DELETE ... RETURNING``."""
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    row = result.one_or_none()
 
-    if not task:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
 
-    await db.delete(task)
+    mark_tasks_changed(db, [task_id])
+    queue_task_event(db, "deleted", task_id)
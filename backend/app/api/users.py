@@ -1,16 +1,42 @@
 """Users API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, and_, case, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import UserResponse, get_current_user
-from app.core.database import get_db
-from app.models.user import User
+from app.api.auth import UserResponse, get_current_user, mark_principal_changed
+from app.core.database import get_db, get_read_db
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.responses import FastJSONResponse, negotiated_response, response_columns
+from app.models.user import PrefixKey, User, prefix_key, prefix_keys
 
 router = APIRouter()
 
+USER_RESPONSE_COLUMNS = response_columns(User, UserResponse)
+
+
+class UserSummary(BaseModel):
+    """Compact user for pickers and for embedding in task reads."""
+
+    id: int
+    username: str
+    full_name: str | None
+
+
+USER_SUMMARY_COLUMNS = [getattr(User, name) for name in UserSummary.model_fields]
+
+
+class UserView(str, Enum):
+    """Projections the user directory can return."""
+
+    FULL = "full"
+    SUMMARY = "summary"
+
 
 class UserUpdate(BaseModel):
     """Schema for updating user profile."""
@@ -18,34 +44,119 @@ class UserUpdate(BaseModel):
     full_name: str | None = None
 
 
-@router.get("", response_model=list[UserResponse])
+def _prefix_range(column: Any, prefix: str) -> ColumnElement[bool]:
+    """Match ``*_key`` values that start with the folded ``prefix``, as an index range scan."""
+    key = PrefixKey(column)
+    last = ord(prefix[-1])
+    if last == 0x10FFFF:
+        return key >= prefix
+    return and_(key >= prefix, key < prefix[:-1] + chr(last + 1))
+
+
+def _after(columns: Sequence[ColumnElement[Any]], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Build the predicate selecting rows strictly after ``values`` in ``columns`` order."""
+    first, *rest = columns
+    if not rest:
+        return first > values[0]
+    return or_(first > values[0], and_(first == values[0], _after(rest, values[1:])))
+
+
+def _decode_user_cursor(cursor: str, q: str | None, types: Sequence[type]) -> list[Any]:
+    """Decode a directory cursor into its position, one value per sort column."""
+    try:
+        payload = decode_cursor(cursor)
+        position = payload["p"]
+        if payload.get("q") != q:
+            raise InvalidCursorError("Cursor does not match the search")
+        if not isinstance(position, list) or len(position) != len(types):
+            raise InvalidCursorError("Cursor position has the wrong shape")
+        if not all(isinstance(value, kind) for value, kind in zip(position, types, strict=True)):
+            raise InvalidCursorError("Cursor position has the wrong types")
+        return position
+    except (InvalidCursorError, KeyError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
+
+@router.get("", response_model=list[UserResponse] | list[UserSummary])
 async def list_users(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     _current_user: User = Depends(get_current_user),
-) -> list[UserResponse]:
-    """List all users (requires authentication)."""
-    result = await db.execute(select(User).where(User.is_active == True))
-    users = result.scalars().all()
-    return [UserResponse.model_validate(user) for user in users]
+    q: str | None = Query(None, min_length=1, max_length=100),
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    view: UserView = UserView.FULL,
+    accept: str | None = Header(None),
+) -> Response:
+    """List active users a page at a time (requires authentication).
+
+    ``q`` keeps users whose username, full name or email starts with it,
+    ignoring case, and orders them for typeahead: exact username first, then
+    username, full name and email prefixes, each alphabetical by username.
+    Without ``q`` users are alphabetical by username. The body is a bare list;
+    when another page follows, its opaque cursor is sent in ``X-Next-Cursor``
+    and its URL in a ``Link: <...>; rel="next"`` header, for the ``cursor``
+    parameter. ``view=summary`` returns only id, username and full name.
+    ``Accept: application/msgpack`` returns the page as MessagePack.
+    """
+    q = prefix_key((q or "").strip()) or None
+    key = PrefixKey(User.username_key)
+    columns = USER_SUMMARY_COLUMNS if view == UserView.SUMMARY else USER_RESPONSE_COLUMNS
+    query = select(*columns, key.label("key")).where(User.is_active == True)
+    order: list[ColumnElement[Any]] = [key, User.id]
+    types: list[type] = [str, int]
+    if q:
+        username_match = _prefix_range(User.username_key, q)
+        full_name_match = _prefix_range(User.full_name_key, q)
+        query = query.where(or_(username_match, full_name_match, _prefix_range(User.email_key, q)))
+        rank = case((key == q, 0), (username_match, 1), (full_name_match, 2), else_=3)
+        query = query.add_columns(rank.label("rank"))
+        order = [rank, *order]
+        types = [int, *types]
+
+    if cursor is not None:
+        query = query.where(_after(order, _decode_user_cursor(cursor, q, types)))
+
+    # Fetch one extra row to learn whether another page follows
+    result = await db.execute(query.order_by(*order).limit(per_page + 1))
+    rows = [dict(row) for row in result.mappings()]
+
+    headers = {}
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        position = [last["key"], last["id"]]
+        if q:
+            position.insert(0, last["rank"])
+        next_cursor = encode_cursor({"q": q, "p": position})
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers = {"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'}
+    for row in rows:
+        row.pop("rank", None)
+        del row["key"]
+    return negotiated_response(rows, accept, headers)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _current_user: User = Depends(get_current_user),
-) -> UserResponse:
+) -> FastJSONResponse:
     """Get a specific user by ID."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    result = await db.execute(select(*USER_RESPONSE_COLUMNS).where(User.id == user_id))
+    row = result.mappings().one_or_none()
 
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found",
         )
 
-    return UserResponse.model_validate(user)
+    return FastJSONResponse(dict(row))
 
 
 @router.patch("/me", response_model=UserResponse)
@@ -54,11 +165,22 @@ async def update_current_user(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> UserResponse:
-    """Update current user's profile."""
+    """Update current user's profile with a single ``UPDATE ... RETURNING``."""
     update_data = user_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(current_user, field, value)
+    result = await db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(**update_data, **prefix_keys(update_data))
+        .returning(*USER_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session="fetch")
+    )
+    row = result.mappings().one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with id {current_user.id} not found",
+        )
 
-    await db.flush()
-    await db.refresh(current_user)
-    return UserResponse.model_validate(current_user)
+    mark_principal_changed(db, current_user.id)
+    return UserResponse.model_validate(dict(row))
@@ -0,0 +1,68 @@
+"""TaskFlow command-line tools.
+
+python -m app.cli import-tasks tasks.ndjson
+python -m app.cli import-tasks tasks.csv --owner-id 7 --chunk-size 10000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from app.api.tasks import TaskCreate
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.services.task_import import ImportFormat, detect_format, import_tasks
+
+
+async def _import_tasks(args: argparse.Namespace) -> int:
+    path = Path(args.path)
+    import_format = ImportFormat(args.format) if args.format else detect_format(path.name)
+    async with async_session_maker() as session:
+        with path.open(encoding="utf-8", newline="") as stream:
+            report = await import_tasks(
+                session,
+                stream,
+                import_format,
+                schema=TaskCreate,
+                owner_id=args.owner_id,
+                chunk_size=args.chunk_size,
+                max_errors=args.max_errors,
+            )
+        await session.commit()
+
+    summary = {
+        "imported": report.imported,
+        "failed": report.failed,
+        "elapsed_seconds": round(report.elapsed_seconds, 3),
+        "rows_per_second": round(report.rows_per_second, 1),
+        "errors_truncated": report.errors_truncated,
+    }
+    for line, error in report.errors:
+        print(f"line {line}: {error}", file=sys.stderr)
+    print(json.dumps(summary))
+    return 0 if report.failed == 0 else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m app.cli``."""
+    parser = argparse.ArgumentParser(prog="taskflow", description="TaskFlow command-line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import-tasks", help="bulk-load tasks from NDJSON or CSV")
+    import_parser.add_argument("path", help="file to import")
+    import_parser.add_argument("--format", choices=[f.value for f in ImportFormat])
+    import_parser.add_argument("--owner-id", type=int, default=1, help="owner of imported tasks")
+    import_parser.add_argument("--chunk-size", type=int, default=settings.import_chunk_size)
+    import_parser.add_argument("--max-errors", type=int, default=settings.import_max_errors)
+
+    args = parser.parse_args(argv)
+    if args.command == "import-tasks":
+        return asyncio.run(_import_tasks(args))
+    parser.error(f"unknown command {args.command}")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 """Core package - configuration and database utilities."""
 
 from app.core.config import settings
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_read_db
 
-__all__ = ["Base", "get_db", "settings"]
+__all__ = ["Base", "get_db", "get_read_db", "settings"]
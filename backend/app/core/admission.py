@@ -0,0 +1,194 @@
+"""Admission control: per-route-class concurrency limits with bounded wait queues.
+
+Every request that is not exempt is sorted into a route class before routing
+runs. A class admits up to its limit at once; further requests wait in a
+FIFO queue of bounded size. A request that finds the queue full, or that
+waits longer than the queue timeout, is shed with 503 and ``Retry-After``
+rather than left to time out on the connection pool.
+"""
+
+import asyncio
+import math
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Served regardless of load: probes, metrics, docs and the long-lived change feed
+EXEMPT_PATHS = frozenset(
+    {
+        "/api/health",
+        "/api/ready",
+        "/api/metrics",
+        "/api/docs",
+        "/api/redoc",
+        "/api/openapi.json",
+        "/api/tasks/events",
+    }
+)
+EXEMPT_PREFIXES = ("/api/diagnostics/",)
+
+# (class, method or None for any, path) for routes that are costlier than their
+# method suggests; everything else is "read" (GET/HEAD) or "write"
+ROUTE_CLASSES = (
+    ("auth", "POST", "/api/auth/login"),
+    ("auth", "POST", "/api/auth/register"),
+    ("bulk", "GET", "/api/tasks/export"),
+    ("bulk", "POST", "/api/tasks/import"),
+    ("bulk", None, "/api/tasks/batch"),
+)
+
+
+def route_class(method: str, path: str) -> str | None:
+    """Return the route class of a request, or None when it is exempt."""
+    path = path.rstrip("/") or "/"
+    if method == "OPTIONS" or path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+        return None
+    for name, class_method, class_path in ROUTE_CLASSES:
+        if path == class_path and class_method in (None, method):
+            return name
+    return "read" if method in ("GET", "HEAD") else "write"
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is refused a slot; ``reason`` is "queue_full" or "timeout"."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    """Admits up to ``limit`` holders at once; up to ``queue_size`` more wait in order.
+
+    A released slot passes straight to the oldest waiter, so a burst cannot
+    overtake requests already queued.
+    """
+
+    def __init__(self, limit: int, queue_size: int) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.queue_seconds = 0.0
+        self.shed = {"queue_full": 0, "timeout": 0}
+
+    async def acquire(self, timeout: float) -> None:
+        """Take a slot, waiting at most ``timeout`` seconds, or raise ``AdmissionRejectedError``."""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self.waiters) >= self.queue_size or timeout <= 0:
+            self.shed["queue_full"] += 1
+            raise AdmissionRejectedError("queue_full")
+
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        self.waiters.append(waiter)
+        self.queued += 1
+        started = loop.time()
+        try:
+            async with asyncio.timeout(timeout):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as the wait ended; pass it on
+                self.release()
+            else:
+                self.waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self.shed["timeout"] += 1
+                raise AdmissionRejectedError("timeout") from None
+            raise
+        finally:
+            self.queue_seconds += loop.time() - started
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Return a slot, handing it to the oldest live waiter if there is one."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "queue_seconds": round(self.queue_seconds, 6),
+            "shed": dict(self.shed),
+        }
+
+
+class AdmissionController:
+    """One ``ConcurrencyLimiter`` per route class; classes without a limit run unbounded."""
+
+    def __init__(
+        self,
+        limits: Mapping[str, int],
+        queue_sizes: Mapping[str, int],
+        queue_timeout: float,
+        retry_after: float,
+    ) -> None:
+        self.limiters = {
+            name: ConcurrencyLimiter(limit, queue_sizes.get(name, 0))
+            for name, limit in limits.items()
+            if limit > 0
+        }
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+admission_controller = AdmissionController(
+    settings.admission_limits,
+    settings.admission_queue_sizes,
+    queue_timeout=settings.admission_queue_timeout_seconds,
+    retry_after=settings.admission_retry_after_seconds,
+)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware holding a route-class slot for the whole response, body included."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = None
+        if scope["type"] == "http" and settings.admission_control:
+            name = route_class(scope["method"], scope["path"])
+            limiter = admission_controller.limiters.get(name) if name else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire(admission_controller.queue_timeout)
+        except AdmissionRejectedError:
+            response = JSONResponse(
+                {"detail": "Server is busy, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(admission_controller.retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,212 @@
+"""Caching primitives: an in-process TTL/LRU cache and pluggable shared backends."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Coroutine, Hashable
+from typing import Any, Generic, Protocol, TypeVar
+
+REDIS_MISSING = "REDIS_URL is set but the redis package is not installed (taskflow-backend[redis])"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    A ``ttl`` or ``maxsize`` of zero disables the cache: every lookup misses and
+    nothing is stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or ``None`` if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop a single entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return size and hit/miss/eviction counters."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheBackend(Protocol):
+    """Byte-oriented cache store shared by the read-through caches.
+
+    Version counters back invalidation: readers embed the current version in
+    their data keys and writers bump it. A missing counter is initialised from
+    the clock, so an evicted counter can never resurrect an older version.
+    Each bump also records its wall-clock time next to the counter, so every
+    worker sharing the backend can tell how recently a version changed.
+    """
+
+    name: str
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def version(self, key: str) -> int: ...
+
+    async def bumped_at(self, key: str) -> float | None:
+        """Wall-clock time of the counter's last bump, if one is still recorded."""
+        ...
+
+    def bump_versions(self, keys: list[str]) -> None:
+        """Advance version counters; may complete asynchronously."""
+        ...
+
+
+class MemoryCacheBackend:
+    """Process-local backend for single-node deployments and tests."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._data: TTLCache[str, bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: TTLCache[str, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._bumped_at: TTLCache[str, float] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data.set(key, value, ttl)
+
+    async def version(self, key: str) -> int:
+        current = self._versions.get(key)
+        if current is None:
+            current = time.time_ns()
+            self._versions.set(key, current)
+        return current
+
+    async def bumped_at(self, key: str) -> float | None:
+        return self._bumped_at.get(key)
+
+    def bump_versions(self, keys: list[str]) -> None:
+        # Synchronous so the very next request already sees the new version
+        now = time.time()
+        for key in keys:
+            current = self._versions.get(key)
+            self._versions.set(key, (current or time.time_ns()) + 1)
+            self._bumped_at.set(key, now)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._versions.clear()
+        self._bumped_at.clear()
+
+
+class RedisCacheBackend:
+    """Backend shared by every worker through Redis."""
+
+    name = "redis"
+
+    def __init__(self, url: str) -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url)
+        self._pending: set[asyncio.Task[None]] = set()
+
+    async def get(self, key: str) -> bytes | None:
+        value: bytes | None = await self._redis.get(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def version(self, key: str) -> int:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, time.time_ns(), nx=True)
+            pipe.get(key)
+            _, current = await pipe.execute()
+        return int(current)
+
+    async def bumped_at(self, key: str) -> float | None:
+        value = await self._redis.get(f"{key}:bumped_at")
+        return None if value is None else float(value)
+
+    async def _bump(self, keys: list[str]) -> None:
+        now = time.time()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, time.time_ns(), nx=True)
+                pipe.incr(key)
+                pipe.set(f"{key}:bumped_at", now)
+            await pipe.execute()
+
+    def bump_versions(self, keys: list[str]) -> None:
+        self._spawn(self._bump(keys))
+
+    def _spawn(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+def create_cache_backend(
+    backend: str, redis_url: str | None, maxsize: int, ttl: float
+) -> CacheBackend | None:
+    """Build the configured backend; ``"auto"`` uses Redis whenever a URL is set.
+
+    A URL without the redis package fails at startup: falling back to memory
+    would quietly give each worker its own cache.
+    """
+    if backend == "none":
+        return None
+    if backend == "redis" or (backend == "auto" and redis_url):
+        if not redis_url:
+            raise ValueError("cache_backend=redis requires REDIS_URL")
+        try:
+            return RedisCacheBackend(redis_url)
+        except ImportError as exc:
+            raise ImportError(REDIS_MISSING) from exc
+    return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
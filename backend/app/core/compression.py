@@ -0,0 +1,206 @@
+"""Response compression negotiated from ``Accept-Encoding``: brotli or gzip.
+
+Like Starlette's ``GZipMiddleware`` this skips small bodies, responses that
+are already encoded or partial, and media types that are compressed already
+or must reach the client unbuffered (server-sent events among them), and it
+compresses streamed bodies chunk by chunk. It adds brotli and honours the
+client's q-values instead of picking gzip whenever it is mentioned. The
+responder is written against the ASGI messages alone, not Starlette's
+responder internals, which change between releases.
+
+ETags are left as they are: they identify the uncompressed representation,
+and ``If-Match`` must keep comparing them strongly.
+"""
+
+import zlib
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.responses import quality_values
+
+# Bodies larger than this are compressed in a worker thread, off the event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+# Media types sent as they are: already compressed, or streamed to the client
+# as produced; ``type/*`` covers a whole top-level type
+EXCLUDED_MEDIA_TYPES = frozenset(
+    {
+        "application/grpc",
+        "application/gzip",
+        "application/x-gzip",
+        "application/zip",
+        "audio/*",
+        "font/woff",
+        "font/woff2",
+        "image/avif",
+        "image/gif",
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "text/event-stream",
+        "video/*",
+    }
+)
+
+
+def brotli_available() -> bool:
+    """Whether the optional brotli dependency is installed."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class GzipStream:
+    """One gzip member, flushed after every chunk so streamed bodies decode as they arrive."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, final: bool) -> bytes:
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(body) + self._compressor.flush(flush)
+
+
+class BrotliStream:
+    """One brotli stream, flushed after every chunk so streamed bodies decode as they arrive."""
+
+    def __init__(self, quality: int) -> None:
+        import brotli
+
+        self._compressor: Any = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, final: bool) -> bytes:
+        chunk = self._compressor.process(body)
+        return chunk + (self._compressor.finish() if final else self._compressor.flush())
+
+
+async def _compress(stream: GzipStream | BrotliStream, body: bytes, more_body: bool) -> bytes:
+    if len(body) >= THREAD_MINIMUM_SIZE:
+        return await anyio.to_thread.run_sync(stream.compress, body, not more_body)
+    return stream.compress(body, not more_body)
+
+
+def _excluded(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type.startswith("application/grpc+"):
+        return True
+    return bool({media_type, media_type.partition("/")[0] + "/*"} & EXCLUDED_MEDIA_TYPES)
+
+
+class CompressionResponder:
+    """Wraps ``send`` for one response, compressing it with a stream from ``new_stream``.
+
+    Without a stream the body is sent as it is, but compressible responses
+    still get ``Vary: Accept-Encoding``.
+    """
+
+    def __init__(
+        self,
+        send: Send,
+        minimum_size: int,
+        encoding: str | None = None,
+        new_stream: Callable[[], GzipStream | BrotliStream] | None = None,
+    ) -> None:
+        self.send = send
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.new_stream = new_stream
+        self.start: Message | None = None
+        self.passthrough = False
+        self.stream: GzipStream | BrotliStream | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or _excluded(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Held back until the first body chunk decides the headers
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            # Early hints, trailers and pathsend bodies go out unchanged
+            if message["type"] == "http.response.pathsend" and self.start is not None:
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if len(body) >= self.minimum_size or more_body:
+                body = await self._start_stream(start, body, more_body)
+            await self.send(start)
+        elif self.stream is not None:
+            body = await _compress(self.stream, body, more_body)
+        await self.send({**message, "body": body})
+
+    async def _start_stream(self, start: Message, body: bytes, more_body: bool) -> bytes:
+        headers = MutableHeaders(raw=start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.new_stream is None or self.encoding is None:
+            return body
+        self.stream = self.new_stream()
+        body = await _compress(self.stream, body, more_body)
+        headers["Content-Encoding"] = self.encoding
+        if more_body or start.get("trailers", False):
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+        return body
+
+
+def choose_encoding(accept_encoding: str | None, offered: tuple[str, ...]) -> str | None:
+    """The ``offered`` coding the client ranks highest, earlier ones winning ties."""
+    accepted = quality_values(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses of at least ``minimum_size`` bytes as the client prefers.
+
+    Brotli is offered only when the optional dependency is installed, and
+    is preferred over gzip when the client ranks them equally.
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offered = ("br", "gzip") if brotli_available() else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"), self.offered)
+        new_stream: Callable[[], GzipStream | BrotliStream] | None = None
+        if encoding == "br":
+            new_stream = partial(BrotliStream, self.brotli_quality)
+        elif encoding == "gzip":
+            new_stream = partial(GzipStream, self.gzip_level)
+        responder = CompressionResponder(send, self.minimum_size, encoding, new_stream)
+        await self.app(scope, receive, responder)
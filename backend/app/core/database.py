@@ -1,17 +1,186 @@
 """Database connection and session management."""
 
-from collections.abc import AsyncGenerator
+import bisect
+import math
+import time
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Generic, TypeVar
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+from app.core.metrics import record_query
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-)
+W = TypeVar("W")
+
+# Upper bounds (milliseconds) of the checkout wait histogram buckets
+POOL_WAIT_BUCKETS_MS = (1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0, 5000.0)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how often they fail.
+
+    The wait covers queueing for a free connection and, for overflow
+    connections, opening it. Counters start over when the engine is disposed.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_counts = [0] * (len(POOL_WAIT_BUCKETS_MS) + 1)
+        self.wait_total_ms = 0.0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_errors = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        except Exception:
+            self.checkout_errors += 1
+            raise
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.checkouts += 1
+        self.wait_total_ms += waited_ms
+        self.wait_counts[bisect.bisect_left(POOL_WAIT_BUCKETS_MS, waited_ms)] += 1
+        return record
+
+    def stats(self) -> dict[str, Any]:
+        """Return live occupancy, checkout counters and the wait histogram."""
+        buckets = [f"le_{bound:g}ms" for bound in POOL_WAIT_BUCKETS_MS] + ["inf"]
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self._timeout,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_errors": self.checkout_errors,
+            "wait_ms_total": round(self.wait_total_ms, 3),
+            "wait_ms_histogram": dict(zip(buckets, self.wait_counts, strict=True)),
+        }
+
+
+def _ping_idle_connections(engine: AsyncEngine, idle_seconds: float) -> None:
+    """Ping a connection on checkout only if it sat in the pool for ``idle_seconds``.
+
+    Busy connections skip the extra round trip that ``pool_pre_ping`` costs on
+    every checkout; a failed ping makes the pool discard the connection and
+    try another.
+    """
+    pool = engine.sync_engine.pool
+    dialect = engine.sync_engine.dialect
+
+    @event.listens_for(pool, "checkin")
+    def _record_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _ping_if_idle(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            alive = dialect.do_ping(dbapi_connection)
+        except Exception as err:
+            raise exc.DisconnectionError() from err
+        if not alive:
+            raise exc.DisconnectionError()
+
+
+def _time_queries(engine: AsyncEngine) -> None:
+    """Charge every statement's execution time to the request that issued it.
+
+    The start time lives on the statement's execution context, so a statement
+    that fails (and never reaches ``after_cursor_execute``) leaves nothing behind
+    on the pooled connection.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_timer(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _stop_timer(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        record_query(statement, time.perf_counter() - context._query_started_at)
+
+
+def engine_options(url: str, config: Settings) -> dict[str, Any]:
+    """Return ``create_async_engine`` keyword arguments for ``url`` from ``config``.
+
+    ``db_pgbouncer`` disables asyncpg's prepared-statement caches and gives
+    every prepared statement a unique name, which transaction-mode PgBouncer
+    requires because consecutive statements may run on different server
+    connections. In-memory SQLite keeps SQLAlchemy's single-connection pool.
+    """
+    database_url = make_url(url)
+    options: dict[str, Any] = {
+        "echo": config.debug,
+        "pool_pre_ping": config.db_pool_pre_ping == "always",
+    }
+    if not (
+        database_url.get_backend_name() == "sqlite"
+        and database_url.database in (None, "", ":memory:")
+    ):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout_seconds,
+            pool_recycle=config.db_pool_recycle_seconds,
+        )
+    if database_url.get_driver_name() == "asyncpg":
+        cache_size = 0 if config.db_pgbouncer else config.db_statement_cache_size
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": cache_size,
+            "prepared_statement_cache_size": cache_size,
+        }
+        if config.db_pgbouncer:
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        options["connect_args"] = connect_args
+    return options
+
+
+def build_engine(url: str, config: Settings) -> AsyncEngine:
+    """Create an async engine with the pool and driver options from ``config``."""
+    engine = create_async_engine(url, **engine_options(url, config))
+    _time_queries(engine)
+    if config.db_pool_pre_ping == "idle":
+        _ping_idle_connections(engine, config.db_pool_pre_ping_idle_seconds)
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Describe the engine's pool; only instrumented pools report counters."""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__, **pool.stats()}
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+
+engine = build_engine(settings.database_url, settings)
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -35,3 +204,199 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+# Set on responses to writes; while it is fresh, that client reads from the primary
+LAST_WRITE_COOKIE = "taskflow_last_write"
+
+_REPLICA_KEY = "read_replica"
+
+
+class ReadRouter:
+    """Hands out read-only sessions from replicas, falling back to the primary.
+
+    Replicas take turns round-robin. One that fails to connect is skipped for
+    ``retry_seconds`` while the next is tried, and with every replica down
+    reads go to the primary. Sessions are never committed; closing them rolls
+    the read transaction back.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: Sequence[AsyncEngine],
+        retry_seconds: float,
+        sticky_seconds: float,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.retry_seconds = retry_seconds
+        self.sticky_seconds = sticky_seconds
+        self._session_makers = [
+            async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False)
+            for replica in self.replicas
+        ]
+        self._down_until = [0.0] * len(self.replicas)
+        self._turn = 0
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.failovers = 0
+
+    def _candidates(self) -> list[int]:
+        count = len(self.replicas)
+        start = self._turn
+        self._turn = (self._turn + 1) % max(count, 1)
+        now = time.monotonic()
+        rotation = [(start + offset) % count for offset in range(count)]
+        return [index for index in rotation if self._down_until[index] <= now]
+
+    def _mark_down(self, index: int) -> None:
+        self.failovers += 1
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def wrote_recently(self, last_write: str | None) -> bool:
+        """Whether a ``LAST_WRITE_COOKIE`` value falls inside the sticky window."""
+        if not last_write:
+            return False
+        try:
+            written_at = int(last_write) / 1000
+        except ValueError:
+            return False
+        return time.time() - written_at < self.sticky_seconds
+
+    @asynccontextmanager
+    async def session(self, use_primary: bool = False) -> AsyncIterator[AsyncSession]:
+        """Open a read-only session on the next healthy replica, or the primary."""
+        if not use_primary:
+            for index in self._candidates():
+                session = self._session_makers[index]()
+                try:
+                    # Connect eagerly so an unreachable replica fails over here
+                    await session.connection()
+                except (exc.DBAPIError, OSError):
+                    await session.close()
+                    self._mark_down(index)
+                    continue
+                session.sync_session.info[_REPLICA_KEY] = True
+                self.replica_reads += 1
+                try:
+                    yield session
+                except exc.DBAPIError as err:
+                    if err.connection_invalidated:
+                        self._mark_down(index)
+                    raise
+                finally:
+                    await session.close()
+                return
+        self.primary_reads += 1
+        async with self.primary() as session:
+            yield session
+
+    def stats(self) -> dict[str, Any]:
+        """Return read routing counters and per-replica health and pool state."""
+        now = time.monotonic()
+        return {
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "failovers": self.failovers,
+            "replicas": [
+                {
+                    "url": replica.url.render_as_string(hide_password=True),
+                    "healthy": down_until <= now,
+                    "retry_in_seconds": round(max(0.0, down_until - now), 3),
+                    **pool_stats(replica),
+                }
+                for replica, down_until in zip(self.replicas, self._down_until, strict=True)
+            ],
+        }
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """Whether ``session`` reads from a replica, which may lag the primary."""
+    return session.sync_session.info.get(_REPLICA_KEY, False)
+
+
+class CommitHook(Generic[W]):
+    """Work collected on a session under ``key`` and handed to ``on_commit`` after it commits.
+
+    The collection is dropped on rollback, so side effects such as cache
+    invalidation and event publishing only follow writes that are visible.
+    """
+
+    def __init__(self, key: str, factory: Callable[[], W], on_commit: Callable[[W], None]) -> None:
+        self.key = key
+        self.factory = factory
+        self.on_commit = on_commit
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def pending(self, session: AsyncSession | Session) -> W:
+        """The work collected on ``session`` so far, created on first use."""
+        if isinstance(session, AsyncSession):
+            session = session.sync_session
+        return session.info.setdefault(self.key, self.factory())
+
+    def _after_commit(self, session: Session) -> None:
+        work = session.info.pop(self.key, None)
+        if work is not None:
+            self.on_commit(work)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(self.key, None)
+
+
+def _read_urls(config: Settings) -> list[str]:
+    return [url.strip() for url in (config.database_read_url or "").split(",") if url.strip()]
+
+
+read_router = ReadRouter(
+    async_session_maker,
+    [build_engine(url, settings) for url in _read_urls(settings)],
+    retry_seconds=settings.read_replica_retry_seconds,
+    sticky_seconds=settings.read_your_writes_seconds,
+)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a read-only session, on a replica when configured.
+
+    Nothing is committed. Clients that wrote within ``read_your_writes_seconds``
+    read from the primary so they see their own changes.
+    """
+    use_primary = read_router.wrote_recently(request.cookies.get(LAST_WRITE_COOKIE))
+    async with read_router.session(use_primary=use_primary) as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote so ``get_read_db`` keeps them on the primary.
+
+    Successful responses to unsafe methods carry a ``LAST_WRITE_COOKIE`` that
+    expires with the sticky window. Without replicas nothing is set.
+    """
+
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in self.SAFE_METHODS
+            or not read_router.replicas
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={int(time.time() * 1000)}; "
+                    f"Max-Age={math.ceil(read_router.sticky_seconds)}; Path=/; HttpOnly; "
+                    "SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
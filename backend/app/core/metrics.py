@@ -0,0 +1,379 @@
+"""Prometheus metrics: request middleware, per-request SQL accounting, text exposition."""
+
+import bisect
+import logging
+import time
+from collections.abc import Iterator, Sequence
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Label for requests that matched no route, so unknown paths cannot grow the series
+UNMATCHED_ROUTE = "<unmatched>"
+
+LabelValues = tuple[str, ...]
+
+M = TypeVar("M", bound="Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """A metric family whose series are keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        """Overwrite a series, e.g. to mirror a total kept by another component."""
+        self.values[labels] = value
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value:g}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per series: count per bucket (last is +Inf), then sum
+        self.series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterator[str]:
+        bucket_names = (*self.labelnames, "le")
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                bucket_labels = _format_labels(bucket_names, (*labels, bound))
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            series_labels = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{series_labels} {total[0]:g}"
+            yield f"{self.name}_count{series_labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Holds metric families and renders them in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: M) -> M:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> bytes:
+        lines: list[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return ("\n".join(lines) + "\n").encode()
+
+    def clear(self) -> None:
+        """Drop every recorded series; used by tests."""
+        for metric in self.metrics:
+            if isinstance(metric, Histogram):
+                metric.series.clear()
+            elif isinstance(metric, Counter):
+                metric.values.clear()
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "taskflow_http_request_duration_seconds",
+        "Time from request start until the response body finished sending.",
+        LATENCY_BUCKETS,
+        ("method", "route"),
+    )
+)
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge(
+        "taskflow_http_requests_in_flight",
+        "Requests currently being served, including open streams.",
+        ("method",),
+    )
+)
+RESPONSES = registry.register(
+    Counter(
+        "taskflow_http_responses_total",
+        "Responses sent, by route and status code.",
+        ("method", "route", "status"),
+    )
+)
+REQUEST_STATEMENTS = registry.register(
+    Histogram(
+        "taskflow_http_request_db_statements",
+        "SQL statements executed per request.",
+        STATEMENT_BUCKETS,
+        ("method", "route"),
+    )
+)
+REQUEST_DB_SECONDS = registry.register(
+    Histogram(
+        "taskflow_http_request_db_seconds",
+        "Time spent executing SQL statements per request.",
+        LATENCY_BUCKETS,
+        ("method", "route"),
+    )
+)
+SLOW_QUERIES = registry.register(
+    Counter(
+        "taskflow_db_slow_queries_total",
+        "Statements slower than slow_query_threshold_ms, by issuing route.",
+        ("route",),
+    )
+)
+
+POOL_CHECKED_OUT = registry.register(
+    Gauge("taskflow_db_pool_checked_out", "Connections currently checked out of the pool.")
+)
+POOL_OVERFLOW = registry.register(
+    Gauge("taskflow_db_pool_overflow", "Overflow connections open beyond the pool size.")
+)
+POOL_CHECKOUT_FAILURES = registry.register(
+    Counter(
+        "taskflow_db_pool_checkout_failures_total",
+        "Pool checkouts that failed, by reason.",
+        ("reason",),
+    )
+)
+
+
+ADMISSION_ACTIVE = registry.register(
+    Gauge(
+        "taskflow_admission_active",
+        "Requests holding an admission slot, by route class.",
+        ("route_class",),
+    )
+)
+ADMISSION_WAITING = registry.register(
+    Gauge(
+        "taskflow_admission_waiting",
+        "Requests queued for an admission slot, by route class.",
+        ("route_class",),
+    )
+)
+ADMISSION_QUEUED = registry.register(
+    Counter(
+        "taskflow_admission_queued_total",
+        "Requests that had to queue for an admission slot, by route class.",
+        ("route_class",),
+    )
+)
+ADMISSION_QUEUE_SECONDS = registry.register(
+    Counter(
+        "taskflow_admission_queue_seconds_total",
+        "Time requests spent queued for an admission slot, by route class.",
+        ("route_class",),
+    )
+)
+ADMISSION_SHED = registry.register(
+    Counter(
+        "taskflow_admission_shed_total",
+        "Requests refused with 503, by route class and reason.",
+        ("route_class", "reason"),
+    )
+)
+
+PASSWORD_HASH_WORKERS = registry.register(
+    Gauge("taskflow_password_hash_workers", "Size of the bcrypt worker pool.")
+)
+PASSWORD_HASH_IN_FLIGHT = registry.register(
+    Gauge("taskflow_password_hash_in_flight", "bcrypt hashes and checks running on the pool.")
+)
+PASSWORD_HASH_WAITING = registry.register(
+    Gauge("taskflow_password_hash_waiting", "bcrypt hashes and checks queued for a worker.")
+)
+PASSWORD_HASH_MAX_WAITING = registry.register(
+    Gauge(
+        "taskflow_password_hash_max_waiting",
+        "Deepest the bcrypt queue has been since the process started.",
+    )
+)
+PASSWORD_HASH_COMPLETED = registry.register(
+    Counter("taskflow_password_hash_completed_total", "bcrypt hashes and checks completed.")
+)
+
+
+def update_pool_metrics(stats: dict[str, Any]) -> None:
+    """Copy an instrumented pool's counters into the registry before rendering."""
+    if "checked_out" not in stats:
+        return
+    POOL_CHECKED_OUT.set((), stats["checked_out"])
+    POOL_OVERFLOW.set((), stats["overflow"])
+    POOL_CHECKOUT_FAILURES.set(("timeout",), stats["checkout_timeouts"])
+    POOL_CHECKOUT_FAILURES.set(("error",), stats["checkout_errors"])
+
+
+def update_admission_metrics(stats: dict[str, dict[str, Any]]) -> None:
+    """Copy the admission limiters' counters into the registry before rendering."""
+    for name, limiter in stats.items():
+        ADMISSION_ACTIVE.set((name,), limiter["active"])
+        ADMISSION_WAITING.set((name,), limiter["waiting"])
+        ADMISSION_QUEUED.set((name,), limiter["queued"])
+        ADMISSION_QUEUE_SECONDS.set((name,), limiter["queue_seconds"])
+        for reason, count in limiter["shed"].items():
+            ADMISSION_SHED.set((name, reason), count)
+
+
+def update_password_hash_metrics(stats: dict[str, int]) -> None:
+    """Copy the password hasher's queue-depth counters into the registry before rendering."""
+    PASSWORD_HASH_WORKERS.set((), stats["workers"])
+    PASSWORD_HASH_IN_FLIGHT.set((), stats["in_flight"])
+    PASSWORD_HASH_WAITING.set((), stats["waiting"])
+    PASSWORD_HASH_MAX_WAITING.set((), stats["max_waiting"])
+    PASSWORD_HASH_COMPLETED.set((), stats["completed"])
+
+
+def route_label(scope: Scope) -> str:
+    """Return the matched route's full path template, never the raw path.
+
+    Routes of an included router carry only their own path, so the router
+    prefix is recovered from the request path: the template accounts for the
+    last ``template.count("/")`` segments and everything before is prefix.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    segments = scope["path"].split("/")
+    return "/".join(segments[: len(segments) - template.count("/")]) + template
+
+
+class RequestStats:
+    """SQL accounting for one request; the route resolves once routing has run."""
+
+    __slots__ = ("scope", "statements", "db_seconds")
+
+    def __init__(self, scope: Scope) -> None:
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope)
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """Charge a statement to the current request and log it if slow."""
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += seconds
+    threshold_ms = settings.slow_query_threshold_ms
+    if threshold_ms > 0 and seconds * 1000 >= threshold_ms:
+        route = stats.route if stats is not None else "<background>"
+        SLOW_QUERIES.inc((route,))
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s",
+            seconds * 1000,
+            route,
+            " ".join(statement.split())[:500],
+        )
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests, status codes and SQL use."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = "500"
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.inc((method,), -1)
+            current_request.reset(token)
+            labels = (method, stats.route)
+            REQUEST_DURATION.observe(labels, elapsed)
+            REQUEST_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_DB_SECONDS.observe(labels, stats.db_seconds)
+            RESPONSES.inc((*labels, status))
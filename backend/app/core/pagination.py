@@ -0,0 +1,52 @@
+"""Opaque cursor helpers for keyset pagination."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+
+class SortOrder(str, Enum):
+    """Sort direction for paginated listings."""
+
+    ASC = "asc"
+    DESC = "desc"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _object_hook(obj: dict[str, Any]) -> Any:
+    if set(obj) == {"$dt"}:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Encode a cursor payload as an opaque URL-safe string."""
+    raw = json.dumps(payload, default=_default, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode())
+        payload = json.loads(raw, object_hook=_object_hook)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Malformed cursor")
+    return payload
@@ -0,0 +1,154 @@
+"""Response classes and conditional-request helpers for read endpoints."""
+
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json, to_jsonable_python
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Clients that predate the registered type still send the experimental one
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded directly by pydantic-core's Rust serializer.
+
+    Returning one from a handler bypasses FastAPI's ``response_model``
+    validation, so callers must pass data already shaped like the declared
+    response model (plain dicts, enums and datetimes are fine).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class MsgPackResponse(Response):
+    """MessagePack response with the same shape and value formats as the JSON one.
+
+    Values msgpack has no type for (datetimes, dates) are converted the way
+    pydantic serializes them to JSON, so clients parse both encodings alike.
+    Requires the optional msgpack dependency; see ``msgpack_available``.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        import msgpack
+
+        return msgpack.packb(content, default=to_jsonable_python)
+
+
+def response_columns(model: type, schema: type[BaseModel]) -> list[Any]:
+    """The ``model`` columns behind each field of ``schema``, in field order.
+
+    Read endpoints select exactly these columns as plain rows, skipping ORM
+    hydration, and validate or serialize the rows as ``schema``.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def msgpack_available() -> bool:
+    """Whether the optional msgpack dependency is installed."""
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def quality_values(header: str | None) -> dict[str, float]:
+    """Parse an ``Accept``-style header into ``{lowercased token: q}``."""
+    values: dict[str, float] = {}
+    for item in (header or "").split(","):
+        token, *params = (part.strip() for part in item.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        values[token.lower()] = max(q, values.get(token.lower(), 0.0))
+    return values
+
+
+def prefers_msgpack(accept: str | None) -> bool:
+    """Whether ``Accept`` names MessagePack and ranks it above JSON.
+
+    Wildcards only ever select JSON, which stays the default; so does a tie.
+    """
+    if accept is None or not msgpack_available():
+        return False
+    accepted = quality_values(accept)
+    msgpack_q = max(accepted.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_q = accepted.get(
+        "application/json", accepted.get("application/*", accepted.get("*/*", 0.0))
+    )
+    return msgpack_q > json_q
+
+
+def negotiated_response(
+    content: Any, accept: str | None, headers: dict[str, str] | None = None
+) -> Response:
+    """Render ``content`` as MessagePack if the client prefers it, else as fast JSON."""
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if prefers_msgpack(accept):
+        return MsgPackResponse(content, headers=headers)
+    return FastJSONResponse(content, headers=headers)
+
+
+def json_body(response: Response, content: Any) -> bytes:
+    """The JSON rendering of ``content``, reusing ``response``'s body when it is JSON."""
+    if isinstance(response, FastJSONResponse):
+        return bytes(response.body)
+    return to_json(content)
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """Headers that let clients store a response and revalidate it on every use."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = True) -> bool:
+    """Whether an ``If-None-Match``/``If-Match`` header value matches ``etag``.
+
+    ``If-None-Match`` uses weak comparison (``W/`` prefixes are ignored);
+    pass ``weak=False`` for the strong comparison ``If-Match`` requires.
+    """
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """An empty ``304 Not Modified`` response for a matching ``If-None-Match``."""
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def cached_response(
+    body: bytes, etag: str, if_none_match: str | None, accept: str | None
+) -> Response:
+    """Answer from an already-rendered JSON body, or with 304 if the client has it.
+
+    A client preferring MessagePack gets the body re-encoded, so caches only
+    ever need to hold JSON.
+    """
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    headers = {**etag_headers(etag), "Vary": "Accept"}
+    if prefers_msgpack(accept):
+        return MsgPackResponse(from_json(body), headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,112 @@
+"""Password hashing on a bounded worker pool."""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+@lru_cache
+def build_crypt_context(rounds: int) -> CryptContext:
+    """Return the bcrypt context for a given cost factor."""
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def hash_password(password: str, rounds: int) -> str:
+    """Hash a password with bcrypt (blocking)."""
+    return build_crypt_context(rounds).hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str, rounds: int) -> bool:
+    """Verify a password against its bcrypt hash (blocking)."""
+    return build_crypt_context(rounds).verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a worker pool so it never blocks the event loop.
+
+    At most ``workers`` operations run at once; further callers wait on a
+    semaphore, which is what ``waiting`` reports. ``workers=0`` hashes inline on
+    the event loop. bcrypt releases the GIL, so threads scale across cores; set
+    ``use_processes`` to isolate the work in child processes instead.
+    """
+
+    def __init__(self, workers: int, rounds: int, use_processes: bool = False) -> None:
+        self.workers = workers
+        self.rounds = rounds
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max(workers, 1))
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        if self.workers == 0:
+            self.completed += 1
+            return func(*args)
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password off the event loop."""
+        return await self._run(check_password, plain_password, hashed_password, self.rounds)
+
+    def stats(self) -> dict[str, int]:
+        """Return pool size and queue-depth counters."""
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    rounds=settings.bcrypt_rounds,
+    use_processes=settings.password_hash_use_processes,
+)
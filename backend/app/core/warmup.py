@@ -0,0 +1,136 @@
+"""Startup warm-up, so a new worker's first requests are not its slowest.
+
+Run from the application lifespan. Until every step has succeeded the
+readiness probe (``GET /api/ready``) answers 503; ``/api/health`` stays a
+plain liveness check throughout.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from typing import Any
+
+from fastapi import FastAPI
+from jose import jwt
+from pydantic import EmailStr, TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.database import engine, read_router
+from app.core.security import password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+async def open_connections(target: AsyncEngine, count: int) -> None:
+    """Open ``count`` pool connections at once and run a trivial query on each.
+
+    They are held together so the pool has to create ``count`` distinct
+    connections, then all return to it ready for requests.
+    """
+
+    async def ping(stack: AsyncExitStack) -> None:
+        connection: AsyncConnection = await stack.enter_async_context(target.connect())
+        await connection.execute(text("SELECT 1"))
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(ping(stack) for _ in range(count)))
+
+
+async def warm_database() -> None:
+    """Configure the ORM mappers and put ``warmup_connections`` in each engine's pool."""
+    configure_mappers()
+    count = min(settings.warmup_connections, settings.db_pool_size)
+    if count > 0:
+        await asyncio.gather(
+            *(open_connections(target, count) for target in (engine, *read_router.replicas))
+        )
+
+
+async def warm_password_hashing() -> None:
+    """Load passlib's bcrypt backend and start the hashing worker pool."""
+    await password_hasher.hash("warm-up")
+
+
+async def warm_tokens() -> None:
+    """Sign and verify one token, loading jose's signing backend."""
+    token = jwt.encode({"sub": "warm-up"}, settings.secret_key, algorithm=settings.algorithm)
+    jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+
+class Warmup:
+    """Runs the warm-up steps in order, retrying until they all succeed.
+
+    ``durations`` records each finished step in milliseconds; ``ready`` flips
+    once the last one is done.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.attempts = 0
+        self.durations: dict[str, float] = {}
+        self.error: str | None = None
+
+    def steps(self, app: FastAPI) -> dict[str, Callable[[], Awaitable[None]]]:
+        async def warm_schemas() -> None:
+            # Builds the JSON schema of every model, which the first docs request
+            # would otherwise pay for, and exercises the email validator
+            app.openapi()
+            TypeAdapter(EmailStr).validate_python("warm-up@example.com")
+
+        async def warm_requests() -> None:
+            # Whatever a route's first request pays once (FastAPI reading the
+            # endpoint's source for error context, SQL compilation, serializers)
+            # is paid here instead. Any status below 500 counts as warm. httpx is
+            # imported here as it adds about 80 ms to importing the app
+            import httpx
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+                for path in settings.warmup_paths:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+        return {
+            "database": warm_database,
+            "password_hashing": warm_password_hashing,
+            "tokens": warm_tokens,
+            "schemas": warm_schemas,
+            "requests": warm_requests,
+        }
+
+    async def run(self, app: FastAPI) -> None:
+        """Warm everything up, retrying after ``warmup_retry_seconds`` on failure."""
+        while True:
+            self.attempts += 1
+            try:
+                for name, step in self.steps(app).items():
+                    if name in self.durations:
+                        continue
+                    started = time.perf_counter()
+                    await step()
+                    self.durations[name] = round((time.perf_counter() - started) * 1000, 1)
+            except Exception as exc:
+                self.error = repr(exc)[:200]
+                logger.warning("Warm-up attempt %d failed: %s", self.attempts, self.error)
+                await asyncio.sleep(settings.warmup_retry_seconds)
+                continue
+            self.error = None
+            self.ready = True
+            return
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "durations_ms": dict(self.durations),
+            "error": self.error,
+        }
+
+
+warmup = Warmup()
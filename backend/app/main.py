@@ -1,10 +1,40 @@
 """TaskFlow API - Main application entry point."""
 
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from app.api import auth, tasks, users
+from app.api import auth, diagnostics, tasks, users
+from app.core import metrics
+from app.core.admission import AdmissionMiddleware, admission_controller
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.database import ReadYourWritesMiddleware, engine, pool_stats, read_router
+from app.core.security import password_hasher
+from app.core.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm the worker up in the background; release pools and workers on shutdown.
+
+    Startup does not wait for the warm-up, so liveness probes pass at once
+    while ``/api/ready`` reports 503 until it finishes.
+    """
+    warming = asyncio.create_task(warmup.run(app)) if settings.warmup else None
+    yield
+    if warming is not None:
+        warming.cancel()
+        with suppress(asyncio.CancelledError):
+            await warming
+    password_hasher.shutdown()
+    for target in (engine, *read_router.replicas):
+        await target.dispose()
+
 
 app = FastAPI(
     title="TaskFlow API",
@@ -13,6 +43,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -22,15 +53,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browser clients read ETags to send back as If-Match, and page the
+    # user directory
+    expose_headers=["ETag", "X-Next-Cursor", "Link"],
 )
 
+if settings.response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality,
+    )
+app.add_middleware(ReadYourWritesMiddleware)
+# Inside the metrics middleware so shed requests still show up as 503s
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["Tasks"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
+app.include_router(diagnostics.router, prefix="/api/diagnostics", tags=["Diagnostics"])
 
 
 @app.get("/api/health")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy", "version": "0.1.0"}
+
+
+@app.get("/api/ready")
+async def readiness_check() -> JSONResponse:
+    """Readiness probe: 503 until the startup warm-up has finished, then 200."""
+    if settings.warmup and not warmup.ready:
+        return JSONResponse({"status": "warming_up", **warmup.stats()}, status_code=503)
+    return JSONResponse({"status": "ready", **warmup.stats()})
+
+
+@app.get("/api/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    """Expose request, SQL, pool, admission and password hashing metrics as Prometheus text."""
+    metrics.update_pool_metrics(pool_stats(engine))
+    metrics.update_admission_metrics(admission_controller.stats())
+    metrics.update_password_hash_metrics(password_hasher.stats())
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
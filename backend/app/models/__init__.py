@@ -1,6 +1,7 @@
 """Models package - export all models."""
 
 from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.task_stats import TaskDueRollup, TaskRollup
 from app.models.user import User
 
-__all__ = ["Task", "TaskPriority", "TaskStatus", "User"]
+__all__ = ["Task", "TaskDueRollup", "TaskPriority", "TaskRollup", "TaskStatus", "User"]
@@ -1,10 +1,26 @@
 """Task SQLAlchemy model."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum as PyEnum
-
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, func
+from typing import Any
+
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.core.database import Base
 
@@ -27,10 +43,36 @@ class TaskPriority(str, PyEnum):
     URGENT = "urgent"
 
 
+# Priority sorts by severity rather than by its stored name
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(TaskPriority)}
+
+
+def _utcnow() -> datetime:
+    """Client-side timestamp so stored values round-trip exactly on every dialect."""
+    return datetime.now(UTC)
+
+
 class Task(Base):
     """Task model representing a single task item."""
 
     __tablename__ = "tasks"
+    # Indexes follow the access paths in app/api/tasks.py; keep them in sync
+    # with the Alembic migrations under migrations/versions.
+    __table_args__ = (
+        Index("ix_tasks_status_priority_id", "status", "priority", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        Index("ix_tasks_owner_id", "owner_id"),
+        Index("ix_tasks_assignee_id", "assignee_id"),
+        Index(
+            "ix_tasks_open_due_date",
+            "due_date",
+            "id",
+            postgresql_where=text("status <> 'DONE'"),
+            sqlite_where=text("status <> 'DONE'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -43,10 +85,14 @@ class Task(Base):
     )
     due_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=_utcnow, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        onupdate=_utcnow,
+        nullable=False,
     )
 
     # Foreign keys
@@ -54,7 +100,9 @@ class Task(Base):
     assignee_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
 
     # Relationships
-    owner: Mapped["User"] = relationship("User", foreign_keys=[owner_id], back_populates="owned_tasks")
+    owner: Mapped["User"] = relationship(
+        "User", foreign_keys=[owner_id], back_populates="owned_tasks"
+    )
     assignee: Mapped["User | None"] = relationship(
         "User", foreign_keys=[assignee_id], back_populates="assigned_tasks"
     )
@@ -63,5 +111,81 @@ class Task(Base):
         return f"<Task(id={self.id}, title='{self.title}', status={self.status})>"
 
 
+class PriorityRank(FunctionElement[int]):
+    """A task's ``PRIORITY_RANK`` computed in SQL, for sorting by priority.
+
+    Rendered as a ``CASE`` with inline literals rather than bound parameters,
+    so the query's expression is exactly the one ``ix_tasks_priority_rank_id``
+    indexes and both dialects can read the ordering off that index.
+    """
+
+    type = Integer()
+    name = "priority_rank"
+    inherit_cache = True
+
+
+@compiles(PriorityRank)
+def _compile_priority_rank(element: PriorityRank, compiler: SQLCompiler, **kw: Any) -> str:
+    whens = " ".join(
+        f"WHEN '{priority.name}' THEN {rank}" for priority, rank in PRIORITY_RANK.items()
+    )
+    # Parenthesized, as PostgreSQL requires of expressions in CREATE INDEX
+    return f"(CASE {compiler.process(element.clauses, **kw)} {whens} END)"
+
+
+# More sort indexes for listings, next to ix_tasks_due_date_id; see
+# _sort_expression in app/api/tasks.py and keep in sync with the Alembic
+# migrations. PostgreSQL keeps NULLs last in ascending indexes, so descending
+# due-date pages (NULLs still last) need their own index there; SQLite reads
+# both directions from ix_tasks_due_date_id.
+Index("ix_tasks_due_date_desc_id", Task.due_date.desc().nulls_last(), Task.id.desc()).ddl_if(
+    dialect="postgresql"
+)
+Index("ix_tasks_priority_rank_id", PriorityRank(Task.priority), Task.id)
+
+
+# Full-text search lives outside the ORM mapping because each dialect needs its
+# own storage: PostgreSQL gets a generated tsvector column with a GIN index and
+# SQLite an external-content FTS5 table kept in sync by triggers. Alembic
+# revision 0003 creates the same objects on migrated databases.
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEX = "ix_tasks_search_vector"
+SEARCH_FTS_TABLE = "tasks_fts"
+
+for _statement in (
+    f"""ALTER TABLE tasks ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector GENERATED ALWAYS AS (
+        to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))
+    ) STORED""",
+    f"CREATE INDEX {SEARCH_VECTOR_INDEX} ON tasks USING gin ({SEARCH_VECTOR_COLUMN})",
+):
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+for _statement in (
+    f"""CREATE VIRTUAL TABLE {SEARCH_FTS_TABLE} USING fts5(
+        title, description, content='tasks', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+):
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
+
+
 # Import User at the bottom to avoid circular import
 from app.models.user import User  # noqa: E402, F401
@@ -0,0 +1,141 @@
+"""Rollup tables behind the task dashboard statistics."""
+
+from datetime import date
+
+from sqlalchemy import DDL, Date, Enum, Integer, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.task import Task, TaskPriority, TaskStatus
+
+# Assignee id recorded for unassigned tasks, since NULL cannot be part of a key
+UNASSIGNED = 0
+
+
+class TaskRollup(Base):
+    """Number of tasks per ``(status, priority, assignee)``.
+
+    Maintained by triggers on ``tasks``, so every write path (including COPY
+    and raw SQL) keeps it current within the writing transaction.
+    ``change_count`` goes up by one for every insert, update or delete that
+    touches the cell, so its sum over a filter only grows while that filtered
+    set changes, whatever order the writers commit in.
+    """
+
+    __tablename__ = "task_rollup"
+
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), primary_key=True)
+    priority: Mapped[TaskPriority] = mapped_column(Enum(TaskPriority), primary_key=True)
+    assignee_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    change_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+
+class TaskDueRollup(Base):
+    """Number of open tasks due on each UTC day, maintained like ``TaskRollup``."""
+
+    __tablename__ = "task_due_rollup"
+
+    due_on: Mapped[date] = mapped_column(Date, primary_key=True)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+# The triggers live outside the ORM mapping, like the full-text search objects
+# in app/models/task.py. Alembic revisions 0005 and 0007 create the same objects on
+# migrated databases; keep the two in sync.
+ROLLUP_FUNCTION = "task_rollup_apply"
+
+POSTGRESQL_ROLLUP = (
+    f"""CREATE OR REPLACE FUNCTION {ROLLUP_FUNCTION}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE'
+            AND (OLD.status, OLD.priority, OLD.assignee_id, OLD.due_date)
+            IS NOT DISTINCT FROM (NEW.status, NEW.priority, NEW.assignee_id, NEW.due_date) THEN
+            UPDATE task_rollup SET change_count = change_count + 1
+            WHERE status = NEW.status AND priority = NEW.priority
+                AND assignee_id = coalesce(NEW.assignee_id, {UNASSIGNED});
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO task_rollup (status, priority, assignee_id, task_count, change_count)
+            VALUES (OLD.status, OLD.priority, coalesce(OLD.assignee_id, {UNASSIGNED}), -1, 1)
+            ON CONFLICT (status, priority, assignee_id)
+            DO UPDATE SET task_count = task_rollup.task_count - 1,
+                change_count = task_rollup.change_count + 1;
+            IF OLD.status <> 'DONE' AND OLD.due_date IS NOT NULL THEN
+                INSERT INTO task_due_rollup (due_on, task_count)
+                VALUES ((OLD.due_date AT TIME ZONE 'UTC')::date, -1)
+                ON CONFLICT (due_on) DO UPDATE SET task_count = task_due_rollup.task_count - 1;
+            END IF;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO task_rollup (status, priority, assignee_id, task_count, change_count)
+            VALUES (NEW.status, NEW.priority, coalesce(NEW.assignee_id, {UNASSIGNED}), 1, 1)
+            ON CONFLICT (status, priority, assignee_id)
+            DO UPDATE SET task_count = task_rollup.task_count + 1,
+                change_count = task_rollup.change_count + 1;
+            IF NEW.status <> 'DONE' AND NEW.due_date IS NOT NULL THEN
+                INSERT INTO task_due_rollup (due_on, task_count)
+                VALUES ((NEW.due_date AT TIME ZONE 'UTC')::date, 1)
+                ON CONFLICT (due_on) DO UPDATE SET task_count = task_due_rollup.task_count + 1;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    f"""CREATE TRIGGER task_rollup
+    AFTER INSERT OR DELETE OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION {ROLLUP_FUNCTION}()""",
+)
+
+
+def _sqlite_rollup_change(row: str, delta: int) -> str:
+    """Statements applying ``delta`` for the ``old`` or ``new`` row inside a SQLite trigger."""
+    return f"""INSERT INTO task_rollup (status, priority, assignee_id, task_count, change_count)
+        VALUES ({row}.status, {row}.priority, coalesce({row}.assignee_id, {UNASSIGNED}), {delta}, 1)
+        ON CONFLICT (status, priority, assignee_id)
+        DO UPDATE SET task_count = task_count + excluded.task_count,
+            change_count = change_count + 1;
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT date({row}.due_date), {delta}
+        WHERE {row}.status <> 'DONE' AND {row}.due_date IS NOT NULL
+        ON CONFLICT (due_on) DO UPDATE SET task_count = task_count + excluded.task_count;"""
+
+
+_SQLITE_CELL_CHANGED = (
+    "(old.status IS NOT new.status OR old.priority IS NOT new.priority"
+    " OR old.assignee_id IS NOT new.assignee_id OR old.due_date IS NOT new.due_date)"
+)
+
+SQLITE_ROLLUP = {
+    "task_rollup_insert": f"""CREATE TRIGGER task_rollup_insert AFTER INSERT ON tasks BEGIN
+        {_sqlite_rollup_change("new", 1)}
+    END""",
+    "task_rollup_delete": f"""CREATE TRIGGER task_rollup_delete AFTER DELETE ON tasks BEGIN
+        {_sqlite_rollup_change("old", -1)}
+    END""",
+    "task_rollup_update": f"""CREATE TRIGGER task_rollup_update
+    AFTER UPDATE ON tasks WHEN {_SQLITE_CELL_CHANGED} BEGIN
+        {_sqlite_rollup_change("old", -1)}
+        {_sqlite_rollup_change("new", 1)}
+    END""",
+    # Updates that leave the task in its cell only count as a change
+    "task_rollup_touch": f"""CREATE TRIGGER task_rollup_touch
+    AFTER UPDATE ON tasks WHEN NOT ({_SQLITE_CELL_CHANGED}) BEGIN
+        UPDATE task_rollup SET change_count = change_count + 1
+        WHERE status = new.status AND priority = new.priority
+            AND assignee_id = coalesce(new.assignee_id, {UNASSIGNED});
+    END""",
+}
+
+# Trigger bodies resolve the rollup tables when they fire, so the triggers can
+# be created with ``tasks`` whichever table create_all emits first
+for _statement in POSTGRESQL_ROLLUP:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_ROLLUP.values():
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "after_drop",
+    DDL(f"DROP FUNCTION IF EXISTS {ROLLUP_FUNCTION}()").execute_if(dialect="postgresql"),
+)
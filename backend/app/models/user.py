@@ -1,12 +1,46 @@
 """User SQLAlchemy model."""
 
+from collections.abc import Callable, Mapping
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import Boolean, DateTime, Integer, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, func
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.core.database import Base
 
+# Directory search matches a prefix of any of these; see app/api/users.py and
+# keep in sync with the Alembic migrations under migrations/versions.
+PREFIX_SEARCH_COLUMNS = ("username", "full_name", "email")
+
+
+def prefix_key(value: str | None) -> str | None:
+    """Fold ``value`` the way directory searches fold their query."""
+    return value.casefold() if value is not None else None
+
+
+def prefix_keys(values: Mapping[str, Any]) -> dict[str, str | None]:
+    """The ``*_key`` column values to write alongside the searchable ``values``.
+
+    Bulk ``UPDATE`` statements bypass the ORM, so they must set these themselves.
+    """
+    return {
+        f"{name}_key": prefix_key(values[name]) for name in PREFIX_SEARCH_COLUMNS if name in values
+    }
+
+
+def _folded(name: str) -> Callable[[DefaultExecutionContext], str | None]:
+    """Column default folding ``name`` from the same row, for Core inserts."""
+
+    def default(context: DefaultExecutionContext) -> str | None:
+        return prefix_key(context.get_current_parameters().get(name))
+
+    return default
+
 
 class User(Base):
     """User model representing an application user."""
@@ -18,6 +52,14 @@ class User(Base):
     username: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     full_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Case-folded copies of the searchable columns, kept by prefix_key()
+    username_key: Mapped[str] = mapped_column(
+        String(100), default=_folded("username"), nullable=False
+    )
+    full_name_key: Mapped[str | None] = mapped_column(
+        String(255), default=_folded("full_name"), nullable=True
+    )
+    email_key: Mapped[str] = mapped_column(String(255), default=_folded("email"), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_superuser: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -35,9 +77,44 @@ class User(Base):
         "Task", foreign_keys="Task.assignee_id", back_populates="assignee"
     )
 
+    @validates(*PREFIX_SEARCH_COLUMNS)
+    def _fold_prefix_key(self, name: str, value: str | None) -> str | None:
+        setattr(self, f"{name}_key", prefix_key(value))
+        return value
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
 
 
+class PrefixKey(FunctionElement[str]):
+    """A ``*_key`` column as prefix searches compare and sort it.
+
+    The keys are folded in Python with ``str.casefold()``, like the query, so
+    matching does not depend on how the database folds non-ASCII text.
+    PostgreSQL compares them under the "C" collation, byte-wise like
+    ``text_pattern_ops``, so an index on the same expression serves both the
+    range ``key >= q AND key < q_next`` and ``ORDER BY key``. SQLite compares
+    byte-wise already.
+    """
+
+    type = String()
+    name = "prefix_key"
+    inherit_cache = True
+
+
+@compiles(PrefixKey)
+def _compile_prefix_key(element: PrefixKey, compiler: SQLCompiler, **kw: Any) -> str:
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(PrefixKey, "postgresql")
+def _compile_prefix_key_postgresql(element: PrefixKey, compiler: SQLCompiler, **kw: Any) -> str:
+    return f'{compiler.process(element.clauses, **kw)} COLLATE "C"'
+
+
+for _name in PREFIX_SEARCH_COLUMNS:
+    Index(f"ix_users_{_name}_prefix", PrefixKey(getattr(User, f"{_name}_key")))
+
+
 # Import Task at the bottom to avoid circular import
 from app.models.task import Task  # noqa: E402, F401
@@ -0,0 +1,140 @@
+"""Read-through cache for task reads, invalidated through versioned keys."""
+
+import hashlib
+import json
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, create_cache_backend
+from app.core.config import settings
+from app.core.database import CommitHook
+
+LIST_VERSION_KEY = "tasks:list:version"
+
+
+def _task_version_key(task_id: int) -> str:
+    return f"tasks:{task_id}:version"
+
+
+class CacheKey(NamedTuple):
+    """A data key and the version counter it was built from."""
+
+    data: str
+    version: str
+
+
+class TaskCache:
+    """Caches rendered ``get_task`` and ``list_tasks`` bodies with their ETags.
+
+    Data keys embed a version counter: one per task for single-task reads and
+    one shared by every listing. Writers bump the counters once their
+    transaction commits, which orphans the stale entries instead of deleting
+    them, so a reader racing a writer can only ever store under an old key.
+    Entries also expire after ``ttl`` seconds, which bounds staleness for
+    writes made by other workers when the backend is process-local.
+
+    A replica may not have applied a write yet when its version is bumped, so
+    bodies read from a replica are not stored until ``replica_lag_seconds``
+    after their version was last bumped. The backend records when, so this
+    holds for bumps made by any worker.
+    """
+
+    def __init__(
+        self, backend: CacheBackend | None, ttl: float, replica_lag_seconds: float = 0.0
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.replica_lag_seconds = replica_lag_seconds
+        self.hits = {"task": 0, "list": 0}
+        self.misses = {"task": 0, "list": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    async def task_key(self, task_id: int) -> CacheKey:
+        """Return the data key for a single task at its current version."""
+        assert self.backend is not None
+        version_key = _task_version_key(task_id)
+        version = await self.backend.version(version_key)
+        return CacheKey(f"tasks:{task_id}:v{version}", version_key)
+
+    async def list_key(self, params: Mapping[str, Any]) -> CacheKey:
+        """Return the data key for a listing at the current list version."""
+        assert self.backend is not None
+        version = await self.backend.version(LIST_VERSION_KEY)
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode(), usedforsecurity=False
+        ).hexdigest()
+        return CacheKey(f"tasks:list:v{version}:{digest}", LIST_VERSION_KEY)
+
+    async def get(self, kind: str, key: CacheKey) -> tuple[str, bytes] | None:
+        """Look up an ``(etag, body)`` pair, counting the hit or miss under ``kind``."""
+        assert self.backend is not None
+        value = await self.backend.get(key.data)
+        if value is None:
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    async def set(self, key: CacheKey, etag: str, body: bytes, from_replica: bool = False) -> None:
+        """Store a rendered body together with its ETag."""
+        assert self.backend is not None
+        if from_replica and self.replica_lag_seconds > 0:
+            bumped_at = await self.backend.bumped_at(key.version)
+            if bumped_at is not None and time.time() - bumped_at < self.replica_lag_seconds:
+                return
+        await self.backend.set(key.data, etag.encode() + b"\n" + body, self.ttl)
+
+    def invalidate(self, task_ids: Iterable[int]) -> None:
+        """Bump the list version and the versions of ``task_ids`` immediately."""
+        if self.backend is not None:
+            keys = [LIST_VERSION_KEY, *(_task_version_key(task_id) for task_id in task_ids)]
+            self.backend.bump_versions(keys)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the backend name with hit/miss counts and hit ratios per read kind."""
+        stats: dict[str, Any] = {"backend": self.backend.name if self.backend else None}
+        for kind in self.hits:
+            lookups = self.hits[kind] + self.misses[kind]
+            stats[kind] = {
+                "hits": self.hits[kind],
+                "misses": self.misses[kind],
+                "hit_ratio": self.hits[kind] / lookups if lookups else 0.0,
+            }
+        return stats
+
+    def clear(self) -> None:
+        """Reset the counters and drop every entry held in process."""
+        self.hits = dict.fromkeys(self.hits, 0)
+        self.misses = dict.fromkeys(self.misses, 0)
+        if isinstance(self.backend, MemoryCacheBackend):
+            self.backend.clear()
+
+
+task_cache = TaskCache(
+    create_cache_backend(
+        settings.cache_backend,
+        settings.redis_url,
+        maxsize=settings.task_cache_max_entries,
+        ttl=settings.task_cache_ttl_seconds,
+    ),
+    ttl=settings.task_cache_ttl_seconds,
+    replica_lag_seconds=settings.read_your_writes_seconds if settings.database_read_url else 0.0,
+)
+
+
+def mark_tasks_changed(db: AsyncSession, task_ids: Iterable[int] = ()) -> None:
+    """Invalidate cached reads for ``task_ids`` and all listings once ``db`` commits.
+
+    Pass no ids for inserts, which can only affect listings.
+    """
+    _changed_tasks.pending(db).update(task_ids)
+
+
+_changed_tasks: CommitHook[set[int]] = CommitHook("task_cache_changes", set, task_cache.invalidate)
@@ -0,0 +1,46 @@
+"""Task totals and versions: the listing filter and what it matches."""
+
+from sqlalchemy import ColumnElement, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.task_stats import TaskRollup
+
+
+def task_filter(
+    status: TaskStatus | None, priority: TaskPriority | None
+) -> ColumnElement[bool] | None:
+    """Build the WHERE clause shared by task listings and their totals."""
+    clauses = []
+    if status:
+        clauses.append(Task.status == status)
+    if priority:
+        clauses.append(Task.priority == priority)
+    return and_(*clauses) if clauses else None
+
+
+async def task_set_state(
+    db: AsyncSession,
+    status: TaskStatus | None,
+    priority: TaskPriority | None,
+    include_total: bool,
+) -> tuple[int, int | None]:
+    """Read the filtered set's version and, if asked, its size from ``task_rollup``.
+
+    The version sums ``change_count`` over the matching cells: every insert,
+    update or delete of a matching task raises it when it commits, in whatever
+    order concurrent writers commit, so two reads return the same value only if
+    the filtered set is unchanged. The total sums ``task_count`` over the same
+    cells. Both cost one query over at most one row per (status, priority,
+    assignee), however many tasks there are.
+    """
+    columns = [func.coalesce(func.sum(TaskRollup.change_count), 0)]
+    if include_total:
+        columns.append(func.coalesce(func.sum(TaskRollup.task_count), 0))
+    query = select(*columns)
+    if status:
+        query = query.where(TaskRollup.status == status)
+    if priority:
+        query = query.where(TaskRollup.priority == priority)
+    row = (await db.execute(query)).one()
+    return row[0], row[1] if include_total else None
@@ -0,0 +1,231 @@
+"""Task change feed: an async pub/sub bus fed by the task write handlers."""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Coroutine
+from typing import Any
+
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import REDIS_MISSING
+from app.core.config import settings
+from app.core.database import CommitHook
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "taskflow:task-events"
+
+# Sent when a subscriber fell behind and lost events; clients should refetch
+RESYNC = b"event: resync\ndata: {}\n\n"
+HEARTBEAT = b": heartbeat\n\n"
+
+
+def render_event(message: dict[str, Any]) -> bytes:
+    """Encode a ``{"type": ..., ...}`` message as one SSE frame."""
+    return b"event: " + message["type"].encode() + b"\ndata: " + to_json(message) + b"\n\n"
+
+
+class Subscription:
+    """One subscriber's bounded queue of rendered frames.
+
+    When the queue is full the backlog is dropped and replaced by a single
+    ``resync`` frame, so a slow client costs at most ``maxsize`` frames of
+    memory and learns that it has to refetch instead of silently missing
+    changes.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.last_active = time.monotonic()
+        self._frames: deque[bytes] = deque()
+        self._waiter: asyncio.Future[None] | None = None
+
+    def push(self, frame: bytes) -> None:
+        if len(self._frames) >= self.maxsize:
+            self.dropped += len(self._frames)
+            self._frames.clear()
+            self._frames.append(RESYNC)
+        elif self._frames and self._frames[0] is RESYNC:
+            # Already resyncing; anything queued after it is redundant
+            self.dropped += 1
+            return
+        else:
+            self._frames.append(frame)
+        self.wake()
+
+    def wake(self) -> None:
+        """Release a pending :meth:`next_frames`, with or without frames."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def next_frames(self) -> list[bytes]:
+        """Wait for frames; an empty list means the bus asked for a heartbeat."""
+        if not self._frames:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        frames = list(self._frames)
+        self._frames.clear()
+        self.last_active = time.monotonic()
+        return frames
+
+
+class TaskEventBus:
+    """Fans task change messages out to every local subscriber.
+
+    One ticker per bus wakes subscribers that have been idle for
+    ``heartbeat_seconds``, so idle connections cost no timers of their own.
+    With a Redis URL, messages are published to a Redis channel instead and a
+    single listener per worker delivers them locally, so subscribers on any
+    worker see writes made on every worker.
+    """
+
+    def __init__(
+        self, queue_size: int, heartbeat_seconds: float = 15.0, redis_url: str | None = None
+    ) -> None:
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.redis_url = redis_url
+        self.published = 0
+        self._subscribers: set[Subscription] = set()
+        self._ticker: asyncio.Task[None] | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._redis: Any = None
+        self._pending: set[asyncio.Task[None]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        loop = asyncio.get_running_loop()
+        if self._ticker is None or self._ticker.done():
+            self._ticker = loop.create_task(self._tick())
+        if self.redis_url and self._listener is None:
+            self._listener = loop.create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, messages: list[dict[str, Any]]) -> None:
+        """Publish messages to every subscriber; returns without waiting on Redis."""
+        if self.redis_url:
+            self._spawn(self._publish_redis(messages))
+        else:
+            self.deliver(messages)
+
+    def deliver(self, messages: list[dict[str, Any]]) -> None:
+        """Render each message once and push it to every local subscriber."""
+        for message in messages:
+            frame = render_event(message)
+            self.published += 1
+            for subscription in self._subscribers:
+                subscription.push(frame)
+
+    def resync_all(self) -> None:
+        for subscription in self._subscribers:
+            subscription.push(RESYNC)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": sum(subscription.dropped for subscription in self._subscribers),
+        }
+
+    async def _tick(self) -> None:
+        """Wake idle subscribers for heartbeats; exits once nobody is subscribed."""
+        while self._subscribers:
+            await asyncio.sleep(self.heartbeat_seconds / 2)
+            idle_since = time.monotonic() - self.heartbeat_seconds
+            for subscription in self._subscribers:
+                if subscription.last_active <= idle_since:
+                    subscription.wake()
+
+    def _client(self) -> Any:
+        if self._redis is None:
+            from redis.asyncio import Redis
+
+            self._redis = Redis.from_url(self.redis_url)
+        return self._redis
+
+    async def _publish_redis(self, messages: list[dict[str, Any]]) -> None:
+        await self._client().publish(REDIS_CHANNEL, to_json(messages))
+
+    async def _listen(self) -> None:
+        """Relay the Redis channel to local subscribers, reconnecting on failure."""
+        while True:
+            try:
+                async with self._client().pubsub() as pubsub:
+                    await pubsub.subscribe(REDIS_CHANNEL)
+                    async for item in pubsub.listen():
+                        if item["type"] == "message":
+                            self.deliver(json.loads(item["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Task event listener lost its Redis connection")
+                # Whatever was published meanwhile is lost to this worker
+                self.resync_all()
+                await asyncio.sleep(1.0)
+
+    def _spawn(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+def _create_bus() -> TaskEventBus:
+    if settings.redis_url:
+        # Without Redis each worker would only see its own events
+        try:
+            import redis.asyncio  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(REDIS_MISSING) from exc
+    return TaskEventBus(
+        queue_size=settings.event_queue_size,
+        heartbeat_seconds=settings.event_heartbeat_seconds,
+        redis_url=settings.redis_url,
+    )
+
+
+task_event_bus = _create_bus()
+
+
+async def event_stream(bus: TaskEventBus, retry_ms: int = 3000) -> AsyncIterator[bytes]:
+    """Yield SSE frames for one client until it disconnects."""
+    subscription = bus.subscribe()
+    try:
+        yield f"retry: {retry_ms}\n\n".encode()
+        while True:
+            frames = await subscription.next_frames()
+            yield b"".join(frames) if frames else HEARTBEAT
+    finally:
+        bus.unsubscribe(subscription)
+
+
+def queue_task_event(
+    db: AsyncSession, event_type: str, task_id: int | None = None, task: Any = None
+) -> None:
+    """Publish a task change once ``db`` commits; dropped if it rolls back.
+
+    ``event_type`` is ``created``, ``updated``, ``deleted`` or ``resync`` (for
+    changes too large to describe, such as imports). ``task`` is the task body
+    as a dict or response model.
+    """
+    _queued_events.pending(db).append({"type": event_type, "id": task_id, "task": task})
+
+
+_queued_events: CommitHook[list[dict[str, Any]]] = CommitHook(
+    "task_events", list, task_event_bus.publish
+)
@@ -0,0 +1,179 @@
+"""Streaming task export encoders (NDJSON, CSV and Arrow IPC)."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import ColumnElement, Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+
+
+class ExportFormat(str, Enum):
+    """Supported export encodings."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+    ARROW = "arrow"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+}
+
+EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "owner_id",
+    "assignee_id",
+    "created_at",
+    "updated_at",
+)
+
+RowEncoder = Callable[[Sequence[Row[Any]]], bytes]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(rows: Sequence[Row[Any]]) -> bytes:
+    lines = (
+        json.dumps({name: _plain(value) for name, value in zip(EXPORT_COLUMNS, row, strict=True)})
+        for row in rows
+    )
+    return "".join(f"{line}\n" for line in lines).encode()
+
+
+class _CsvEncoder:
+    def __init__(self) -> None:
+        self._header_written = False
+
+    def __call__(self, rows: Sequence[Row[Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self._header_written:
+            writer.writerow(EXPORT_COLUMNS)
+            self._header_written = True
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        return buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+class _ArrowEncoder:
+    def __init__(self) -> None:
+        import pyarrow as pa
+
+        self._pa = pa
+        timestamp = pa.timestamp("us", tz="UTC")
+        self._schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("title", pa.string()),
+                ("description", pa.string()),
+                ("status", pa.string()),
+                ("priority", pa.string()),
+                ("due_date", timestamp),
+                ("owner_id", pa.int64()),
+                ("assignee_id", pa.int64()),
+                ("created_at", timestamp),
+                ("updated_at", timestamp),
+            ]
+        )
+        self._sink = _ChunkSink()
+        self._writer = pa.ipc.new_stream(self._sink, self._schema)
+
+    def __call__(self, rows: Sequence[Row[Any]]) -> bytes:
+        columns = list(zip(*rows, strict=True)) if rows else [[] for _ in EXPORT_COLUMNS]
+        arrays = [
+            self._pa.array(
+                [value.value if isinstance(value, Enum) else value for value in column],
+                type=field.type,
+            )
+            for column, field in zip(columns, self._schema, strict=True)
+        ]
+        self._writer.write_batch(self._pa.record_batch(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def arrow_available() -> bool:
+    """Whether the optional pyarrow dependency is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def stream_tasks(
+    db: AsyncSession,
+    export_format: ExportFormat,
+    whereclause: ColumnElement[bool] | None,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """Yield the encoded task export one fixed-size batch at a time.
+
+    Rows come from a server-side cursor, so memory use is bounded by
+    ``batch_size`` however many tasks match.
+    """
+    query = select(*(getattr(Task, name) for name in EXPORT_COLUMNS)).order_by(Task.id)
+    if whereclause is not None:
+        query = query.where(whereclause)
+
+    arrow = _ArrowEncoder() if export_format == ExportFormat.ARROW else None
+    encode: RowEncoder
+    if arrow is not None:
+        encode = arrow
+    elif export_format == ExportFormat.CSV:
+        encode = _CsvEncoder()
+    else:
+        encode = _encode_ndjson
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    wrote_any = False
+    async for rows in result.partitions(batch_size):
+        wrote_any = True
+        yield encode(rows)
+
+    if not wrote_any and export_format == ExportFormat.CSV:
+        # An empty CSV export still carries its header
+        yield encode([])
+    if arrow is not None:
+        yield arrow.finish()
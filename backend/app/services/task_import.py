@@ -0,0 +1,171 @@
+"""Bulk task import: chunked validation and COPY/executemany loading."""
+
+import csv
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, TextIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.models.user import User
+
+# Columns written by an import; ids and timestamps come from database defaults
+IMPORT_COLUMNS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "owner_id",
+    "assignee_id",
+)
+
+
+class ImportFormat(str, Enum):
+    """Supported import encodings."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import run."""
+
+    imported: int = 0
+    failed: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    errors_truncated: bool = False
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.imported / self.elapsed_seconds
+
+    def add_error(self, line: int, message: str, max_errors: int) -> None:
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append((line, message))
+        else:
+            self.errors_truncated = True
+
+
+@dataclass(frozen=True)
+class _InvalidRecord:
+    """A line that could not be parsed into a record at all."""
+
+    message: str
+
+
+def detect_format(filename: str | None) -> ImportFormat:
+    """Guess the import format from a file name, defaulting to NDJSON."""
+    if filename and filename.lower().endswith(".csv"):
+        return ImportFormat.CSV
+    return ImportFormat.NDJSON
+
+
+def _read_records(stream: TextIO, import_format: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line number, raw record)`` pairs, or an ``_InvalidRecord`` for unparsable lines."""
+    if import_format == ImportFormat.CSV:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # Empty cells mean "not provided" so schema defaults apply
+            yield reader.line_num, {key: value for key, value in record.items() if value != ""}
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, _InvalidRecord(f"Invalid JSON: {exc.msg}")
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _load_chunk(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Write validated rows with COPY on PostgreSQL, or executemany elsewhere."""
+    if db.get_bind().dialect.name == "postgresql":
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        records = [
+            tuple(
+                # Enum columns store member names
+                row[column].name if isinstance(row[column], Enum) else row[column]
+                for column in IMPORT_COLUMNS
+            )
+            for row in rows
+        ]
+        await raw_connection.driver_connection.copy_records_to_table(
+            Task.__tablename__, records=records, columns=list(IMPORT_COLUMNS)
+        )
+    else:
+        await db.execute(insert(Task), rows)
+
+
+async def import_tasks(
+    db: AsyncSession,
+    stream: TextIO,
+    import_format: ImportFormat,
+    schema: type[BaseModel],
+    owner_id: int,
+    chunk_size: int,
+    max_errors: int,
+) -> ImportReport:
+    """Validate ``stream`` against ``schema`` chunk by chunk and load the valid rows.
+
+    Rows with an unknown ``assignee_id`` are rejected up front so one bad row
+    cannot abort a whole COPY.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    chunk: list[tuple[int, dict[str, Any]]] = []
+
+    async def flush() -> None:
+        assignee_ids = {row["assignee_id"] for _, row in chunk if row["assignee_id"] is not None}
+        known: set[int] = set()
+        if assignee_ids:
+            result = await db.execute(select(User.id).where(User.id.in_(assignee_ids)))
+            known = set(result.scalars().all())
+        rows = []
+        for line, row in chunk:
+            if row["assignee_id"] is not None and row["assignee_id"] not in known:
+                report.add_error(line, f"User with id {row['assignee_id']} not found", max_errors)
+            else:
+                rows.append(row)
+        if rows:
+            await _load_chunk(db, rows)
+            report.imported += len(rows)
+        chunk.clear()
+
+    for line, record in _read_records(stream, import_format):
+        if isinstance(record, _InvalidRecord):
+            report.add_error(line, record.message, max_errors)
+            continue
+        try:
+            task = schema.model_validate(record)
+        except ValidationError as exc:
+            report.add_error(line, _format_validation_error(exc), max_errors)
+            continue
+        chunk.append((line, {**task.model_dump(), "owner_id": owner_id}))
+        if len(chunk) >= chunk_size:
+            await flush()
+    if chunk:
+        await flush()
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
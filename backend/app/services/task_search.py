@@ -0,0 +1,103 @@
+"""Ranked full-text task search on PostgreSQL tsvector or SQLite FTS5."""
+
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    RowMapping,
+    Select,
+    and_,
+    column,
+    exists,
+    false,
+    func,
+    join,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import SEARCH_FTS_TABLE, SEARCH_VECTOR_COLUMN, Task
+
+SEARCH_DIALECTS = frozenset({"postgresql", "sqlite"})
+
+_fts = table(SEARCH_FTS_TABLE, column("rowid"), column("rank"))
+
+
+def _fts5_query(q: str) -> str | None:
+    """Quote each word so user input can never be parsed as FTS5 query syntax."""
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+async def search_task_rows(
+    db: AsyncSession,
+    q: str,
+    columns: Sequence[ColumnElement[Any]],
+    whereclause: ColumnElement[bool] | None,
+    limit: int,
+    after: tuple[float, int] | None = None,
+    window: int = 0,
+) -> tuple[Sequence[RowMapping], bool]:
+    """Return up to ``limit`` matching rows, best match first, with a ``rank`` column.
+
+    Higher ranks are better and ties are broken by ascending id, so
+    ``after=(rank, id)`` from the last row of a page continues the listing.
+    PostgreSQL matches with ``websearch_to_tsquery`` against the GIN-indexed
+    ``search_vector`` and ranks with ``ts_rank_cd``; SQLite matches against
+    the FTS5 table and ranks with negated BM25.
+
+    Ranking has to score every match, so a positive ``window`` only ranks the
+    ``window`` most recent matches (by id). That bounds the work for terms that
+    match a large share of the table, but older matches are then never
+    returned; the second element of the result is true when some were left out.
+    """
+    dialect = db.get_bind().dialect.name
+    rank: ColumnElement[float]
+    if dialect == "postgresql":
+        vector = literal_column(f"tasks.{SEARCH_VECTOR_COLUMN}")
+        tsquery = func.websearch_to_tsquery("english", q)
+        rank = func.ts_rank_cd(vector, tsquery)
+        match = vector.op("@@")(tsquery)
+        # Not mapped on the model, so it needs an explicit FROM
+        source: Any = Task.__table__
+        matched_id: ColumnElement[int] = Task.id
+    elif dialect == "sqlite":
+        fts_query = _fts5_query(q)
+        rank = -_fts.c.rank
+        match = literal_column(SEARCH_FTS_TABLE).op("MATCH")(fts_query) if fts_query else false()
+        source = join(_fts, Task.__table__, _fts.c.rowid == Task.id)
+        # FTS5 walks and filters its own rowids far faster than the joined id
+        matched_id = _fts.c.rowid
+    else:
+        raise NotImplementedError(f"Task search is not supported on {dialect}")
+
+    def matching(query: Select[Any]) -> Select[Any]:
+        query = query.select_from(source).where(match)
+        return query if whereclause is None else query.where(whereclause)
+
+    query = matching(select(*columns, rank.label("rank")))
+    truncated = False
+    if window > 0:
+        floor = (
+            matching(select(matched_id))
+            .order_by(matched_id.desc())
+            .offset(window - 1)
+            .limit(1)
+            .scalar_subquery()
+            .correlate(None)
+        )
+        query = query.where(matched_id >= func.coalesce(floor, 0))
+        older = matching(select(matched_id)).where(matched_id < floor)
+        truncated = bool(await db.scalar(select(exists(older))))
+    if after is not None:
+        last_rank, last_id = after
+        query = query.where(or_(rank < last_rank, and_(rank == last_rank, Task.id > last_id)))
+    result = await db.execute(query.order_by(rank.desc(), Task.id.asc()).limit(limit))
+    return result.mappings().all(), truncated
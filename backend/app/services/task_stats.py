@@ -0,0 +1,158 @@
+"""Dashboard statistics, from one aggregate over tasks or from the rollup tables."""
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import UTC, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.task_stats import UNASSIGNED, TaskDueRollup, TaskRollup
+
+# Spelled like the predicate of ix_tasks_open_due_date so SQLite can use that index
+OPEN_TASK: ColumnElement[bool] = Task.status != literal_column("'DONE'")
+
+# (status, priority, task count) and (assignee id or None, total, open)
+CellRow = tuple[TaskStatus, TaskPriority, int]
+AssigneeRow = tuple[int | None, int, int]
+
+
+def _day_start(moment: datetime, days: int = 0) -> datetime:
+    """Midnight UTC of the day ``days`` after ``moment``'s."""
+    return datetime.combine(moment.date() + timedelta(days=days), time(), tzinfo=UTC)
+
+
+def _summarize(
+    cells: Iterable[CellRow], assignees: Iterable[AssigneeRow], overdue: int, due_soon: int
+) -> dict[str, Any]:
+    """Shape grouped counts like ``TaskStatsResponse``; ``assignees`` come busiest first."""
+    by_status_priority = {
+        status.value: dict.fromkeys((p.value for p in TaskPriority), 0) for status in TaskStatus
+    }
+    total = 0
+    for status, priority, count in cells:
+        by_status_priority[status.value][priority.value] += count
+        total += count
+    return {
+        "total": total,
+        "by_status_priority": by_status_priority,
+        "by_assignee": [
+            {"assignee_id": assignee_id, "total": count, "open": open_count}
+            for assignee_id, count, open_count in assignees
+        ],
+        "overdue": overdue,
+        "due_soon": due_soon,
+    }
+
+
+async def aggregate_task_stats(
+    db: AsyncSession, now: datetime, due_soon_days: int, assignee_limit: int
+) -> dict[str, Any]:
+    """Compute the statistics with a single ``GROUP BY`` over every task."""
+    soon_end = _day_start(now, due_soon_days + 1)
+    query = select(
+        Task.status,
+        Task.priority,
+        Task.assignee_id,
+        func.count(),
+        func.sum(case((and_(OPEN_TASK, Task.due_date < now), 1), else_=0)),
+        func.sum(
+            case((and_(OPEN_TASK, Task.due_date >= now, Task.due_date < soon_end), 1), else_=0)
+        ),
+    ).group_by(Task.status, Task.priority, Task.assignee_id)
+    rows = (await db.execute(query)).all()
+
+    cells: Counter[tuple[TaskStatus, TaskPriority]] = Counter()
+    totals: Counter[int | None] = Counter()
+    open_totals: Counter[int | None] = Counter()
+    for status, priority, assignee_id, count, _, _ in rows:
+        cells[status, priority] += count
+        totals[assignee_id] += count
+        if status != TaskStatus.DONE:
+            open_totals[assignee_id] += count
+    busiest = sorted(
+        totals,
+        key=lambda assignee_id: (-totals[assignee_id], assignee_id is None, assignee_id or 0),
+    )
+    return _summarize(
+        ((status, priority, count) for (status, priority), count in cells.items()),
+        [
+            (assignee_id, totals[assignee_id], open_totals[assignee_id])
+            for assignee_id in busiest[:assignee_limit]
+        ],
+        overdue=sum(row[4] for row in rows),
+        due_soon=sum(row[5] for row in rows),
+    )
+
+
+async def rollup_task_stats(
+    db: AsyncSession, now: datetime, due_soon_days: int, assignee_limit: int
+) -> dict[str, Any]:
+    """Read the statistics from the rollup tables, whatever the number of tasks.
+
+    Whole days come from ``task_due_rollup``; only today's open tasks are
+    counted live, through the open-due-date index, to split them at ``now``.
+    """
+    cells = await db.execute(
+        select(TaskRollup.status, TaskRollup.priority, func.sum(TaskRollup.task_count))
+        .group_by(TaskRollup.status, TaskRollup.priority)
+        .having(func.sum(TaskRollup.task_count) != 0)
+    )
+    assignee_total = func.sum(TaskRollup.task_count)
+    assignees = await db.execute(
+        select(
+            TaskRollup.assignee_id,
+            assignee_total,
+            func.sum(
+                case(
+                    (TaskRollup.status != literal_column("'DONE'"), TaskRollup.task_count), else_=0
+                )
+            ),
+        )
+        .group_by(TaskRollup.assignee_id)
+        .having(assignee_total != 0)
+        # Unassigned sorts after any assignee with the same total, as in the live path
+        .order_by(
+            assignee_total.desc(),
+            TaskRollup.assignee_id == UNASSIGNED,
+            TaskRollup.assignee_id,
+        )
+        .limit(assignee_limit)
+    )
+
+    today = now.date()
+    today_start, tomorrow_start = _day_start(now), _day_start(now, 1)
+
+    def due_days(*clauses: ColumnElement[bool]) -> Any:
+        return (
+            select(func.coalesce(func.sum(TaskDueRollup.task_count), 0))
+            .where(*clauses)
+            .scalar_subquery()
+        )
+
+    def due_today(*clauses: ColumnElement[bool]) -> Any:
+        return select(func.count()).select_from(Task).where(OPEN_TASK, *clauses).scalar_subquery()
+
+    due = await db.execute(
+        select(
+            due_days(TaskDueRollup.due_on < today),
+            due_today(Task.due_date >= today_start, Task.due_date < now),
+            due_days(
+                TaskDueRollup.due_on > today,
+                TaskDueRollup.due_on <= today + timedelta(days=due_soon_days),
+            ),
+            due_today(Task.due_date >= now, Task.due_date < tomorrow_start),
+        )
+    )
+    past_days, overdue_today, soon_days, soon_today = due.one()
+    return _summarize(
+        cells.all(),
+        (
+            (None if assignee_id == UNASSIGNED else assignee_id, count, open_count)
+            for assignee_id, count, open_count in assignees.all()
+        ),
+        overdue=past_days + overdue_today,
+        due_soon=soon_days + soon_today,
+    )
@@ -2,18 +2,23 @@
 
 import asyncio
 from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import Base, get_db
+from app.api.auth import principal_cache
+from app.core.config import settings
+from app.core.database import Base, build_engine, get_db, get_read_db
 from app.main import app
+from app.services.task_cache import task_cache
 
 # Use SQLite for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+engine = build_engine(TEST_DATABASE_URL, settings)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -28,6 +33,8 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 @pytest.fixture(autouse=True)
 async def setup_database() -> AsyncGenerator[None, None]:
     """Set up test database before each test."""
+    principal_cache.clear()
+    task_cache.clear()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -42,14 +49,40 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture
+def sql_statements(db_session: AsyncSession) -> Generator[list[str], None, None]:
+    """Record every statement the test session sends to the database (one per round trip)."""
+    statements: list[str] = []
+
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Provide an async test client."""
 
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        # Commit per request like get_db so commit hooks (cache invalidation) run
+        try:
+            yield db_session
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+
+    async def override_get_read_db() -> AsyncGenerator[AsyncSession, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
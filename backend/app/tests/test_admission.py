@@ -0,0 +1,127 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.admission import (
+    AdmissionRejectedError,
+    ConcurrencyLimiter,
+    admission_controller,
+    route_class,
+)
+
+
+@pytest.fixture
+def read_limiter(monkeypatch: pytest.MonkeyPatch) -> ConcurrencyLimiter:
+    """Limit the read class to one request with room for one more in the queue."""
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1)
+    monkeypatch.setitem(admission_controller.limiters, "read", limiter)
+    monkeypatch.setattr(admission_controller, "queue_timeout", 5.0)
+    return limiter
+
+
+def test_route_class() -> None:
+    """Test that requests are sorted into classes and probes are exempt."""
+    assert route_class("POST", "/api/auth/login") == "auth"
+    assert route_class("PUT", "/api/tasks/batch/") == "bulk"
+    assert route_class("GET", "/api/tasks/export") == "bulk"
+    assert route_class("GET", "/api/tasks/12") == "read"
+    assert route_class("DELETE", "/api/tasks/12") == "write"
+    assert route_class("GET", "/api/health") is None
+    assert route_class("GET", "/api/diagnostics/pool") is None
+    assert route_class("OPTIONS", "/api/tasks") is None
+
+
+@pytest.mark.asyncio
+async def test_limiter_hands_slots_to_waiters_in_order() -> None:
+    """Test that released slots go to queued requests first come, first served."""
+    limiter = ConcurrencyLimiter(limit=1, queue_size=2)
+    await limiter.acquire(timeout=1.0)
+    order: list[str] = []
+
+    async def queued(name: str) -> None:
+        await limiter.acquire(timeout=1.0)
+        order.append(name)
+
+    first = asyncio.create_task(queued("first"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(queued("second"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejectedError) as shed:
+        await limiter.acquire(timeout=1.0)
+    assert shed.value.reason == "queue_full"
+
+    limiter.release()
+    await first
+    limiter.release()
+    await second
+    limiter.release()
+
+    assert order == ["first", "second"]
+    stats = limiter.stats()
+    assert stats["active"] == 0
+    assert stats["waiting"] == 0
+    assert stats["admitted"] == 3
+    assert stats["queued"] == 2
+    assert stats["shed"] == {"queue_full": 1, "timeout": 0}
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_after_queue_timeout() -> None:
+    """Test that a request waiting past the timeout is shed and leaves the queue."""
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1)
+    await limiter.acquire(timeout=1.0)
+
+    with pytest.raises(AdmissionRejectedError) as shed:
+        await limiter.acquire(timeout=0.01)
+
+    assert shed.value.reason == "timeout"
+    assert limiter.stats()["waiting"] == 0
+    limiter.release()
+    await limiter.acquire(timeout=0.01)
+    assert limiter.stats()["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overloaded_route_class_returns_503_but_health_is_served(
+    client: AsyncClient, read_limiter: ConcurrencyLimiter
+) -> None:
+    """Test that a saturated class sheds with Retry-After while other routes carry on."""
+    await read_limiter.acquire(timeout=1.0)
+    read_limiter.waiters.append(asyncio.get_running_loop().create_future())
+
+    response = await client.get("/api/tasks")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert (await client.get("/api/health")).status_code == 200
+    assert (await client.post("/api/tasks", json={"title": "Writes"})).status_code == 201
+
+    read_limiter.waiters.clear()
+    read_limiter.release()
+    assert (await client.get("/api/tasks")).status_code == 200
+
+    body = (await client.get("/api/metrics")).text
+    assert 'taskflow_admission_shed_total{route_class="read",reason="queue_full"} 1' in body
+    stats = (await client.get("/api/diagnostics/admission")).json()
+    assert stats["read"]["shed"]["queue_full"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_request_runs_when_slot_frees(
+    client: AsyncClient, read_limiter: ConcurrencyLimiter
+) -> None:
+    """Test that a request queued behind a busy slot is served once it is released."""
+    await read_limiter.acquire(timeout=1.0)
+
+    request = asyncio.create_task(client.get("/api/tasks"))
+    while not read_limiter.waiters:
+        await asyncio.sleep(0)
+    read_limiter.release()
+    response = await request
+
+    assert response.status_code == 200
+    assert read_limiter.stats()["queued"] == 1
+    assert read_limiter.stats()["active"] == 0
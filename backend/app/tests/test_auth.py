@@ -1,7 +1,15 @@
 """Tests for authentication API endpoints."""
 
+import asyncio
+
 import pytest
-from httpx import AsyncClient
+from httpx import URL, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import principal_cache
+from app.core.cache import TTLCache
+from app.core.security import PasswordHasher
+from app.models.user import User
 
 
 @pytest.mark.asyncio
@@ -121,3 +129,226 @@ async def test_get_current_user(client: AsyncClient):
     data = response.json()
     assert data["username"] == "meuser"
     assert data["full_name"] == "Me User"
+
+
+async def _register_and_login(client: AsyncClient, username: str) -> dict[str, str]:
+    """Register a user and return bearer auth headers for it."""
+    await client.post(
+        "/api/auth/register",
+        json={
+            "email": f"{username}@example.com",
+            "username": username,
+            "password": "password123",
+            "full_name": "Cached User",
+        },
+    )
+    login_response = await client.post(
+        "/api/auth/login",
+        data={"username": username, "password": "password123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached(client: AsyncClient):
+    """Test that repeated authenticated calls reuse the cached principal."""
+    headers = await _register_and_login(client, "cacheduser")
+
+    hits = principal_cache.hits
+    for _ in range(3):
+        response = await client.get("/api/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["username"] == "cacheduser"
+    assert principal_cache.hits == hits + 2
+
+
+@pytest.mark.asyncio
+async def test_profile_update_invalidates_cached_user(client: AsyncClient):
+    """Test that a profile change is visible on the next request."""
+    headers = await _register_and_login(client, "renameduser")
+    await client.get("/api/auth/me", headers=headers)
+
+    response = await client.patch("/api/users/me", json={"full_name": "New Name"}, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/api/auth/me", headers=headers)
+    assert response.json()["full_name"] == "New Name"
+
+
+@pytest.mark.asyncio
+async def test_profile_update_is_one_round_trip(client: AsyncClient, sql_statements: list[str]):
+    """Test that a profile update is a single UPDATE ... RETURNING."""
+    headers = await _register_and_login(client, "oneshot")
+    await client.get("/api/auth/me", headers=headers)
+
+    sql_statements.clear()
+    response = await client.patch("/api/users/me", json={"full_name": "Once"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Once"
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("UPDATE users")
+
+
+@pytest.mark.asyncio
+async def test_deactivation_invalidates_cached_user(client: AsyncClient, db_session: AsyncSession):
+    """Test that deactivating a user through the ORM evicts the cached principal on commit."""
+    headers = await _register_and_login(client, "deactivated")
+    user_id = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+    stale = principal_cache.get(user_id)
+    assert stale is not None
+
+    user = await db_session.get(User, user_id)
+    user.is_active = False
+    await db_session.flush()
+    # A concurrent request re-caching the committed row before this commit
+    principal_cache.set(user_id, stale)
+    await db_session.commit()
+
+    assert principal_cache.get(user_id) is None
+    response = await client.get("/api/auth/me", headers=headers)
+    assert response.json()["is_active"] is False
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test LRU eviction and hit/miss accounting."""
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(3) == "c"
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_bounds_concurrency():
+    """Test that hashing runs on the pool and excess callers queue."""
+    hasher = PasswordHasher(workers=2, rounds=4)
+    try:
+        hashes = await asyncio.gather(*(hasher.hash(f"password{i}") for i in range(5)))
+        assert await hasher.verify("password3", hashes[3])
+        assert not await hasher.verify("password3", hashes[0])
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats["completed"] == 7
+    assert stats["max_waiting"] == 3
+    assert stats["in_flight"] == 0
+    assert stats["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_queue_is_reported(client: AsyncClient):
+    """Test that the hasher's counters reach the diagnostics route and the metrics."""
+    await client.post(
+        "/api/auth/register",
+        json={"email": "hashed@example.com", "username": "hashed", "password": "password123"},
+    )
+
+    stats = (await client.get("/api/diagnostics/password-hashing")).json()
+    assert set(stats) == {"workers", "in_flight", "waiting", "max_waiting", "completed"}
+    assert stats["completed"] >= 1
+
+    body = (await client.get("/api/metrics")).text
+    assert f"taskflow_password_hash_completed_total {stats['completed']}" in body
+    assert "taskflow_password_hash_waiting 0" in body
+
+
+async def _add_directory_users(db_session: AsyncSession) -> None:
+    """Add users whose names overlap on the prefix ``ann``."""
+    for username, full_name, email, active in [
+        ("bob", "Anna Smith", "bob@example.com", True),
+        ("annabel", None, "bel@example.com", True),
+        ("carl", "Carl Jones", "annex@example.com", True),
+        ("Ann", "Ann Lee", "ann@example.com", True),
+        ("anny", "Anny Gone", "anny@example.com", False),
+        ("dora", "Dora Ng", "dora@example.com", True),
+    ]:
+        db_session.add(
+            User(
+                username=username,
+                full_name=full_name,
+                email=email,
+                hashed_password="x",
+                is_active=active,
+            )
+        )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_user_directory_prefix_search(client: AsyncClient, db_session: AsyncSession):
+    """Test typeahead search across username, full name and email, best match first."""
+    headers = await _register_and_login(client, "viewer")
+    await _add_directory_users(db_session)
+
+    response = await client.get("/api/users", params={"q": "ANN"}, headers=headers)
+
+    assert response.status_code == 200
+    usernames = [user["username"] for user in response.json()]
+    # Exact username, username prefix, full name prefix, email prefix; never inactive
+    assert usernames == ["Ann", "annabel", "bob", "carl"]
+
+    response = await client.get(
+        "/api/users", params={"q": "ann", "view": "summary"}, headers=headers
+    )
+    first = response.json()[0]
+    assert first.keys() == {"id", "username", "full_name"}
+    assert first["full_name"] == "Ann Lee"
+
+
+@pytest.mark.asyncio
+async def test_user_directory_folds_non_ascii(client: AsyncClient, db_session: AsyncSession):
+    """Test that search folds accented and non-Latin names the same way as the query."""
+    headers = await _register_and_login(client, "viewer")
+    db_session.add(User(username="Élodie", email="elodie@example.com", hashed_password="x"))
+    db_session.add(
+        User(
+            username="olaf", full_name="Ölaf Straße", email="olaf@example.com", hashed_password="x"
+        )
+    )
+    await db_session.commit()
+
+    for q, expected in [("éLO", ["Élodie"]), ("ÖLAF STRASS", ["olaf"]), ("Ólaf", [])]:
+        response = await client.get("/api/users", params={"q": q}, headers=headers)
+        assert [user["username"] for user in response.json()] == expected, q
+
+    await client.patch("/api/users/me", json={"full_name": "Σοφία Viewer"}, headers=headers)
+    response = await client.get("/api/users", params={"q": "ΣΟΦ"}, headers=headers)
+    assert [user["username"] for user in response.json()] == ["viewer"]
+
+
+@pytest.mark.asyncio
+async def test_user_directory_keyset_pages(client: AsyncClient, db_session: AsyncSession):
+    """Test walking the directory and a search with cursors."""
+    headers = await _register_and_login(client, "viewer")
+    await _add_directory_users(db_session)
+
+    for params, expected in [
+        ({}, ["Ann", "annabel", "bob", "carl", "dora", "viewer"]),
+        ({"q": "an"}, ["Ann", "annabel", "bob", "carl"]),
+    ]:
+        seen: list[str] = []
+        cursor: dict[str, str] = {}
+        while True:
+            response = await client.get(
+                "/api/users", params={**params, **cursor, "per_page": 2}, headers=headers
+            )
+            assert response.status_code == 200
+            seen.extend(user["username"] for user in response.json())
+            if "x-next-cursor" not in response.headers:
+                assert "link" not in response.headers
+                break
+            cursor = {"cursor": response.headers["x-next-cursor"]}
+            next_url = URL(response.links["next"]["url"])
+            assert next_url.params == response.url.params.merge(cursor)
+        assert seen == expected
+
+    response = await client.get("/api/users", params={"per_page": 1}, headers=headers)
+    cursor = response.headers["x-next-cursor"]
+    response = await client.get("/api/users", params={"q": "a", "cursor": cursor}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,135 @@
+"""Tests for negotiated response compression and MessagePack bodies."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.compression import choose_encoding
+from app.core.config import settings
+from app.core.responses import prefers_msgpack
+
+msgpack = pytest.importorskip("msgpack")
+
+DESCRIPTION = "Compressible description text that repeats. " * 20
+
+
+async def _create_tasks(client: AsyncClient, count: int) -> None:
+    items = [{"title": f"Task {i}", "description": DESCRIPTION} for i in range(count)]
+    response = await client.post("/api/tasks/batch", json={"items": items})
+    assert response.status_code == 200
+
+
+def test_choose_encoding() -> None:
+    """Test that q-values decide the coding and ties go to the first one offered."""
+    offered = ("br", "gzip")
+    assert choose_encoding("gzip, deflate, br", offered) == "br"
+    assert choose_encoding("br;q=0.5, gzip", offered) == "gzip"
+    assert choose_encoding("*", offered) == "br"
+    assert choose_encoding("*, br;q=0", offered) == "gzip"
+    assert choose_encoding("deflate", offered) is None
+    assert choose_encoding(None, offered) is None
+
+
+def test_prefers_msgpack() -> None:
+    """Test that MessagePack is chosen only when named and ranked above JSON."""
+    assert prefers_msgpack("application/msgpack")
+    assert prefers_msgpack("application/x-msgpack, application/json;q=0.5")
+    assert prefers_msgpack("application/msgpack, */*;q=0.1")
+    assert not prefers_msgpack("application/json, application/msgpack")
+    assert not prefers_msgpack("*/*")
+    assert not prefers_msgpack(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [("gzip", "gzip"), ("gzip;q=0.5, br", "br"), ("identity", None)],
+)
+async def test_large_responses_are_compressed_as_negotiated(
+    client: AsyncClient, accept_encoding: str, expected: str | None
+) -> None:
+    """Test that list pages are compressed with the preferred coding and decode intact."""
+    if expected == "br":
+        pytest.importorskip("brotli")
+    await _create_tasks(client, 30)
+
+    response = await client.get(
+        "/api/tasks", params={"per_page": 30}, headers={"Accept-Encoding": accept_encoding}
+    )
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == expected
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["items"]) == 30
+    if expected is not None:
+        assert response.num_bytes_downloaded < len(response.content) / 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br"])
+async def test_streamed_responses_are_compressed_chunk_by_chunk(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch, accept_encoding: str
+) -> None:
+    """Test that a streamed export is compressed as one stream and decodes intact."""
+    if accept_encoding == "br":
+        pytest.importorskip("brotli")
+    monkeypatch.setattr(settings, "export_batch_size", 4)
+    await _create_tasks(client, 30)
+    plain = await client.get("/api/tasks/export", headers={"Accept-Encoding": "identity"})
+
+    response = await client.get("/api/tasks/export", headers={"Accept-Encoding": accept_encoding})
+
+    assert response.headers["content-encoding"] == accept_encoding
+    assert "content-length" not in response.headers
+    assert response.content == plain.content
+    assert response.num_bytes_downloaded < len(plain.content) / 5
+
+
+@pytest.mark.asyncio
+async def test_small_responses_are_not_compressed(client: AsyncClient) -> None:
+    """Test that bodies under the size threshold are sent as they are."""
+    response = await client.get("/api/health", headers={"Accept-Encoding": "gzip, br"})
+
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_task_reads_negotiate_msgpack(client: AsyncClient) -> None:
+    """Test that list and detail reads return the JSON content as MessagePack, cached or not."""
+    await _create_tasks(client, 3)
+    as_json = await client.get("/api/tasks")
+    msgpack_accept = {"Accept": "application/msgpack"}
+
+    # The JSON request filled the cache; the second MessagePack read misses it
+    for path in ("/api/tasks", "/api/tasks/1", "/api/tasks/1"):
+        response = await client.get(path, headers=msgpack_accept)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        assert "Accept" in response.headers["vary"].split(", ")
+        expected = as_json.json() if path == "/api/tasks" else as_json.json()["items"][0]
+        assert msgpack.unpackb(response.content) == expected
+
+    response = await client.get("/api/tasks", headers=msgpack_accept)
+    assert response.headers["etag"] == as_json.headers["etag"]
+    assert msgpack.unpackb(response.content) == as_json.json()
+
+    response = await client.get("/api/tasks", headers={"Accept": "application/json"})
+    assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_list_users_negotiates_msgpack(client: AsyncClient) -> None:
+    """Test that the user directory page can be fetched as MessagePack."""
+    await client.post(
+        "/api/auth/register",
+        json={"email": "packed@example.com", "username": "packed", "password": "password123"},
+    )
+    login = await client.post(
+        "/api/auth/login", data={"username": "packed", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    as_json = await client.get("/api/users", headers=headers)
+
+    response = await client.get("/api/users", headers={**headers, "Accept": "application/msgpack"})
+
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == as_json.json()
@@ -0,0 +1,105 @@
+"""Tests for the Prometheus metrics endpoint and per-request query accounting."""
+
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import database, metrics
+from app.core.config import settings
+
+
+def _sample(body: str, name: str) -> float:
+    """Return the value of the sample line that starts with ``name``."""
+    for line in body.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} not found in metrics output")
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_route_latency_and_status(client: AsyncClient) -> None:
+    """Test that responses are counted per route template and status code."""
+    metrics.registry.clear()
+    await client.post("/api/tasks", json={"title": "Measured"})
+    await client.get("/api/tasks/1")
+    await client.get("/api/tasks/999")
+    await client.get("/api/no-such-route")
+
+    response = await client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    body = response.text
+    route = 'method="GET",route="/api/tasks/{task_id}"'
+    assert _sample(body, f'taskflow_http_responses_total{{{route},status="200"}}') == 1
+    assert _sample(body, f'taskflow_http_responses_total{{{route},status="404"}}') == 1
+    assert _sample(body, f"taskflow_http_request_duration_seconds_count{{{route}}}") == 2
+    assert _sample(body, f'taskflow_http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 2
+    unmatched = 'method="GET",route="<unmatched>",status="404"'
+    assert _sample(body, f"taskflow_http_responses_total{{{unmatched}}}") == 1
+    # The metrics request itself is still being served while it renders
+    assert _sample(body, 'taskflow_http_requests_in_flight{method="GET"}') == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_statements_per_request(client: AsyncClient) -> None:
+    """Test that SQL statements and time are charged to the issuing route."""
+    metrics.registry.clear()
+    await client.post("/api/tasks", json={"title": "Counted"})
+    await client.get("/api/health")
+
+    body = (await client.get("/api/metrics")).text
+
+    create = 'method="POST",route="/api/tasks"'
+    assert _sample(body, f"taskflow_http_request_db_statements_sum{{{create}}}") >= 1
+    assert _sample(body, f"taskflow_http_request_db_seconds_sum{{{create}}}") > 0
+    health = 'method="GET",route="/api/health"'
+    assert _sample(body, f"taskflow_http_request_db_statements_sum{{{health}}}") == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_with_route(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that statements over the threshold are logged and counted per route."""
+    metrics.registry.clear()
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 1e-6)
+
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        await client.get("/api/tasks/1")
+
+    assert any("from /api/tasks/{task_id}: SELECT" in record.message for record in caplog.records)
+    body = (await client.get("/api/metrics")).text
+    assert _sample(body, 'taskflow_db_slow_queries_total{route="/api/tasks/{task_id}"}') >= 1
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_do_not_skew_query_timing(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failing statement is not timed and leaves no state on the connection."""
+    recorded: list[tuple[str, float]] = []
+    monkeypatch.setattr(
+        database, "record_query", lambda statement, seconds: recorded.append((statement, seconds))
+    )
+
+    def connection_state(info: dict) -> dict:
+        # What per-connection bookkeeping holds, ignoring the pool's check-in time
+        return {key: repr(value) for key, value in info.items() if key != "checked_in_at"}
+
+    connection = await db_session.connection()
+    state_before = connection_state(connection.info)
+
+    with pytest.raises(OperationalError):
+        await db_session.execute(text("SELECT * FROM no_such_table"))
+    await db_session.rollback()
+    connection = await db_session.connection()
+    await connection.execute(text("SELECT 1"))
+
+    assert connection_state(connection.info) == state_before
+    assert [statement for statement, _ in recorded] == ["SELECT 1"]
+    assert 0 <= recorded[0][1] < 1
@@ -0,0 +1,214 @@
+"""Query-plan regression tests: task and user endpoints must be served by indexes."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@contextmanager
+def capture_selects(
+    db_session: AsyncSession, table: str = "tasks"
+) -> Iterator[list[tuple[str, Any]]]:
+    """Record every SELECT against ``table`` issued while the block runs."""
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and f"FROM {table}" in statement:
+            statements.append((statement, parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def explain(db_session: AsyncSession, statement: str, parameters: Any) -> list[str]:
+    """Return the plan lines SQLite chooses for a captured statement."""
+    conn = await db_session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[3] for row in result.all()]
+
+
+def full_scans(plan: list[str], table: str, page_index: str | None = None) -> list[str]:
+    """Plan lines that read every row of ``table``.
+
+    A page query walking ``page_index`` in ``ORDER BY`` order stops at its
+    ``LIMIT``, so that scan is not reported.
+    """
+    return [
+        line
+        for line in plan
+        if line.split()[:2] == ["SCAN", table]
+        and not (page_index is not None and line.endswith(f" {page_index}"))
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("params", "expected_index"),
+    [
+        ({"status": "todo", "priority": "high"}, "ix_tasks_status_priority_id"),
+        ({"status": "review"}, "ix_tasks_status_priority_id"),
+        ({}, "ix_tasks_created_at_id"),
+        ({"sort": "updated_at", "order": "desc"}, "ix_tasks_updated_at_id"),
+    ],
+)
+async def test_list_tasks_uses_index(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    params: dict[str, str],
+    expected_index: str,
+) -> None:
+    """Test that list queries and their totals never fall back to a table scan."""
+    for i in range(3):
+        await client.post("/api/tasks", json={"title": f"Task {i}"})
+
+    with capture_selects(db_session) as statements:
+        response = await client.get("/api/tasks", params=params)
+    assert response.status_code == 200
+    assert statements
+
+    plans = [await explain(db_session, *captured) for captured in statements]
+    for (statement, _), plan in zip(statements, plans, strict=True):
+        page_index = expected_index if " LIMIT " in statement else None
+        assert not full_scans(plan, "tasks", page_index), plan
+    assert any(expected_index in line for plan in plans for line in plan), plans
+
+
+SORT_INDEXES = {
+    "created_at": "ix_tasks_created_at_id",
+    "updated_at": "ix_tasks_updated_at_id",
+    "due_date": "ix_tasks_due_date_id",
+    "priority": "ix_tasks_priority_rank_id",
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort", sorted(SORT_INDEXES))
+async def test_list_tasks_sorts_are_read_from_an_index(
+    client: AsyncClient, db_session: AsyncSession, sort: str, order: str
+) -> None:
+    """Test that first and keyset pages of every sort read rows in index order."""
+    for i in range(3):
+        due_date = None if i == 0 else f"2030-01-0{i}T00:00"
+        await client.post(
+            "/api/tasks", json={"title": f"Task {i}", "priority": "high", "due_date": due_date}
+        )
+    params = {"sort": sort, "order": order, "per_page": 1, "include_total": "false"}
+
+    cursor = None
+    for _page in range(2):
+        page_params = params if cursor is None else {**params, "cursor": cursor}
+        with capture_selects(db_session) as statements:
+            response = await client.get("/api/tasks", params=page_params)
+        assert response.status_code == 200
+        cursor = response.json()["next_cursor"]
+
+        page_plan = await explain(db_session, *statements[-1])
+        assert any(SORT_INDEXES[sort] in line for line in page_plan), page_plan
+        assert not any("TEMP B-TREE FOR ORDER BY" in line for line in page_plan), page_plan
+
+
+@pytest.mark.asyncio
+async def test_get_task_uses_primary_key(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test that single-task reads are primary key lookups."""
+    task = (await client.post("/api/tasks", json={"title": "Task"})).json()
+
+    with capture_selects(db_session) as statements:
+        await client.get(f"/api/tasks/{task['id']}")
+
+    plans = [await explain(db_session, *captured) for captured in statements]
+    assert plans
+    for plan in plans:
+        assert any(line.startswith("SEARCH tasks USING INTEGER PRIMARY KEY") for line in plan), plan
+
+
+@pytest.mark.asyncio
+async def test_search_uses_fts_index(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test that search probes the FTS5 index and joins tasks by primary key."""
+    for i in range(3):
+        await client.post("/api/tasks", json={"title": f"Searchable {i}"})
+
+    with capture_selects(db_session) as statements:
+        response = await client.get(
+            "/api/tasks/search", params={"q": "searchable", "status": "todo"}
+        )
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+    plans = [await explain(db_session, *captured) for captured in statements]
+    assert plans
+    for plan in plans:
+        assert not full_scans(plan, "tasks"), plan
+        assert any("VIRTUAL TABLE INDEX" in line for line in plan), plan
+        assert any(line.startswith("SEARCH tasks USING INTEGER PRIMARY KEY") for line in plan), plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("params", "expected_indexes"),
+    [
+        ({}, {"ix_users_username_prefix"}),
+        (
+            {"q": "us"},
+            {"ix_users_username_prefix", "ix_users_full_name_prefix", "ix_users_email_prefix"},
+        ),
+    ],
+)
+async def test_user_directory_uses_prefix_indexes(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    params: dict[str, str],
+    expected_indexes: set[str],
+) -> None:
+    """Test that directory pages and prefix searches seek the folded-prefix indexes."""
+    await client.post(
+        "/api/auth/register",
+        json={"email": "user@example.com", "username": "user", "password": "password123"},
+    )
+    login = await client.post(
+        "/api/auth/login", data={"username": "user", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    await client.get("/api/auth/me", headers=headers)
+
+    with capture_selects(db_session, "users") as statements:
+        response = await client.get("/api/users", params=params, headers=headers)
+    assert response.status_code == 200
+
+    plans = [await explain(db_session, *captured) for captured in statements]
+    assert plans
+    for (statement, _), plan in zip(statements, plans, strict=True):
+        page_index = "ix_users_username_prefix" if " LIMIT " in statement else None
+        assert not full_scans(plan, "users", page_index), plan
+    used = {index for plan in plans for line in plan for index in expected_indexes if index in line}
+    assert used == expected_indexes, plans
+
+
+@pytest.mark.asyncio
+async def test_task_stats_rollup_avoids_scanning_tasks(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test that rollup statistics only touch today's open tasks, through the due-date index."""
+    for i in range(3):
+        await client.post("/api/tasks", json={"title": f"Task {i}", "due_date": "2030-01-01T00:00"})
+
+    with capture_selects(db_session) as statements:
+        response = await client.get("/api/tasks/stats")
+    assert response.status_code == 200
+
+    plans = [await explain(db_session, *captured) for captured in statements]
+    assert plans
+    for plan in plans:
+        assert not any(line.startswith("SCAN tasks") for line in plan), plan
+        assert any("ix_tasks_open_due_date" in line for line in plan), plan
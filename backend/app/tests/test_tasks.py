@@ -1,7 +1,25 @@
 """Tests for task API endpoints."""
 
+import csv
+import io
+import json
+import sys
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.tasks import TaskListResponse, TaskResponse
+from app.core.cache import create_cache_backend
+from app.core.config import settings
+from app.models.task import Task
+from app.models.user import User
+from app.services import task_events
+from app.services.task_cache import task_cache
+from app.services.task_events import HEARTBEAT, TaskEventBus, event_stream, task_event_bus
+from app.services.task_export import EXPORT_COLUMNS
 
 
 @pytest.mark.asyncio
@@ -31,3 +49,863 @@ async def test_get_task_not_found(client: AsyncClient) -> None:
     response = await client.get("/api/tasks/999")
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
+
+
+async def _create_tasks(client: AsyncClient, count: int, **fields: object) -> list[dict]:
+    """Create ``count`` tasks and return their response bodies."""
+    created = []
+    for i in range(count):
+        response = await client.post("/api/tasks", json={"title": f"Task {i}", **fields})
+        assert response.status_code == 201
+        created.append(response.json())
+    return created
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination(client: AsyncClient) -> None:
+    """Test walking every task with keyset cursors."""
+    created = await _create_tasks(client, 7)
+
+    seen: list[int] = []
+    response = await client.get("/api/tasks", params={"per_page": 3})
+    data = response.json()
+    seen.extend(item["id"] for item in data["items"])
+    while data["next_cursor"]:
+        response = await client.get(
+            "/api/tasks", params={"per_page": 3, "cursor": data["next_cursor"]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+
+    assert seen == [task["id"] for task in created]
+    assert data["total"] == 7
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_offset_pagination_still_supported(client: AsyncClient) -> None:
+    """Test that page/per_page paging keeps working for old clients."""
+    created = await _create_tasks(client, 5)
+
+    response = await client.get("/api/tasks", params={"page": 2, "per_page": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [task["id"] for task in created[2:4]]
+    assert data["page"] == 2
+    assert data["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_by_priority_desc(client: AsyncClient) -> None:
+    """Test keyset paging sorted by priority severity with a status filter."""
+    for priority in ["low", "urgent", "medium", "high", "urgent", "low"]:
+        await client.post("/api/tasks", json={"title": priority, "priority": priority})
+    await client.post("/api/tasks", json={"title": "done", "priority": "urgent", "status": "done"})
+
+    params = {"per_page": 2, "sort": "priority", "order": "desc", "status": "todo"}
+    priorities: list[str] = []
+    cursor = None
+    while True:
+        page_params = {**params, **({"cursor": cursor} if cursor else {})}
+        data = (await client.get("/api/tasks", params=page_params)).json()
+        priorities.extend(item["priority"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert priorities == ["urgent", "urgent", "high", "medium", "low", "low"]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_by_due_date_puts_nulls_last(client: AsyncClient) -> None:
+    """Test that tasks without a due date come after dated ones."""
+    await client.post("/api/tasks", json={"title": "none"})
+    await client.post("/api/tasks", json={"title": "late", "due_date": "2030-01-02T00:00:00Z"})
+    await client.post("/api/tasks", json={"title": "early", "due_date": "2030-01-01T00:00:00Z"})
+    await client.post("/api/tasks", json={"title": "none again"})
+
+    titles: list[str] = []
+    cursor = None
+    while True:
+        params = {"per_page": 1, "sort": "due_date", **({"cursor": cursor} if cursor else {})}
+        data = (await client.get("/api/tasks", params=params)).json()
+        titles.extend(item["title"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert titles == ["early", "late", "none", "none again"]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_invalid_cursor(client: AsyncClient) -> None:
+    """Test that malformed or mismatched cursors are rejected."""
+    await _create_tasks(client, 3)
+    response = await client.get("/api/tasks", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    data = (await client.get("/api/tasks", params={"per_page": 1})).json()
+    response = await client.get(
+        "/api/tasks", params={"cursor": data["next_cursor"], "sort": "updated_at"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_total_tracks_writes(client: AsyncClient) -> None:
+    """Test that filtered totals follow creates, updates and deletes."""
+    created = await _create_tasks(client, 3, priority="high")
+    await _create_tasks(client, 2, status="done")
+
+    async def total(**params: str) -> int:
+        return (await client.get("/api/tasks", params=params)).json()["total"]
+
+    assert await total() == 5
+    assert await total(priority="high") == 3
+    assert await total(status="done", priority="medium") == 2
+
+    await client.put(f"/api/tasks/{created[0]['id']}", json={"status": "done"})
+    await client.delete(f"/api/tasks/{created[1]['id']}")
+    await _create_tasks(client, 1, priority="high")
+
+    assert await total() == 5
+    assert await total(status="done") == 3
+    assert await total(status="todo", priority="high") == 2
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_total_modes(client: AsyncClient, sql_statements: list[str]) -> None:
+    """Test skipping the total, and that estimates are answered exactly."""
+    await _create_tasks(client, 4)
+
+    sql_statements.clear()
+    data = (await client.get("/api/tasks", params={"include_total": "false"})).json()
+    assert data["total"] is None
+    assert len(data["items"]) == 4
+    assert not any("task_count" in statement for statement in sql_statements)
+
+    data = (await client.get("/api/tasks", params={"estimate_total": "true"})).json()
+    assert data["total"] == 4
+    assert data["total_estimated"] is False
+
+
+@pytest.mark.asyncio
+async def test_batch_create_update_delete(client: AsyncClient) -> None:
+    """Test the batch endpoints end to end."""
+    response = await client.post(
+        "/api/tasks/batch",
+        json={"items": [{"title": "A"}, {"title": "B", "priority": "high"}, {"title": "C"}]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 3
+    ids = [result["id"] for result in data["results"]]
+    assert [result["task"]["title"] for result in data["results"]] == ["A", "B", "C"]
+
+    response = await client.put(
+        "/api/tasks/batch",
+        json={
+            "items": [
+                {"id": ids[0], "status": "done"},
+                {"id": ids[1], "title": "B2", "priority": "low"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["task"]["status"] == "done"
+    assert results[0]["task"]["title"] == "A"
+    assert results[1]["task"]["title"] == "B2"
+    assert results[1]["task"]["priority"] == "low"
+    assert (await client.get(f"/api/tasks/{ids[1]}")).json()["title"] == "B2"
+    assert (await client.get("/api/tasks", params={"status": "done"})).json()["total"] == 1
+
+    response = await client.request("DELETE", "/api/tasks/batch", json={"ids": ids[:2]})
+    assert response.status_code == 200
+    assert [result["status_code"] for result in response.json()["results"]] == [204, 204]
+    assert (await client.get("/api/tasks")).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_atomic_rejects_whole_batch(client: AsyncClient) -> None:
+    """Test that one bad item rolls back an atomic batch."""
+    created = await _create_tasks(client, 2)
+
+    response = await client.request(
+        "DELETE", "/api/tasks/batch", json={"ids": [created[0]["id"], 999]}
+    )
+    assert response.status_code == 409
+    errors = response.json()["detail"]["errors"]
+    assert [(error["index"], error["status_code"]) for error in errors] == [(1, 404)]
+    assert (await client.get(f"/api/tasks/{created[0]['id']}")).status_code == 200
+
+    response = await client.put(
+        "/api/tasks/batch",
+        json={"items": [{"id": created[0]["id"], "title": "Changed"}, {"id": 999, "title": "X"}]},
+    )
+    assert response.status_code == 409
+    assert (await client.get(f"/api/tasks/{created[0]['id']}")).json()["title"] == "Task 0"
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_duplicate_ids(client: AsyncClient) -> None:
+    """Test that update and delete batches may name each task only once."""
+    (task,) = await _create_tasks(client, 1)
+
+    response = await client.put(
+        "/api/tasks/batch",
+        json={"items": [{"id": task["id"], "title": "A"}, {"id": task["id"], "title": "B"}]},
+    )
+    assert response.status_code == 422
+    response = await client.request(
+        "DELETE", "/api/tasks/batch", json={"ids": [task["id"], task["id"]], "atomic": False}
+    )
+    assert response.status_code == 422
+    assert (await client.get(f"/api/tasks/{task['id']}")).json()["title"] == "Task 0"
+
+
+@pytest.mark.asyncio
+async def test_batch_partial_success(client: AsyncClient) -> None:
+    """Test per-item results when partial success is allowed."""
+    response = await client.post(
+        "/api/tasks/batch",
+        json={"items": [{"title": "ok"}, {"title": "bad", "assignee_id": 42}], "atomic": False},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["succeeded"], data["failed"]) == (1, 1)
+    assert data["results"][1]["status_code"] == 422
+    assert (await client.get("/api/tasks")).json()["total"] == 1
+
+    task_id = data["results"][0]["id"]
+    response = await client.request(
+        "DELETE", "/api/tasks/batch", json={"ids": [task_id, 999], "atomic": False}
+    )
+    assert [result["status_code"] for result in response.json()["results"]] == [204, 404]
+    assert (await client.get("/api/tasks")).json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_and_csv(client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test streaming exports in several batches with filters applied."""
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    await _create_tasks(client, 5, priority="high")
+    await _create_tasks(client, 2, priority="low")
+
+    response = await client.get("/api/tasks/export", params={"priority": "high"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 5
+    assert {row["priority"] for row in rows} == {"high"}
+    assert rows[0]["title"] == "Task 0"
+
+    response = await client.get("/api/tasks/export", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(records) == 7
+    assert records[-1]["priority"] == "low"
+
+    response = await client.get("/api/tasks/export", params={"format": "csv", "status": "done"})
+    assert response.text.splitlines() == [",".join(EXPORT_COLUMNS)]
+
+
+@pytest.mark.asyncio
+async def test_export_arrow(client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the Arrow IPC stream decodes into the exported rows."""
+    pa = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    await _create_tasks(client, 3, status="review")
+
+    response = await client.get("/api/tasks/export", params={"format": "arrow"})
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 3
+    assert table.column("status").to_pylist() == ["review"] * 3
+    assert table.schema.names == list(EXPORT_COLUMNS)
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_reports_row_errors(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test chunked NDJSON import with invalid rows reported by line."""
+    monkeypatch.setattr(settings, "import_chunk_size", 2)
+    lines = [
+        json.dumps({"title": "one", "priority": "high"}),
+        json.dumps({"title": ""}),
+        "",
+        "{not json",
+        json.dumps("a JSON string, not a task"),
+        json.dumps({"title": "two", "assignee_id": 99}),
+        json.dumps({"title": "three", "status": "done"}),
+        json.dumps({"title": "four"}),
+    ]
+    response = await client.post(
+        "/api/tasks/import",
+        files={"file": ("tasks.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["imported"], data["failed"]) == (3, 4)
+    assert [error["line"] for error in data["errors"]] == [2, 4, 5, 6]
+    assert "title" in data["errors"][0]["error"]
+    assert data["errors"][1]["error"].startswith("Invalid JSON")
+    assert data["errors"][2]["error"] != "a JSON string, not a task"
+    assert data["rows_per_second"] > 0
+
+    listing = (await client.get("/api/tasks")).json()
+    assert [item["title"] for item in listing["items"]] == ["one", "three", "four"]
+    assert listing["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_import_csv(client: AsyncClient) -> None:
+    """Test CSV import with empty cells falling back to schema defaults."""
+    body = (
+        "title,description,status,priority,due_date\n"
+        'First,"multi\nline",in_progress,,2030-01-01T00:00:00Z\n'
+        "Second,,,urgent,\n"
+        "Third,,bogus,,\n"
+    )
+    response = await client.post(
+        "/api/tasks/import", files={"file": ("tasks.csv", body.encode(), "text/csv")}
+    )
+    data = response.json()
+    assert (data["imported"], data["failed"]) == (2, 1)
+    assert data["errors"][0]["line"] == 5
+
+    items = (await client.get("/api/tasks")).json()["items"]
+    assert items[0]["description"] == "multi\nline"
+    assert items[0]["priority"] == "medium"
+    assert items[1]["priority"] == "urgent"
+
+
+@pytest.mark.asyncio
+async def test_read_endpoints_match_response_schema(client: AsyncClient) -> None:
+    """Test that fast-path bodies still satisfy the declared response models."""
+    created = (
+        await client.post("/api/tasks", json={"title": "Shape", "due_date": "2030-01-01T00:00:00Z"})
+    ).json()
+
+    detail = (await client.get(f"/api/tasks/{created['id']}")).json()
+    assert detail == created
+    assert TaskResponse.model_validate(detail).title == "Shape"
+
+    listing = (await client.get("/api/tasks")).json()
+    assert TaskListResponse.model_validate(listing).items[0].id == created["id"]
+    assert listing["items"][0] == created
+
+
+@pytest.mark.asyncio
+async def test_task_reads_are_cached_until_written(client: AsyncClient) -> None:
+    """Test that cached task reads are served until a write bumps their version."""
+    task_id = (await client.post("/api/tasks", json={"title": "Cached"})).json()["id"]
+
+    await client.get(f"/api/tasks/{task_id}")
+    await client.get("/api/tasks")
+    await client.get(f"/api/tasks/{task_id}")
+    await client.get("/api/tasks")
+    stats = (await client.get("/api/diagnostics/cache")).json()["tasks"]
+    assert stats["backend"] == "memory"
+    assert stats["task"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert stats["list"]["hits"] == 1
+
+    await client.put(f"/api/tasks/{task_id}", json={"title": "Renamed"})
+    assert (await client.get(f"/api/tasks/{task_id}")).json()["title"] == "Renamed"
+    assert (await client.get("/api/tasks")).json()["items"][0]["title"] == "Renamed"
+
+    await client.post("/api/tasks", json={"title": "Second"})
+    assert (await client.get("/api/tasks")).json()["total"] == 2
+
+    await client.delete(f"/api/tasks/{task_id}")
+    assert (await client.get(f"/api/tasks/{task_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_invalidate_cached_reads(client: AsyncClient) -> None:
+    """Test that batch writes bump the versions of the tasks they touch."""
+    ids = [task["id"] for task in await _create_tasks(client, 2)]
+    for task_id in ids:
+        await client.get(f"/api/tasks/{task_id}")
+
+    await client.put("/api/tasks/batch", json={"items": [{"id": ids[0], "title": "Batched"}]})
+    assert (await client.get(f"/api/tasks/{ids[0]}")).json()["title"] == "Batched"
+
+    await client.request("DELETE", "/api/tasks/batch", json={"ids": [ids[1]]})
+    assert (await client.get(f"/api/tasks/{ids[1]}")).status_code == 404
+    assert (await client.get("/api/tasks")).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_conditional_requests(client: AsyncClient) -> None:
+    """Test ETag revalidation of a single task, from the cache and from the database."""
+    task_id = (await client.post("/api/tasks", json={"title": "Tagged"})).json()["id"]
+    response = await client.get(f"/api/tasks/{task_id}")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    for _ in range(2):
+        response = await client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        task_cache.clear()
+
+    await client.put(f"/api/tasks/{task_id}", json={"title": "Retagged"})
+    response = await client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_conditional_requests(client: AsyncClient) -> None:
+    """Test that a listing revalidates until the filtered set changes."""
+    await _create_tasks(client, 2)
+    etag = (await client.get("/api/tasks")).headers["etag"]
+    task_cache.clear()
+
+    response = await client.get("/api/tasks", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert response.status_code == 304
+    second_page = await client.get("/api/tasks", params={"page": 2})
+    assert second_page.headers["etag"] != etag
+
+    await client.post("/api/tasks", json={"title": "Another"})
+    response = await client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_etag_sees_writes_from_other_workers(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test that a delete made outside this worker changes the listing's ETag."""
+    first, _ = await _create_tasks(client, 2)
+    etag = (await client.get("/api/tasks")).headers["etag"]
+    task_cache.clear()
+
+    # The newest task keeps max(updated_at) where it was; only the count moves
+    await db_session.execute(delete(Task).where(Task.id == first["id"]))
+    await db_session.commit()
+    response = await client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_etag_sees_writes_that_commit_late(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test that an update stamped before the newest task still changes the listing's ETag."""
+    first, second = await _create_tasks(client, 2)
+    etag = (await client.get("/api/tasks")).headers["etag"]
+    task_cache.clear()
+
+    # A writer that took its timestamp early and committed after the listing was read
+    await db_session.execute(
+        update(Task)
+        .where(Task.id == first["id"])
+        .values(title="Late", updated_at=datetime.fromisoformat(second["created_at"]))
+    )
+    await db_session.commit()
+    response = await client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "Late"
+
+
+async def _add_users(db_session: AsyncSession, count: int) -> list[User]:
+    users = [
+        User(
+            username=f"member{i}",
+            email=f"member{i}@example.com",
+            full_name=f"Member {i}",
+            hashed_password="x",
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+    return users
+
+
+@pytest.mark.asyncio
+async def test_expand_embeds_users_with_constant_queries(
+    client: AsyncClient, db_session: AsyncSession, sql_statements: list[str]
+) -> None:
+    """Test that expanded listings cost the same number of queries at any page size."""
+    users = await _add_users(db_session, 4)
+    for i in range(20):
+        await client.post("/api/tasks", json={"title": f"Task {i}", "assignee_id": users[i % 4].id})
+    await client.post("/api/tasks", json={"title": "Unassigned"})
+
+    statement_counts = []
+    for per_page in (2, 21):
+        task_cache.clear()
+        sql_statements.clear()
+        response = await client.get(
+            "/api/tasks", params={"per_page": per_page, "expand": "owner,assignee"}
+        )
+        assert response.status_code == 200
+        statement_counts.append(len(sql_statements))
+    assert statement_counts[0] == statement_counts[1] == 3
+
+    items = response.json()["items"]
+    assert items[0]["owner"] == {"id": 1, "username": "member0", "full_name": "Member 0"}
+    assert items[1]["assignee"] == {"id": 2, "username": "member1", "full_name": "Member 1"}
+    assert items[-1]["assignee"] is None
+    assert "owner" not in (await client.get("/api/tasks")).json()["items"][0]
+
+
+@pytest.mark.asyncio
+async def test_get_task_expand(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test expanding a single task and revalidating it after its user changes."""
+    users = await _add_users(db_session, 2)
+    task_id = (
+        await client.post("/api/tasks", json={"title": "Owned", "assignee_id": users[1].id})
+    ).json()["id"]
+
+    response = await client.get(f"/api/tasks/{task_id}", params={"expand": "assignee"})
+    assert response.json()["assignee"]["username"] == "member1"
+    assert "owner" not in response.json()
+    etag = response.headers["etag"]
+    assert etag != (await client.get(f"/api/tasks/{task_id}")).headers["etag"]
+
+    response = await client.get(
+        f"/api/tasks/{task_id}", params={"expand": "assignee"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    users[1].full_name = "Renamed"
+    await db_session.commit()
+    response = await client.get(
+        f"/api/tasks/{task_id}", params={"expand": "assignee"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["assignee"]["full_name"] == "Renamed"
+
+    response = await client.get(f"/api/tasks/{task_id}", params={"expand": "owner,watchers"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_sparse_fields(client: AsyncClient, sql_statements: list[str]) -> None:
+    """Test that ``fields`` trims both the SELECT and the items, cursor paging included."""
+    for i in range(3):
+        await client.post(
+            "/api/tasks",
+            json={
+                "title": f"Task {i}",
+                "description": "x" * 10_000,
+                "due_date": f"2030-01-0{i + 1}",
+            },
+        )
+
+    sql_statements.clear()
+    response = await client.get(
+        "/api/tasks", params={"fields": "title, status", "sort": "due_date", "per_page": 2}
+    )
+
+    assert response.status_code == 200
+    page = response.json()
+    assert [set(item) for item in page["items"]] == [{"id", "title", "status"}] * 2
+    select_page = next(sql for sql in sql_statements if "LIMIT" in sql)
+    assert "description" not in select_page
+    assert "due_date" in select_page  # the cursor's sort key
+    full_etag = (
+        await client.get("/api/tasks", params={"sort": "due_date", "per_page": 2})
+    ).headers["etag"]
+    assert response.headers["etag"] != full_etag
+
+    response = await client.get(
+        "/api/tasks",
+        params={
+            "fields": "title",
+            "sort": "due_date",
+            "per_page": 2,
+            "cursor": page["next_cursor"],
+        },
+    )
+    assert response.json()["items"] == [{"id": 3, "title": "Task 2"}]
+
+    for fields in ("title,secret", "", ","):
+        response = await client.get("/api/tasks", params={"fields": fields})
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_task_sparse_fields(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test a sparse single-task read combined with expansion and revalidation."""
+    users = await _add_users(db_session, 2)
+    task_id = (
+        await client.post("/api/tasks", json={"title": "Sparse", "assignee_id": users[1].id})
+    ).json()["id"]
+
+    response = await client.get(
+        f"/api/tasks/{task_id}", params={"fields": "priority", "expand": "assignee"}
+    )
+    assert response.json() == {
+        "id": task_id,
+        "priority": "medium",
+        "assignee": {"id": users[1].id, "username": "member1", "full_name": "Member 1"},
+    }
+
+    response = await client.get(f"/api/tasks/{task_id}", params={"fields": "title"})
+    assert response.json() == {"id": task_id, "title": "Sparse"}
+    response = await client.get(
+        f"/api/tasks/{task_id}",
+        params={"fields": "title"},
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_task_stats_rollup_tracks_every_write_path(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the rollup answers exactly like a full aggregate after all kinds of writes."""
+    users = await _add_users(db_session, 2)
+    now = datetime.now(UTC)
+
+    def due(**delta: float) -> str:
+        return (now + timedelta(**delta)).isoformat()
+
+    created = await _create_tasks(client, 1, due_date=due(days=-2), assignee_id=users[0].id)
+    created += await _create_tasks(client, 1, due_date=due(hours=-1), priority="high")
+    created += await _create_tasks(client, 1, due_date=due(hours=1), assignee_id=users[0].id)
+    created += await _create_tasks(client, 1, due_date=due(days=2), assignee_id=users[1].id)
+    created += await _create_tasks(client, 1, due_date=due(days=10))
+    await client.post(
+        "/api/tasks/batch",
+        json={"items": [{"title": "Batch", "status": "done", "due_date": due(days=-5)}]},
+    )
+    lines = [json.dumps({"title": "Imported", "status": "review", "due_date": due(days=1)})]
+    await client.post(
+        "/api/tasks/import",
+        files={"file": ("tasks.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+    # Finish an overdue task, reassign one and drop another
+    await client.put(f"/api/tasks/{created[0]['id']}", json={"status": "done"})
+    await client.put(
+        "/api/tasks/batch", json={"items": [{"id": created[4]["id"], "assignee_id": users[1].id}]}
+    )
+    await client.delete(f"/api/tasks/{created[3]['id']}")
+
+    response = await client.get("/api/tasks/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["source"] == "rollup"
+    assert stats["total"] == 6
+    assert stats["by_status_priority"]["done"] == {"low": 0, "medium": 2, "high": 0, "urgent": 0}
+    assert stats["by_status_priority"]["todo"]["high"] == 1
+    assert stats["by_status_priority"]["review"]["medium"] == 1
+    assert stats["overdue"] == 1
+    assert stats["due_soon"] == 2
+    assert stats["by_assignee"] == [
+        {"assignee_id": None, "total": 3, "open": 2},
+        {"assignee_id": users[0].id, "total": 2, "open": 1},
+        {"assignee_id": users[1].id, "total": 1, "open": 1},
+    ]
+
+    monkeypatch.setattr(settings, "task_stats_rollup", False)
+    aggregate = (await client.get("/api/tasks/stats")).json()
+    assert aggregate["source"] == "tasks"
+    for key in ("total", "by_status_priority", "by_assignee", "overdue", "due_soon"):
+        assert aggregate[key] == stats[key], key
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match(client: AsyncClient) -> None:
+    """Test optimistic concurrency on update through If-Match."""
+    task_id = (await client.post("/api/tasks", json={"title": "Shared"})).json()["id"]
+    etag = (await client.get(f"/api/tasks/{task_id}")).headers["etag"]
+
+    response = await client.put(
+        f"/api/tasks/{task_id}", json={"title": "First"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["etag"]
+    assert new_etag != etag
+
+    response = await client.put(
+        f"/api/tasks/{task_id}", json={"title": "Second"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+    assert (await client.get(f"/api/tasks/{task_id}")).headers["etag"] == new_etag
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_are_one_round_trip(
+    client: AsyncClient, sql_statements: list[str]
+) -> None:
+    """Test that single-task writes are one UPDATE/DELETE ... RETURNING each."""
+    task_id = (await client.post("/api/tasks", json={"title": "Lean"})).json()["id"]
+
+    sql_statements.clear()
+    response = await client.put(f"/api/tasks/{task_id}", json={"status": "done"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+    assert response.json()["title"] == "Lean"
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("UPDATE tasks")
+
+    sql_statements.clear()
+    assert (await client.put(f"/api/tasks/{task_id}", json={})).status_code == 200
+    assert len(sql_statements) == 1
+
+    sql_statements.clear()
+    assert (await client.delete(f"/api/tasks/{task_id}")).status_code == 204
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("DELETE FROM tasks")
+
+    assert (await client.put(f"/api/tasks/{task_id}", json={"title": "Gone"})).status_code == 404
+    assert (await client.delete(f"/api/tasks/{task_id}")).status_code == 404
+    assert (await client.get("/api/tasks")).json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_ranked_and_filtered(client: AsyncClient) -> None:
+    """Test ranked full-text search combined with status filters."""
+    await client.post("/api/tasks", json={"title": "Deploy backend", "description": "deploy"})
+    await client.post("/api/tasks", json={"title": "Write docs", "description": "deploy notes"})
+    done = await client.post("/api/tasks", json={"title": "Deploy frontend", "status": "done"})
+    await client.post("/api/tasks", json={"title": "Unrelated"})
+
+    response = await client.get("/api/tasks/search", params={"q": "deploy"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["title"] for item in items][0] == "Deploy backend"
+    assert {item["title"] for item in items} == {"Deploy backend", "Write docs", "Deploy frontend"}
+    assert items == sorted(items, key=lambda item: (-item["rank"], item["id"]))
+
+    response = await client.get("/api/tasks/search", params={"q": "deploy", "status": "done"})
+    assert [item["id"] for item in response.json()["items"]] == [done.json()["id"]]
+
+    await client.put(f"/api/tasks/{done.json()['id']}", json={"title": "Ship frontend"})
+    response = await client.get("/api/tasks/search", params={"q": "ship"})
+    assert [item["title"] for item in response.json()["items"]] == ["Ship frontend"]
+
+    response = await client.get("/api/tasks/search", params={"q": 'deploy" OR -'})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_keyset_pagination(client: AsyncClient) -> None:
+    """Test walking every search hit with cursors."""
+    await _create_tasks(client, 5, description="needle")
+    await client.post("/api/tasks", json={"title": "haystack"})
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        params = {"q": "needle", "per_page": 2, **({"cursor": cursor} if cursor else {})}
+        data = (await client.get("/api/tasks/search", params=params)).json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+    first_page = await client.get("/api/tasks/search", params={"q": "needle", "per_page": 2})
+    response = await client.get(
+        "/api/tasks/search", params={"q": "other", "cursor": first_page.json()["next_cursor"]}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_only_recent_window(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a rank window keeps the most recent matches and reports the rest as cut."""
+    created = await _create_tasks(client, 5, description="window")
+
+    body = (await client.get("/api/tasks/search", params={"q": "window"})).json()
+    assert len(body["items"]) == 5
+    assert body["truncated"] is False
+
+    monkeypatch.setattr(settings, "search_rank_window", 3)
+    body = (await client.get("/api/tasks/search", params={"q": "window"})).json()
+    assert {item["id"] for item in body["items"]} == {task["id"] for task in created[-3:]}
+    assert body["truncated"] is True
+
+    monkeypatch.setattr(settings, "search_rank_window", 5)
+    body = (await client.get("/api/tasks/search", params={"q": "window"})).json()
+    assert len(body["items"]) == 5
+    assert body["truncated"] is False
+
+
+def _sse_events(frames: list[bytes]) -> list[tuple[str, dict]]:
+    """Parse SSE frames into ``(event, data)`` pairs, skipping comments."""
+    events = []
+    for frame in b"".join(frames).decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_write_handlers_publish_task_events(client: AsyncClient) -> None:
+    """Test that committed writes reach subscribers as created/updated/deleted events."""
+    subscription = task_event_bus.subscribe()
+    try:
+        task_id = (await client.post("/api/tasks", json={"title": "Live"})).json()["id"]
+        await client.put(f"/api/tasks/{task_id}", json={"title": "Still live"})
+        await client.put("/api/tasks/999", json={"title": "Missing"})
+        await client.delete(f"/api/tasks/{task_id}")
+        await client.post("/api/tasks/batch", json={"items": [{"title": "Batched"}]})
+
+        events = _sse_events(await subscription.next_frames())
+    finally:
+        task_event_bus.unsubscribe(subscription)
+
+    assert [(kind, data["id"]) for kind, data in events[:3]] == [
+        ("created", task_id),
+        ("updated", task_id),
+        ("deleted", task_id),
+    ]
+    assert events[1][1]["task"]["title"] == "Still live"
+    assert events[3][0] == "created"
+    assert events[3][1]["task"]["title"] == "Batched"
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_told_to_resync() -> None:
+    """Test that a full subscriber queue drops its backlog for a single resync event."""
+    bus = TaskEventBus(queue_size=3)
+    subscription = bus.subscribe()
+    bus.deliver([{"type": "deleted", "id": i, "task": None} for i in range(5)])
+
+    assert _sse_events(await subscription.next_frames()) == [("resync", {})]
+    assert bus.stats() == {"subscribers": 1, "published": 5, "dropped": 4}
+
+    bus.deliver([{"type": "deleted", "id": 9, "task": None}])
+    assert _sse_events(await subscription.next_frames())[0][1]["id"] == 9
+
+
+def test_redis_url_without_redis_package_fails_at_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a configured Redis is never silently replaced by per-worker state."""
+    monkeypatch.setitem(sys.modules, "redis.asyncio", None)
+    monkeypatch.setattr(settings, "redis_url", "redis://localhost:6379")
+
+    with pytest.raises(ImportError, match="REDIS_URL"):
+        create_cache_backend("auto", settings.redis_url, maxsize=10, ttl=1.0)
+    with pytest.raises(ImportError, match="REDIS_URL"):
+        task_events._create_bus()
+    assert create_cache_backend("memory", settings.redis_url, maxsize=10, ttl=1.0)
+
+
+@pytest.mark.asyncio
+async def test_event_stream_sends_heartbeats_when_idle() -> None:
+    """Test the SSE stream's retry hint, idle heartbeat and unsubscribe on close."""
+    bus = TaskEventBus(queue_size=10, heartbeat_seconds=0.01)
+    stream = event_stream(bus)
+    assert (await anext(stream)).startswith(b"retry: ")
+    assert await anext(stream) == HEARTBEAT
+    assert bus.subscriber_count == 1
+    await stream.aclose()
+    assert bus.subscriber_count == 0
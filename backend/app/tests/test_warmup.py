@@ -0,0 +1,97 @@
+"""Tests for the startup warm-up and the readiness probe."""
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app import main
+from app.core import warmup as warmup_module
+from app.core.config import settings
+from app.core.database import build_engine
+from app.core.security import password_hasher
+from app.core.warmup import Warmup
+
+
+@pytest.fixture
+async def file_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """A file-backed SQLite engine, which gets a real connection pool."""
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path}/warmup.db", settings)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def fresh_warmup(monkeypatch: pytest.MonkeyPatch, file_engine: AsyncEngine) -> Warmup:
+    """A not-yet-run warm-up wired to the file engine, with cheap bcrypt and no requests."""
+    state = Warmup()
+    monkeypatch.setattr(main, "warmup", state)
+    monkeypatch.setattr(warmup_module, "engine", file_engine)
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+    monkeypatch.setattr(settings, "warmup_paths", [])
+    return state
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_warmup(
+    client: AsyncClient, fresh_warmup: Warmup, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that /api/ready is 503 until the warm-up ran, while /api/health is always up."""
+    monkeypatch.setattr(settings, "warmup_paths", ["/api/tasks?per_page=1", "/api/tasks/1"])
+    response = await client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+    assert (await client.get("/api/health")).status_code == 200
+
+    await fresh_warmup.run(main.app)
+
+    response = await client.get("/api/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert set(body["durations_ms"]) == {
+        "database",
+        "password_hashing",
+        "tokens",
+        "schemas",
+        "requests",
+    }
+    assert main.app.openapi_schema is not None
+
+
+@pytest.mark.asyncio
+async def test_warmup_opens_distinct_pool_connections(
+    file_engine: AsyncEngine, fresh_warmup: Warmup, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the pool holds ``warmup_connections`` idle connections afterwards."""
+    monkeypatch.setattr(settings, "warmup_connections", 3)
+
+    await warmup_module.warm_database()
+
+    assert file_engine.sync_engine.pool.checkedin() == 3
+
+
+@pytest.mark.asyncio
+async def test_warmup_retries_failed_steps(
+    fresh_warmup: Warmup, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failing step is retried and finished steps are not run again."""
+    calls: list[str] = []
+
+    async def flaky_tokens() -> None:
+        calls.append("tokens")
+        if len(calls) == 1:
+            raise ConnectionError("signing backend unavailable")
+
+    monkeypatch.setattr(warmup_module, "warm_tokens", flaky_tokens)
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0)
+
+    await fresh_warmup.run(main.app)
+
+    stats = fresh_warmup.stats()
+    assert stats["ready"] is True
+    assert stats["attempts"] == 2
+    assert stats["error"] is None
+    assert calls == ["tokens", "tokens"]
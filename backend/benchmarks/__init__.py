@@ -0,0 +1 @@
+"""Benchmarks for the TaskFlow backend, run in-process against the ASGI app."""
@@ -0,0 +1,127 @@
+"""Microbenchmark: payload size and encode CPU of a 100-item task page per encoding.
+
+Builds a ``GET /api/tasks?per_page=100`` page the way the endpoint does (rows
+from ``TASK_RESPONSE_COLUMNS``, so datetimes and enums included), then
+renders it with the response classes and compressors the API uses: JSON and
+MessagePack, each uncompressed, gzip and brotli at the configured levels.
+Descriptions follow ``benchmarks.datagen``'s skewed vocabulary, lengthened
+with ``--description-words``. Decode CPU is what a client spends per page.
+
+    python -m benchmarks.encoding --description-words 80
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/encoding.db")
+
+import brotli  # noqa: E402
+import msgpack  # noqa: E402
+from pydantic_core import from_json  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.api.tasks import TASK_RESPONSE_COLUMNS  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, async_session_maker, engine  # noqa: E402
+from app.core.responses import FastJSONResponse, MsgPackResponse  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from benchmarks.datagen import VOCABULARY, task_rows, zipf_weights  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+async def load_page(description_words: int) -> dict[str, Any]:
+    """Insert one page of synthetic tasks and read it back like ``list_tasks``."""
+    rng = random.Random(7)
+    word_weights = zipf_weights(len(VOCABULARY), exponent=1.0)
+    rows = list(task_rows(PAGE_SIZE, users=100))
+    for row in rows:
+        if row["description"] is not None:
+            words = rng.choices(VOCABULARY, cum_weights=word_weights, k=description_words)
+            row["description"] = " ".join(words)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as session:
+        await session.execute(insert(Task), rows)
+        await session.commit()
+        result = await session.execute(
+            select(*TASK_RESPONSE_COLUMNS).order_by(Task.id).limit(PAGE_SIZE)
+        )
+        items = [dict(row) for row in result.mappings()]
+    await engine.dispose()
+    return {
+        "items": items,
+        "total": PAGE_SIZE,
+        "total_estimated": False,
+        "page": 1,
+        "per_page": PAGE_SIZE,
+        "next_cursor": None,
+    }
+
+
+def gzip(body: bytes, level: int) -> bytes:
+    # Same framing as GzipStream in app.core.compression
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def cpu_microseconds(function: Callable[[], object], iterations: int) -> float:
+    """Mean process CPU time of one call, in microseconds."""
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def main(description_words: int, iterations: int, gzip_level: int, brotli_quality: int) -> None:
+    page = asyncio.run(load_page(description_words))
+    render_json = FastJSONResponse(None).render
+    render_msgpack = MsgPackResponse(None).render
+    renderers = {"json": render_json, "msgpack": render_msgpack}
+    decoders = {"json": from_json, "msgpack": msgpack.unpackb}
+
+    encodings: list[tuple[str, Callable[[], bytes], Callable[[bytes], object]]] = []
+    for name, render in renderers.items():
+        decode = decoders[name]
+        encodings += [
+            (name, lambda render=render: render(page), decode),
+            (
+                f"{name} + gzip {gzip_level}",
+                lambda render=render: gzip(render(page), gzip_level),
+                lambda body, decode=decode: decode(zlib.decompress(body, 16 + zlib.MAX_WBITS)),
+            ),
+            (
+                f"{name} + brotli {brotli_quality}",
+                lambda render=render: brotli.compress(render(page), quality=brotli_quality),
+                lambda body, decode=decode: decode(brotli.decompress(body)),
+            ),
+        ]
+
+    baseline = len(render_json(page))
+    print(f"{PAGE_SIZE}-item page, {description_words}-word descriptions on about half the tasks")
+    print(f"{'encoding':<24}{'bytes':>9}{'vs json':>9}{'encode µs':>12}{'decode µs':>12}")
+    for name, encode, decode in encodings:
+        body = encode()
+        encode_us = cpu_microseconds(encode, iterations)
+        decode_us = cpu_microseconds(lambda body=body, decode=decode: decode(body), iterations)
+        print(
+            f"{name:<24}{len(body):>9}{len(body) / baseline:>8.0%}"
+            f"{encode_us:>12.0f}{decode_us:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--description-words", type=int, default=80)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--gzip-level", type=int, default=settings.gzip_level)
+    parser.add_argument("--brotli-quality", type=int, default=settings.brotli_quality)
+    args = parser.parse_args()
+    main(args.description_words, args.iterations, args.gzip_level, args.brotli_quality)
@@ -0,0 +1,102 @@
+"""Benchmark: ``GET /api/tasks`` latency while logins run at the same time.
+
+Runs the same workload twice - bcrypt inline on the event loop, then on the
+password hashing pool - and prints the task-list latency percentiles for each.
+
+    python -m benchmarks.login_contention --logins 8 --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/login_contention.db"
+)
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.api import auth  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.core.security import PasswordHasher  # noqa: E402
+from app.main import app  # noqa: E402
+
+CREDENTIALS = {"username": "bench", "password": "bench-password"}
+
+
+async def _login_loop(client: AsyncClient, stop: asyncio.Event) -> int:
+    logins = 0
+    while not stop.is_set():
+        response = await client.post("/api/auth/login", data=CREDENTIALS)
+        response.raise_for_status()
+        logins += 1
+    return logins
+
+
+async def run_scenario(
+    client: AsyncClient, hasher: PasswordHasher, concurrent_logins: int, requests: int
+) -> dict[str, float]:
+    """Measure task-list latency with ``concurrent_logins`` login loops running."""
+    auth.password_hasher = hasher
+    stop = asyncio.Event()
+    login_tasks = [asyncio.create_task(_login_loop(client, stop)) for _ in range(concurrent_logins)]
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/tasks", params={"per_page": 20})
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+
+    stop.set()
+    logins = sum(await asyncio.gather(*login_tasks))
+    hasher.shutdown()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": percentiles[49],
+        "p95_ms": percentiles[94],
+        "p99_ms": percentiles[98],
+        "logins": logins,
+    }
+
+
+async def main(concurrent_logins: int, requests: int, workers: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(
+            "/api/auth/register",
+            json={"email": "bench@example.com", **CREDENTIALS},
+        )
+        for i in range(50):
+            await client.post("/api/tasks", json={"title": f"Task {i}"})
+
+        scenarios = {
+            "inline": PasswordHasher(workers=0, rounds=settings.bcrypt_rounds),
+            f"pool({workers})": PasswordHasher(workers=workers, rounds=settings.bcrypt_rounds),
+        }
+        print(f"{'hashing':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'logins':>10}")
+        for name, hasher in scenarios.items():
+            result = await run_scenario(client, hasher, concurrent_logins, requests)
+            print(
+                f"{name:<12}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}{result['logins']:>10.0f}"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login loops")
+    parser.add_argument("--requests", type=int, default=200, help="task-list requests to time")
+    parser.add_argument("--workers", type=int, default=settings.password_hash_workers)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.requests, args.workers))
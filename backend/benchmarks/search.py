@@ -0,0 +1,97 @@
+"""Benchmark: ``GET /api/tasks/search`` latency percentiles on a large task table.
+
+Seeds ``--tasks`` rows whose titles draw words from a skewed vocabulary, so
+common terms match a large share of the table and rare ones only a handful of
+rows, then times sequential searches for each kind of term.
+
+    python -m benchmarks.search --tasks 1000000 --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/search.db")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, async_session_maker, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.task import Task, TaskStatus  # noqa: E402
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+BATCH_SIZE = 50_000
+
+# (label, query params); word0 is the most frequent term and word4999 the rarest
+SCENARIOS = [
+    ("rare term", {"q": "word4999"}),
+    ("mid-frequency term", {"q": "word200"}),
+    ("common term", {"q": "word0"}),
+    ("common term + status", {"q": "word0", "status": "done"}),
+    ("two terms", {"q": "word1 word2"}),
+]
+
+
+async def seed(tasks: int) -> None:
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    statuses = list(TaskStatus)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as session:
+        for start in range(0, tasks, BATCH_SIZE):
+            rows = [
+                {
+                    "title": " ".join(rng.choices(VOCABULARY, weights, k=4)),
+                    "description": " ".join(rng.choices(VOCABULARY, weights, k=12)),
+                    "status": rng.choice(statuses),
+                    "owner_id": 1,
+                }
+                for _ in range(min(BATCH_SIZE, tasks - start))
+            ]
+            await session.execute(insert(Task), rows)
+        await session.commit()
+
+
+async def measure(client: AsyncClient, params: dict[str, str], requests: int) -> list[float]:
+    """Return per-request latencies in milliseconds."""
+    (await client.get("/api/tasks/search", params=params)).raise_for_status()
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        (await client.get("/api/tasks/search", params=params)).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main(tasks: int, requests: int) -> None:
+    started = time.perf_counter()
+    await seed(tasks)
+    print(f"seeded {tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'scenario':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for label, params in SCENARIOS:
+            latencies = await measure(client, params, requests)
+            p = statistics.quantiles(latencies, n=100)
+            print(f"{label:<24}{p[49]:>9.2f}{p[94]:>9.2f}{p[98]:>9.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--rank-window", type=int, default=0, help="search_rank_window (0 ranks every match)"
+    )
+    args = parser.parse_args()
+    settings.search_rank_window = args.rank_window
+    asyncio.run(main(args.tasks, args.requests))
@@ -0,0 +1,172 @@
+"""Benchmark: cold-start cost of a worker, with and without the warm-up lifespan.
+
+Measures ``import app.main`` in fresh interpreters (with the slowest imports
+from ``-X importtime``), then starts real uvicorn workers against a seeded
+database and times each from process start until it would get traffic. With
+warm-up that is ``/api/ready`` answering 200; without it, ``/api/health``.
+It then times the first requests a worker serves next to its steady state.
+
+Seeds a fresh SQLite file unless ``DATABASE_URL`` is set, in which case that
+database must already hold ``benchmarks.datagen`` data.
+
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# A database given in the environment is used as it is
+SEED_DATABASE = "DATABASE_URL" not in os.environ
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/startup.db")
+
+import httpx  # noqa: E402
+
+from app.core.database import Base, engine  # noqa: E402
+from benchmarks import datagen  # noqa: E402
+
+REQUESTS = [
+    ("GET /api/tasks", "GET", "/api/tasks", {}),
+    ("GET /api/tasks/{task_id}", "GET", "/api/tasks/1", {}),
+    (
+        "POST /api/auth/login",
+        "POST",
+        "/api/auth/login",
+        {"data": {"username": "user1", "password": datagen.PASSWORD}},
+    ),
+]
+STEADY_REPEATS = 5
+
+
+def import_seconds(env: dict[str, str]) -> float:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict[str, str], count: int) -> list[tuple[str, float]]:
+    """Top-level packages by their modules' own import time, from ``-X importtime``."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages: dict[str, float] = {}
+    for line in output.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        # "self" excludes nested imports, so each microsecond is counted once
+        package = fields[2].strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(fields[0]) / 1_000_000
+    return sorted(packages.items(), key=lambda item: -item[1])[:count]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(client: httpx.Client, path: str, started: float, timeout: float = 60.0) -> float:
+    """Poll ``path`` until it answers 200; return seconds since ``started``."""
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get(path).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"{path} did not answer 200 within {timeout:.0f}s")
+
+
+def timed(client: httpx.Client, method: str, path: str, kwargs: dict) -> float:
+    started = time.perf_counter()
+    response = client.request(method, path, **kwargs)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return elapsed
+
+
+def start_worker(env: dict[str, str], warmup: bool) -> dict[str, float]:
+    """Start one uvicorn worker and time its way to serving steady-state requests."""
+    port = free_port()
+    env = {**env, "WARMUP": str(warmup).lower()}
+    started = time.perf_counter()
+    worker = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            result = {
+                "serving": wait_for(client, "/api/ready" if warmup else "/api/health", started)
+            }
+            for name, method, path, kwargs in REQUESTS:
+                result[f"first {name}"] = timed(client, method, path, kwargs)
+            for name, method, path, kwargs in REQUESTS:
+                result[f"steady {name}"] = statistics.median(
+                    timed(client, method, path, kwargs) for _ in range(STEADY_REPEATS)
+                )
+    finally:
+        worker.terminate()
+        worker.wait()
+    return result
+
+
+async def seed(users: int, tasks: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await datagen.seed(engine, users, tasks)
+    await engine.dispose()
+
+
+def main(runs: int, users: int, tasks: int) -> None:
+    if SEED_DATABASE:
+        asyncio.run(seed(users, tasks))
+    env = dict(os.environ)
+
+    imports = [import_seconds(env) for _ in range(runs)]
+    print(
+        f"import app.main          {statistics.median(imports) * 1000:8.0f} ms (median of {runs})"
+    )
+    for package, seconds in slowest_imports(env, 8):
+        print(f"  {package:<22}{seconds * 1000:8.0f} ms")
+
+    results = {
+        mode: [start_worker(env, warmup=mode == "warm-up") for _ in range(runs)]
+        for mode in ("cold", "warm-up")
+    }
+    print(f"\n{'median of ' + str(runs) + ' workers, ms':<38}{'cold':>10}{'warm-up':>10}")
+    for key in results["cold"][0]:
+        label = "start -> taking traffic" if key == "serving" else key
+        cold, warm = (statistics.median(run[key] for run in results[mode]) for mode in results)
+        print(f"{label:<38}{cold * 1000:>10.1f}{warm * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.runs, args.users, args.tasks)
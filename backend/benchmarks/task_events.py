@@ -0,0 +1,88 @@
+"""Benchmark: the task change feed with many idle SSE subscribers on one worker.
+
+Parks ``--subscribers`` consumers on the same stream generator that backs
+``GET /api/tasks/events``, then reports the memory each idle subscriber holds,
+the CPU spent per heartbeat round, and how long one published change takes to
+reach every subscriber.
+
+    python -m benchmarks.task_events --subscribers 10000
+"""
+
+import argparse
+import asyncio
+import gc
+import resource
+import statistics
+import time
+import tracemalloc
+
+from app.services.task_events import HEARTBEAT, TaskEventBus, event_stream
+
+HEARTBEAT_SECONDS = 0.5
+
+
+async def consume(bus: TaskEventBus, arrivals: list[float], ready: asyncio.Event) -> None:
+    stream = event_stream(bus)
+    await anext(stream)  # retry hint; the subscription now exists
+    ready.set()
+    async for frame in stream:
+        if frame != HEARTBEAT:
+            arrivals.append(time.perf_counter())
+
+
+def cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def main(subscribers: int, rounds: int) -> None:
+    bus = TaskEventBus(queue_size=100, heartbeat_seconds=HEARTBEAT_SECONDS)
+    arrivals: list[float] = []
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    readies = [asyncio.Event() for _ in range(subscribers)]
+    consumers = [asyncio.create_task(consume(bus, arrivals, ready)) for ready in readies]
+    for ready in readies:
+        await ready.wait()
+    del readies
+    gc.collect()
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+    print(f"subscribers              {bus.subscriber_count}")
+    print(f"memory per subscriber    {per_subscriber / 1024:.2f} KiB")
+
+    # Idle: only heartbeats flow
+    idle_seconds = HEARTBEAT_SECONDS * rounds
+    cpu_before = cpu_seconds()
+    await asyncio.sleep(idle_seconds)
+    idle_cpu = cpu_seconds() - cpu_before
+    print(f"idle CPU per heartbeat   {idle_cpu / rounds * 1000:.1f} ms for all subscribers")
+
+    # Fan-out: publish one change, time until every subscriber has it
+    latencies = []
+    for i in range(rounds):
+        arrivals.clear()
+        published = time.perf_counter()
+        bus.deliver([{"type": "updated", "id": i, "task": {"id": i, "title": "Benchmark"}}])
+        while len(arrivals) < subscribers:
+            await asyncio.sleep(0.001)
+        latencies.append([(arrival - published) * 1000 for arrival in arrivals])
+    last = [max(round_latencies) for round_latencies in latencies]
+    spread = statistics.quantiles([value for values in latencies for value in values], n=100)
+    print(f"fan-out p50 / p99        {spread[49]:.1f} / {spread[98]:.1f} ms")
+    print(f"all delivered (median)   {statistics.median(last):.1f} ms")
+    print(f"dropped                  {bus.stats()['dropped']}")
+
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.subscribers, args.rounds))
@@ -0,0 +1,84 @@
+"""Alembic environment - runs migrations against the configured database."""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Task, TaskDueRollup, TaskRollup, User  # noqa: F401  - register tables on Base.metadata
+from app.models.task import SEARCH_FTS_TABLE, SEARCH_VECTOR_COLUMN, SEARCH_VECTOR_INDEX
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _created_on(obj: object, dialect_name: str) -> bool:
+    """Whether ``obj``'s ``ddl_if()`` condition, if any, creates it on this dialect."""
+    condition = getattr(obj, "_ddl_if", None)
+    if condition is None or condition.dialect is None:
+        return True
+    if isinstance(condition.dialect, str):
+        return condition.dialect == dialect_name
+    return dialect_name in condition.dialect
+
+
+def include_object(
+    obj: object, name: str | None, type_: str, reflected: bool, compare_to: object
+) -> bool:
+    """Keep autogenerate away from the full-text search objects and other dialects' indexes."""
+    if type_ == "index" and not reflected:
+        return _created_on(obj, context.get_context().dialect.name)
+    if name is None or not reflected or compare_to is not None:
+        return True
+    return not (
+        name in (SEARCH_VECTOR_COLUMN, SEARCH_VECTOR_INDEX) or name.startswith(SEARCH_FTS_TABLE)
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL to stdout without connecting to a database."""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    """Run migrations on an open connection."""
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_object=include_object
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    """Run migrations through the async engine."""
+    connectable = create_async_engine(settings.database_url, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_async_migrations())
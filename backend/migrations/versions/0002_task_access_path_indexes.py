@@ -0,0 +1,53 @@
+"""Task indexes matching the list, filter and foreign-key access paths.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+On PostgreSQL the indexes are built CONCURRENTLY so existing deployments keep
+accepting writes while they build.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+OPEN_TASKS = sa.text("status <> 'DONE'")
+
+INDEXES: list[tuple[str, list[str], dict[str, object]]] = [
+    ("ix_tasks_status_priority_id", ["status", "priority", "id"], {}),
+    ("ix_tasks_created_at_id", ["created_at", "id"], {}),
+    ("ix_tasks_updated_at_id", ["updated_at", "id"], {}),
+    ("ix_tasks_owner_id", ["owner_id"], {}),
+    ("ix_tasks_assignee_id", ["assignee_id"], {}),
+    (
+        "ix_tasks_open_due_date",
+        ["due_date", "id"],
+        {"postgresql_where": OPEN_TASKS, "sqlite_where": OPEN_TASKS},
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, options in INDEXES:
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **options,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _columns, _options in reversed(INDEXES):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True, if_exists=True)
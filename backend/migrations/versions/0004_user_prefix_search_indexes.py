@@ -0,0 +1,45 @@
+"""Indexes for typeahead prefix search over the user directory.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+Each index covers the case-folded column, compared under the "C" collation on
+PostgreSQL so it serves ``LIKE 'q%'``-style range scans as well as the
+typeahead ordering (see ``PrefixKey`` in app/models/user.py). On PostgreSQL
+they are built CONCURRENTLY.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = ("username", "full_name", "email")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            if dialect == "postgresql":
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_{column}_prefix "
+                    f'ON users (lower({column}) COLLATE "C")'
+                )
+            else:
+                op.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_users_{column}_prefix "
+                    f"ON users (lower({column}))"
+                )
+
+
+def downgrade() -> None:
+    concurrently = "CONCURRENTLY " if op.get_bind().dialect.name == "postgresql" else ""
+    with op.get_context().autocommit_block():
+        for column in reversed(COLUMNS):
+            op.execute(f"DROP INDEX {concurrently}IF EXISTS ix_users_{column}_prefix")
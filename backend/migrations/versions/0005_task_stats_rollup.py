@@ -0,0 +1,157 @@
+"""Rollup tables for the task dashboard statistics.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+``task_rollup`` counts tasks per status, priority and assignee and
+``task_due_rollup`` counts open tasks per due day. Row triggers on ``tasks``
+keep both current (a plpgsql function on PostgreSQL, three triggers on
+SQLite); the tables are backfilled from the existing tasks in the same
+transaction. app/models/task_stats.py defines the same objects.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+task_status = sa.Enum("TODO", "IN_PROGRESS", "REVIEW", "DONE", name="taskstatus")
+task_priority = sa.Enum("LOW", "MEDIUM", "HIGH", "URGENT", name="taskpriority")
+
+# Unassigned tasks are counted under assignee 0
+POSTGRESQL_ROLLUP = (
+    """CREATE OR REPLACE FUNCTION task_rollup_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+            VALUES (OLD.status, OLD.priority, coalesce(OLD.assignee_id, 0), -1)
+            ON CONFLICT (status, priority, assignee_id)
+            DO UPDATE SET task_count = task_rollup.task_count - 1;
+            IF OLD.status <> 'DONE' AND OLD.due_date IS NOT NULL THEN
+                INSERT INTO task_due_rollup (due_on, task_count)
+                VALUES ((OLD.due_date AT TIME ZONE 'UTC')::date, -1)
+                ON CONFLICT (due_on) DO UPDATE SET task_count = task_due_rollup.task_count - 1;
+            END IF;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+            VALUES (NEW.status, NEW.priority, coalesce(NEW.assignee_id, 0), 1)
+            ON CONFLICT (status, priority, assignee_id)
+            DO UPDATE SET task_count = task_rollup.task_count + 1;
+            IF NEW.status <> 'DONE' AND NEW.due_date IS NOT NULL THEN
+                INSERT INTO task_due_rollup (due_on, task_count)
+                VALUES ((NEW.due_date AT TIME ZONE 'UTC')::date, 1)
+                ON CONFLICT (due_on) DO UPDATE SET task_count = task_due_rollup.task_count + 1;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER task_rollup
+    AFTER INSERT OR DELETE OR UPDATE OF status, priority, assignee_id, due_date ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_rollup_apply()""",
+)
+
+SQLITE_ROLLUP = {
+    "task_rollup_insert": """CREATE TRIGGER task_rollup_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+        VALUES (new.status, new.priority, coalesce(new.assignee_id, 0), 1)
+        ON CONFLICT (status, priority, assignee_id)
+        DO UPDATE SET task_count = task_count + excluded.task_count;
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT date(new.due_date), 1
+        WHERE new.status <> 'DONE' AND new.due_date IS NOT NULL
+        ON CONFLICT (due_on) DO UPDATE SET task_count = task_count + excluded.task_count;
+    END""",
+    "task_rollup_delete": """CREATE TRIGGER task_rollup_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+        VALUES (old.status, old.priority, coalesce(old.assignee_id, 0), -1)
+        ON CONFLICT (status, priority, assignee_id)
+        DO UPDATE SET task_count = task_count + excluded.task_count;
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT date(old.due_date), -1
+        WHERE old.status <> 'DONE' AND old.due_date IS NOT NULL
+        ON CONFLICT (due_on) DO UPDATE SET task_count = task_count + excluded.task_count;
+    END""",
+    "task_rollup_update": """CREATE TRIGGER task_rollup_update
+    AFTER UPDATE OF status, priority, assignee_id, due_date ON tasks BEGIN
+        INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+        VALUES (old.status, old.priority, coalesce(old.assignee_id, 0), -1)
+        ON CONFLICT (status, priority, assignee_id)
+        DO UPDATE SET task_count = task_count + excluded.task_count;
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT date(old.due_date), -1
+        WHERE old.status <> 'DONE' AND old.due_date IS NOT NULL
+        ON CONFLICT (due_on) DO UPDATE SET task_count = task_count + excluded.task_count;
+        INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+        VALUES (new.status, new.priority, coalesce(new.assignee_id, 0), 1)
+        ON CONFLICT (status, priority, assignee_id)
+        DO UPDATE SET task_count = task_count + excluded.task_count;
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT date(new.due_date), 1
+        WHERE new.status <> 'DONE' AND new.due_date IS NOT NULL
+        ON CONFLICT (due_on) DO UPDATE SET task_count = task_count + excluded.task_count;
+    END""",
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        status_type: sa.types.TypeEngine = postgresql.ENUM(name="taskstatus", create_type=False)
+        priority_type: sa.types.TypeEngine = postgresql.ENUM(name="taskpriority", create_type=False)
+        due_day = "(due_date AT TIME ZONE 'UTC')::date"
+    else:
+        status_type, priority_type = task_status, task_priority
+        due_day = "date(due_date)"
+
+    op.create_table(
+        "task_rollup",
+        sa.Column("status", status_type, primary_key=True),
+        sa.Column("priority", priority_type, primary_key=True),
+        sa.Column("assignee_id", sa.Integer(), primary_key=True),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "task_due_rollup",
+        sa.Column("due_on", sa.Date(), primary_key=True),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+    )
+
+    # Triggers first, then the backfill, both inside the migration's transaction
+    statements = POSTGRESQL_ROLLUP if dialect == "postgresql" else SQLITE_ROLLUP.values()
+    for statement in statements:
+        op.execute(statement)
+    op.execute(
+        """
+        INSERT INTO task_rollup (status, priority, assignee_id, task_count)
+        SELECT status, priority, coalesce(assignee_id, 0), count(*)
+        FROM tasks GROUP BY status, priority, coalesce(assignee_id, 0)
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT {due_day}, count(*) FROM tasks
+        WHERE status <> 'DONE' AND due_date IS NOT NULL
+        GROUP BY {due_day}
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS task_rollup ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS task_rollup_apply()")
+    else:
+        for name in SQLITE_ROLLUP:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("task_due_rollup")
+    op.drop_table("task_rollup")
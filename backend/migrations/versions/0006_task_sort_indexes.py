@@ -0,0 +1,51 @@
+"""Indexes for listing tasks sorted by due date or priority.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+``ix_tasks_open_due_date`` only covers open tasks, and priority sorts by its
+severity rank rather than by the stored name, so neither listing order had an
+index. The rank expression must match ``PriorityRank`` in app/models/task.py
+exactly for the planner to use it. PostgreSQL also gets a descending due-date
+index, as its ascending one puts NULLs first when read backwards. On
+PostgreSQL the indexes are built CONCURRENTLY.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PRIORITIES = ("LOW", "MEDIUM", "HIGH", "URGENT")
+PRIORITY_RANK = (
+    "CASE priority "
+    + " ".join(f"WHEN '{name}' THEN {rank}" for rank, name in enumerate(PRIORITIES))
+    + " END"
+)
+
+INDEXES = [
+    ("ix_tasks_due_date_id", "due_date, id", None),
+    ("ix_tasks_due_date_desc_id", "due_date DESC NULLS LAST, id DESC", "postgresql"),
+    ("ix_tasks_priority_rank_id", f"({PRIORITY_RANK}), id", None),
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    concurrently = "CONCURRENTLY " if dialect == "postgresql" else ""
+    with op.get_context().autocommit_block():
+        for name, columns, only_on in INDEXES:
+            if only_on in (None, dialect):
+                op.execute(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON tasks ({columns})")
+
+
+def downgrade() -> None:
+    concurrently = "CONCURRENTLY " if op.get_bind().dialect.name == "postgresql" else ""
+    with op.get_context().autocommit_block():
+        for name, _columns, _only_on in reversed(INDEXES):
+            op.execute(f"DROP INDEX {concurrently}IF EXISTS {name}")
@@ -0,0 +1,154 @@
+"""Count changes per task rollup cell, for listing ETags.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+``task_rollup.change_count`` goes up by one for every insert, update or
+delete of a task in the cell, inside the writing transaction. Listing ETags
+sum it over the filtered cells: unlike ``max(updated_at)``, which is set by
+the client and can commit out of order, the sum only grows. The rollup
+triggers now fire on every update of ``tasks``; updates that keep a task in
+its cell only bump the counter. app/models/task_stats.py defines the same
+objects.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _postgresql_rollup(track_changes: bool) -> tuple[str, str]:
+    """The rollup trigger function and trigger, with or without ``change_count``."""
+    columns = "task_count, change_count" if track_changes else "task_count"
+    value = ", 1" if track_changes else ""
+
+    def apply(row: str, delta: str) -> str:
+        bump = (
+            ",\n                change_count = task_rollup.change_count + 1"
+            if track_changes
+            else ""
+        )
+        sign = "+" if delta == "1" else "-"
+        return f"""INSERT INTO task_rollup (status, priority, assignee_id, {columns})
+            VALUES ({row}.status, {row}.priority, coalesce({row}.assignee_id, 0), {delta}{value})
+            ON CONFLICT (status, priority, assignee_id)
+            DO UPDATE SET task_count = task_rollup.task_count {sign} 1{bump};
+            IF {row}.status <> 'DONE' AND {row}.due_date IS NOT NULL THEN
+                INSERT INTO task_due_rollup (due_on, task_count)
+                VALUES (({row}.due_date AT TIME ZONE 'UTC')::date, {delta})
+                ON CONFLICT (due_on) DO UPDATE SET task_count = task_due_rollup.task_count {sign} 1;
+            END IF;"""
+
+    touch = ""
+    if track_changes:
+        touch = """IF TG_OP = 'UPDATE'
+            AND (OLD.status, OLD.priority, OLD.assignee_id, OLD.due_date)
+            IS NOT DISTINCT FROM (NEW.status, NEW.priority, NEW.assignee_id, NEW.due_date) THEN
+            UPDATE task_rollup SET change_count = change_count + 1
+            WHERE status = NEW.status AND priority = NEW.priority
+                AND assignee_id = coalesce(NEW.assignee_id, 0);
+            RETURN NULL;
+        END IF;
+        """
+    events = "UPDATE" if track_changes else "UPDATE OF status, priority, assignee_id, due_date"
+    return (
+        f"""CREATE OR REPLACE FUNCTION task_rollup_apply() RETURNS trigger AS $$
+    BEGIN
+        {touch}IF TG_OP <> 'INSERT' THEN
+            {apply("OLD", "-1")}
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            {apply("NEW", "1")}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+        f"""CREATE TRIGGER task_rollup
+    AFTER INSERT OR DELETE OR {events} ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_rollup_apply()""",
+    )
+
+
+CELL_CHANGED = (
+    "(old.status IS NOT new.status OR old.priority IS NOT new.priority"
+    " OR old.assignee_id IS NOT new.assignee_id OR old.due_date IS NOT new.due_date)"
+)
+
+
+def _sqlite_rollup(track_changes: bool) -> dict[str, str]:
+    """The SQLite rollup triggers by name, with or without ``change_count``."""
+    columns = "task_count, change_count" if track_changes else "task_count"
+    value = ", 1" if track_changes else ""
+    bump = ",\n            change_count = change_count + 1" if track_changes else ""
+
+    def apply(row: str, delta: int) -> str:
+        return f"""INSERT INTO task_rollup (status, priority, assignee_id, {columns})
+        VALUES ({row}.status, {row}.priority, coalesce({row}.assignee_id, 0), {delta}{value})
+        ON CONFLICT (status, priority, assignee_id)
+        DO UPDATE SET task_count = task_count + excluded.task_count{bump};
+        INSERT INTO task_due_rollup (due_on, task_count)
+        SELECT date({row}.due_date), {delta}
+        WHERE {row}.status <> 'DONE' AND {row}.due_date IS NOT NULL
+        ON CONFLICT (due_on) DO UPDATE SET task_count = task_count + excluded.task_count;"""
+
+    triggers = {
+        "task_rollup_insert": f"""CREATE TRIGGER task_rollup_insert AFTER INSERT ON tasks BEGIN
+        {apply("new", 1)}
+    END""",
+        "task_rollup_delete": f"""CREATE TRIGGER task_rollup_delete AFTER DELETE ON tasks BEGIN
+        {apply("old", -1)}
+    END""",
+    }
+    if not track_changes:
+        triggers["task_rollup_update"] = f"""CREATE TRIGGER task_rollup_update
+    AFTER UPDATE OF status, priority, assignee_id, due_date ON tasks BEGIN
+        {apply("old", -1)}
+        {apply("new", 1)}
+    END"""
+        return triggers
+    triggers["task_rollup_update"] = f"""CREATE TRIGGER task_rollup_update
+    AFTER UPDATE ON tasks WHEN {CELL_CHANGED} BEGIN
+        {apply("old", -1)}
+        {apply("new", 1)}
+    END"""
+    triggers["task_rollup_touch"] = f"""CREATE TRIGGER task_rollup_touch
+    AFTER UPDATE ON tasks WHEN NOT ({CELL_CHANGED}) BEGIN
+        UPDATE task_rollup SET change_count = change_count + 1
+        WHERE status = new.status AND priority = new.priority
+            AND assignee_id = coalesce(new.assignee_id, 0);
+    END"""
+    return triggers
+
+
+def _replace_triggers(track_changes: bool) -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        function, trigger = _postgresql_rollup(track_changes)
+        op.execute(function)
+        op.execute("DROP TRIGGER IF EXISTS task_rollup ON tasks")
+        op.execute(trigger)
+    else:
+        for name in _sqlite_rollup(track_changes=True):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for statement in _sqlite_rollup(track_changes).values():
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_rollup",
+        sa.Column("change_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    _replace_triggers(track_changes=True)
+
+
+def downgrade() -> None:
+    # The old triggers do not write change_count, so they go in before it is dropped
+    _replace_triggers(track_changes=False)
+    op.drop_column("task_rollup", "change_count")
@@ -0,0 +1,104 @@
+"""Store case-folded copies of the user directory's searchable columns.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+Directory search folded the query with Python's Unicode-aware case mapping
+but the rows with the database's ``lower()``, which SQLite applies to ASCII
+only, so non-ASCII names never matched. ``username_key``, ``full_name_key``
+and ``email_key`` hold ``str.casefold()`` of their column, written by the
+application (see ``prefix_key`` in app/models/user.py), and the
+``ix_users_*_prefix`` indexes move onto them. On PostgreSQL the indexes are
+built CONCURRENTLY.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = {"username": (100, False), "full_name": (255, True), "email": (255, False)}
+
+# Rows folded per UPDATE round trip during the backfill
+BATCH_SIZE = 1000
+
+
+def _fold(value: str | None) -> str | None:
+    # A copy of app.models.user.prefix_key, frozen with this revision
+    return value.casefold() if value is not None else None
+
+
+def _backfill() -> None:
+    users = sa.table(
+        "users",
+        sa.column("id", sa.Integer),
+        *(sa.column(name, sa.String) for name in COLUMNS),
+        *(sa.column(f"{name}_key", sa.String) for name in COLUMNS),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(users.c.id, *(users.c[name] for name in COLUMNS))).all()
+    statement = (
+        sa.update(users)
+        .where(users.c.id == sa.bindparam("user_id"))
+        .values({f"{name}_key": sa.bindparam(f"{name}_folded") for name in COLUMNS})
+    )
+    for start in range(0, len(rows), BATCH_SIZE):
+        bind.execute(
+            statement,
+            [
+                {
+                    "user_id": row.id,
+                    **{f"{name}_folded": _fold(row._mapping[name]) for name in COLUMNS},
+                }
+                for row in rows[start : start + BATCH_SIZE]
+            ],
+        )
+
+
+def _replace_indexes(keys: bool) -> None:
+    """Point the ``ix_users_*_prefix`` indexes at the key columns or back at ``lower()``."""
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    concurrently = "CONCURRENTLY " if postgresql else ""
+    collate = ' COLLATE "C"' if postgresql else ""
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            expression = f"{column}_key" if keys else f"lower({column})"
+            op.execute(f"DROP INDEX {concurrently}IF EXISTS ix_users_{column}_prefix")
+            op.execute(
+                f"CREATE INDEX {concurrently}IF NOT EXISTS ix_users_{column}_prefix "
+                f"ON users ({expression}{collate})"
+            )
+
+
+def upgrade() -> None:
+    # NOT NULL columns need a default for the existing rows; the backfill
+    # replaces it. SQLite cannot drop a column default in place, so it keeps
+    # the unused empty-string default.
+    for name, (length, nullable) in COLUMNS.items():
+        op.add_column(
+            "users",
+            sa.Column(
+                f"{name}_key",
+                sa.String(length),
+                nullable=nullable,
+                server_default=None if nullable else "",
+            ),
+        )
+    _backfill()
+    if op.get_bind().dialect.name == "postgresql":
+        for name, (_, nullable) in COLUMNS.items():
+            if not nullable:
+                op.alter_column("users", f"{name}_key", server_default=None)
+    _replace_indexes(keys=True)
+
+
+def downgrade() -> None:
+    _replace_indexes(keys=False)
+    for name in reversed(COLUMNS):
+        op.drop_column("users", f"{name}_key")
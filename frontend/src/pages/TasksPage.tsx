@@ -56,7 +56,7 @@ export default function TasksPage() {
       )}
 
       {/* Pagination info */}
-      {data && data.total > 0 && (
+      {data && data.total !== null && data.total > 0 && (
         <div className="mt-6 text-sm text-gray-500 text-center">
           Showing {data.items.length} of {data.total} tasks
         </div>
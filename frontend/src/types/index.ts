@@ -41,9 +41,11 @@ export interface TaskUpdate {
 /** Paginated response wrapper */
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
+  total: number | null;
+  total_estimated?: boolean;
   page: number;
   per_page: number;
+  next_cursor?: string | null;
 }
 
 /** User entity */